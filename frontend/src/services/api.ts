@@ -151,6 +151,7 @@ export const jobsApi = {
     skip?: number; 
     limit?: number; 
     search?: string;
+    q?: string;
   }): Promise<Job[]> => {
     const response = await api.get('/jobs/', { params });
     return response.data;
@@ -322,15 +323,57 @@ export const scoredJobsApi = {
   list: async (params?: {
     skip?: number;
     limit?: number;
+    cursor?: string;
+    q?: string;
     title?: string;
     location?: string;
     remote_type?: string;
     min_score?: number;
-  }): Promise<{ jobs: ScoredJob[]; total: number; skip: number; limit: number }> => {
+  }): Promise<{ jobs: ScoredJob[]; total: number; skip: number; limit: number; next_cursor: string | null }> => {
     const response = await api.get('/jobs/scored/v2', { params });
     return response.data;
   },
   
+  // Stream scored jobs (NDJSON) in score order; onJob is called as rows arrive
+  stream: async (
+    onJob: (job: ScoredJob) => void,
+    params?: {
+      limit?: number;
+      q?: string;
+      title?: string;
+      location?: string;
+      remote_type?: string;
+      min_score?: number;
+    },
+    signal?: AbortSignal
+  ): Promise<void> => {
+    const query = new URLSearchParams();
+    Object.entries(params || {}).forEach(([key, value]) => {
+      if (value !== undefined && value !== null) query.set(key, String(value));
+    });
+    const token = localStorage.getItem('access_token');
+    const response = await fetch(`${API_URL}/jobs/scored/v2/stream?${query}`, {
+      headers: token ? { Authorization: `Bearer ${token}` } : {},
+      signal,
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`Scored jobs stream failed: ${response.status}`);
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop() || '';
+      lines.filter((line) => line.trim()).forEach((line) => onJob(JSON.parse(line)));
+    }
+    if (buffer.trim()) onJob(JSON.parse(buffer));
+  },
+  
   getScore: async (jobId: number): Promise<{ job_id: number; job_title: string; score: number; breakdown: ScoreBreakdown }> => {
     const response = await api.get(`/jobs/${jobId}/score/v2`);
     return response.data;
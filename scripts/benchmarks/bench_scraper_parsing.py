@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: job card extraction from saved results pages.
+
+Compares, for each platform's SELECTORS on its fixture page from
+tests/fixtures/scrapers/:
+- BeautifulSoup over the whole page with find() chains (as the scrapers
+  parsed before the compiled selectors)
+- BeautifulSoup with a SoupStrainer building only the card subtrees
+- precompiled lxml XPath (what the scrapers use)
+
+Usage:
+    python scripts/benchmarks/bench_scraper_parsing.py [--rounds 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add repository root to path for imports
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from src.scrapers import glassdoor, indeed, linkedin, wttj
+
+FIXTURES_DIR = os.path.join(ROOT, "tests", "fixtures", "scrapers")
+PLATFORMS = {
+    "indeed": indeed.SELECTORS,
+    "glassdoor": glassdoor.SELECTORS,
+    "wttj": wttj.SELECTORS,
+    "linkedin": linkedin.SELECTORS,
+}
+LIMIT = 100
+
+
+def bench(extract, html: str, rounds: int) -> float:
+    """Return milliseconds per page."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        extract(html, LIMIT)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    
+    print(f"📊 Card extraction, ms per page ({args.rounds} rounds)")
+    print(f"   {'platform':<10} {'KB':>5} {'cards':>5} {'bs4':>8} {'strainer':>9} {'xpath':>8} {'speedup':>8}")
+    for name, selectors in PLATFORMS.items():
+        with open(os.path.join(FIXTURES_DIR, f"{name}.html"), encoding="utf-8") as f:
+            html = f.read()
+        
+        def soup_full(page, limit):
+            return selectors.extract_soup(page, limit, strain=False)
+        
+        # All implementations must agree before timing them
+        cards = selectors.extract(html, LIMIT)
+        if not (cards == selectors.extract_soup(html, LIMIT) == soup_full(html, LIMIT)):
+            print(f"❌ {name}: implementations disagree")
+            sys.exit(1)
+        
+        full = bench(soup_full, html, args.rounds)
+        strained = bench(selectors.extract_soup, html, args.rounds)
+        xpath = bench(selectors.extract, html, args.rounds)
+        print(
+            f"   {name:<10} {len(html) / 1024:>5.0f} {len(cards):>5} {full:>8.2f} "
+            f"{strained:>9.2f} {xpath:>8.2f} {full / xpath:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
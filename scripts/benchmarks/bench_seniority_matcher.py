@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: seniority detection before/after the combined matcher.
+
+Compares the previous detection loop (re.search over each uncompiled
+pattern, level by level) with ScoringServiceV2.SENIORITY_MATCHER on the job
+titles from scripts/job_scraping_test/phase2_jobs.json.
+
+Usage:
+    python scripts/benchmarks/bench_seniority_matcher.py [--rounds 200]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+# Add repository root to path for imports
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from src.services.scoring_v2 import ScoringServiceV2
+
+TITLES_PATH = os.path.join(ROOT, "scripts", "job_scraping_test", "phase2_jobs.json")
+
+
+def detect_level_before(title_lower: str):
+    """Detection loop as it was before the combined matcher."""
+    for level in ["head", "senior", "mid", "junior"]:
+        config = ScoringServiceV2.SENIORITY_PATTERNS[level]
+        for pattern in config["patterns"]:
+            if re.search(pattern, title_lower):
+                return level
+    return None
+
+
+def detect_level_after(title_lower: str):
+    """Detection with the precompiled combined matcher."""
+    return ScoringServiceV2.SENIORITY_MATCHER.match(title_lower)
+
+
+def bench(detect, titles, rounds: int) -> float:
+    """Return titles processed per second."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for title in titles:
+            detect(title)
+    elapsed = time.perf_counter() - start
+    return len(titles) * rounds / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    
+    with open(TITLES_PATH, encoding="utf-8") as f:
+        titles = [job["title"].lower() for job in json.load(f) if job.get("title")]
+    
+    # Both implementations must agree before timing them
+    mismatches = [t for t in titles if detect_level_before(t) != detect_level_after(t)]
+    if mismatches:
+        print(f"❌ {len(mismatches)} titles disagree, e.g. {mismatches[0]!r}")
+        sys.exit(1)
+    
+    before = bench(detect_level_before, titles, args.rounds)
+    after = bench(detect_level_after, titles, args.rounds)
+    
+    print(f"📊 Seniority detection on {len(titles)} titles x {args.rounds} rounds")
+    print(f"   - Before (re.search per pattern): {before:,.0f} titles/s")
+    print(f"   - After (combined matcher):       {after:,.0f} titles/s")
+    print(f"   - Speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
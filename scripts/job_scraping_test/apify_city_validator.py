@@ -13,11 +13,15 @@ import csv
 import json
 import re
 import subprocess
-import time
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 
+# Apify calls are paced by the backend's shared rate limiter (provider:apify)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from src.services.rate_limiter import get_rate_limiter, provider_key
+
 
 class ApifyCityValidator:
     """Validates and enhances job location data using Apify MCP."""
@@ -385,9 +389,9 @@ def main():
             enhanced_count += 1
             print(f"    ✅ Enhanced: location={enhancement['apify_location']}, company={enhancement['apify_company']}")
         
-        # Rate limiting
+        # Rate limiting (waits only if calls come faster than the quota)
         if i < len(candidates):
-            time.sleep(2)
+            get_rate_limiter().wait_sync(provider_key("apify"))
     
     print()
     
@@ -21,9 +21,9 @@ Output:
 """
 
 import os
+import sys
 import csv
 import json
-import time
 import re
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
@@ -31,6 +31,10 @@ from pathlib import Path
 from apify_client import ApifyClient
 from dotenv import load_dotenv
 
+# Apify calls are paced by the backend's shared rate limiter (provider:apify)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from src.services.rate_limiter import get_rate_limiter, provider_key
+
 # Load environment variables from .env
 load_dotenv("/Users/lopato/Documents/DAGORSEY/Geek/Job Seek/.env")
 
@@ -40,7 +44,6 @@ CSV_FILE = "/Users/lopato/Documents/DAGORSEY/Geek/Job Seek/scripts/job_scraping_
 REPORT_FILE = "/Users/lopato/Documents/DAGORSEY/Geek/Job Seek/scripts/job_scraping_test/apify_enhancement_report.txt"
 LOG_FILE = "/Users/lopato/Documents/DAGORSEY/Geek/Job Seek/scripts/job_scraping_test/apify_enhancement_log.json"
 ACTOR_ID = "apify/rag-web-browser"
-REQUEST_DELAY = 2  # seconds between Apify calls
 
 
 class ApifyJobEnhancer:
@@ -342,10 +345,9 @@ class ApifyJobEnhancer:
                     'timestamp': datetime.now().isoformat()
                 })
             
-            # Rate limiting
+            # Rate limiting (waits only if calls come faster than the quota)
             if idx < len(jobs):
-                print(f"  ⏳ Waiting {REQUEST_DELAY}s...")
-                time.sleep(REQUEST_DELAY)
+                get_rate_limiter().wait_sync(provider_key("apify"))
         
         # Write updated CSV
         print(f"\n💾 Writing updated CSV...")
@@ -11,14 +11,18 @@ Supports: WTTJ, Glassdoor (with 403 handling), LinkedIn (skip), Indeed (skip)
 """
 
 import csv
-import time
 import json
 import os
+import sys
 from pathlib import Path
 from datetime import datetime
 from apify_client import ApifyClient
 from dotenv import load_dotenv
 
+# Apify calls are paced by the backend's shared rate limiter (provider:apify)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from src.services.rate_limiter import get_rate_limiter, provider_key
+
 # Load environment
 load_dotenv()
 
@@ -31,7 +35,6 @@ LOG_FILE = Path("/Users/lopato/Documents/DAGORSEY/Geek/Job Seek/scripts/job_scra
 # Apify configuration
 APIFY_API_KEY = os.getenv('APIFY_API_KEY')
 ACTOR_ID = "apify/rag-web-browser"
-RATE_LIMIT_DELAY = 2  # seconds between requests
 
 class ApifyEnricher:
     def __init__(self):
@@ -278,7 +281,7 @@ class ApifyEnricher:
                         })
                     
                     enhanced_rows.append(row)
-                    time.sleep(RATE_LIMIT_DELAY)
+                    get_rate_limiter().wait_sync(provider_key("apify"))
                     
                 except Exception as e:
                     error_msg = str(e)
@@ -301,7 +304,7 @@ class ApifyEnricher:
                     })
                     
                     enhanced_rows.append(row)
-                    time.sleep(RATE_LIMIT_DELAY)
+                    get_rate_limiter().wait_sync(provider_key("apify"))
         
         # Write enhanced CSV
         print(f"\n\n✍️  Writing enhanced CSV: {OUTPUT_CSV}")
@@ -18,10 +18,17 @@ from typing import Dict, List, Optional
 from datetime import datetime
 import httpx
 import os
+import sys
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Shared page cache and rate limiter of the API (same cache file when run
+# from the repo root)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from src.services.page_cache import PageCache
+from src.services.rate_limiter import Priority, get_rate_limiter, provider_key, url_domain_key
+
 
 class JobExtractor:
     """Extracts detailed job information from URLs."""
@@ -30,6 +37,8 @@ class JobExtractor:
         self.target_city = target_city.lower()
         self.firecrawl_api_key = os.getenv('FIRECRAWL_API_KEY')
         self.firecrawl_url = "https://api.firecrawl.dev/v1/scrape"
+        self.page_cache = PageCache.from_env()
+        self.rate_limiter = get_rate_limiter()
         
         # Location keywords for target city
         self.city_variations = self._get_city_variations(target_city)
@@ -68,11 +77,20 @@ class JobExtractor:
         return variations
     
     async def scrape_url(self, url: str) -> str:
-        """Scrape a URL using Firecrawl or fallback to httpx."""
+        """Scrape a URL (cached) using Firecrawl or fallback to httpx."""
+        # Markdown from Firecrawl is cached apart from the API's HTML pages
+        providers = ["firecrawl_markdown", "httpx"]
+        if self.page_cache:
+            cached = await self.page_cache.aget(url, providers)
+            if cached:
+                return cached.content
+        
         # Try Firecrawl first
         if self.firecrawl_api_key:
             try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
+                async with self.rate_limiter.slot(
+                    provider_key("firecrawl"), priority=Priority.BACKGROUND
+                ), httpx.AsyncClient(timeout=30.0) as client:
                     response = await client.post(
                         self.firecrawl_url,
                         json={
@@ -84,14 +102,21 @@ class JobExtractor:
                     if response.status_code == 200:
                         data = response.json()
                         if data.get("success") and data.get("data"):
-                            return data["data"].get("markdown", "")
+                            markdown = data["data"].get("markdown", "")
+                            if markdown and self.page_cache:
+                                await self.page_cache.aset(url, providers[0], markdown)
+                            return markdown
             except Exception as e:
                 print(f"    Firecrawl failed: {e}, trying fallback...")
         
         # Fallback to httpx
         try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            async with self.rate_limiter.slot(
+                url_domain_key(url), priority=Priority.BACKGROUND
+            ), httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
                 response = await client.get(url)
+                if response.is_success and self.page_cache:
+                    await self.page_cache.aset(url, providers[1], response.text)
                 return response.text
         except Exception as e:
             print(f"    Scraping failed: {e}")
@@ -258,27 +283,32 @@ class JobExtractor:
             }
             
             return job_data
-            
+        
         except Exception as e:
             print(f"    ❌ Error: {e}")
             return None
     
     async def extract_batch(self, job_urls: List[Dict[str, str]]) -> List[Dict[str, any]]:
-        """Extract jobs in batch with delays."""
-        jobs = []
+        """
+        Extract jobs in batch, concurrently.
         
-        for i, job_url in enumerate(job_urls, 1):
-            print(f"\n[{i}/{len(job_urls)}] Extracting job...")
-            
+        Pacing comes from the shared rate limiter (Firecrawl quota, per-domain
+        quotas for direct fetches), so URLs of different sites proceed in
+        parallel instead of waiting fixed delays.
+        """
+        done = 0
+        
+        async def extract(job_url: Dict[str, str]) -> Optional[Dict[str, any]]:
+            nonlocal done
             job_data = await self.extract_job(job_url)
-            if job_data:
-                jobs.append(job_data)
-            
-            # Rate limiting
-            if i < len(job_urls):
-                await asyncio.sleep(2)
+            # Counted as extractions finish, they run concurrently
+            done += 1
+            status = "✅" if job_data else "❌"
+            print(f"[{done}/{len(job_urls)}] {status} {job_url['platform']}: {job_url['url'][:60]}")
+            return job_data
         
-        return jobs
+        results = await asyncio.gather(*(extract(job_url) for job_url in job_urls))
+        return [job_data for job_data in results if job_data]
 
 
 def load_phase1_urls(filepath: str) -> List[Dict[str, str]]:
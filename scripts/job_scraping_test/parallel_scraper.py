@@ -26,6 +26,10 @@ from dotenv import load_dotenv
 # Load environment variables from .env
 load_dotenv(Path(__file__).parent.parent.parent / ".env")
 
+# Shared keyword matcher from the backend
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from src.services.text_matching import get_keyword_matcher
+
 
 class ParallelScraper:
     """Multi-source job scraper using Parallel.ai and Firecrawl APIs."""
@@ -1505,12 +1509,9 @@ class ParallelScraper:
             "figma", "sketch", "ux", "ui", "api", "saas", "b2b", "b2c"
         ]
         
-        found_skills = []
-        content_lower = content.lower()
-        
-        for skill in skill_keywords:
-            if skill in content_lower:
-                found_skills.append(skill)
+        # Whole words only, so "ui" does not match "build"
+        content_matches = get_keyword_matcher(skill_keywords).find_all(content)
+        found_skills = [skill for skill in skill_keywords if skill in content_matches]
         
         return ", ".join(found_skills) if found_skills else "Not specified"
     
@@ -4,16 +4,30 @@ from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import os
 
-from .models import Base, engine
+from .models import Base, engine, ensure_company_schema, ensure_search_schema
+from .services.rate_limiter import get_rate_limiter
+from .services.scraping_service import get_scraping_service
+from .services.parallel_findall import close_findall_client
+from .services.findall_poller import get_findall_poller
+from .scrapers.parsing import shutdown_parse_executor
 from .routers import jobs, applications, companies, preferences, search_findall
 from .routers import auth, profile, criteria, blacklist, saved_searches
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize database tables on startup."""
+    """Initialize database tables, search indexes and HTTP clients on startup."""
     Base.metadata.create_all(bind=engine)
+    ensure_search_schema(engine)
+    ensure_company_schema(engine)
+    
+    scraping_service = get_scraping_service()
+    await scraping_service.start()
     yield
+    await scraping_service.aclose()
+    await get_findall_poller().aclose()
+    await close_findall_client()
+    shutdown_parse_executor()
 
 
 app = FastAPI(
@@ -64,3 +78,15 @@ async def health_check():
 @app.get("/api/health")
 async def api_health_check():
     return {"status": "healthy"}
+
+
+@app.get("/api/health/scraping")
+async def scraping_health_check():
+    """Scraping provider stats per target domain (success rate, p95 latency, circuit state)."""
+    return get_scraping_service().health.snapshot()
+
+
+@app.get("/api/health/rate-limits")
+async def rate_limits_check():
+    """Rate limiter state per provider / domain key (tokens, active and waiting calls)."""
+    return get_rate_limiter().snapshot()
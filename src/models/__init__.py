@@ -10,6 +10,11 @@ from .scoring_preferences import UserScoringPreferences, DEFAULT_SCORING_PREFERE
 from .blacklist import Blacklist
 from .email_alert import EmailAlert
 from .saved_search import SavedSearch
+from .job_score import JobScore
+from .job_features import JobFeatures
+from .findall_run import FindAllRun
+from .search_index import ensure_search_schema
+from .company_names import ensure_company_schema, merge_duplicate_companies, normalize_company_name
 
 __all__ = [
     "Base",
@@ -31,4 +36,11 @@ __all__ = [
     "Blacklist",
     "EmailAlert",
     "SavedSearch",
+    "JobScore",
+    "JobFeatures",
+    "FindAllRun",
+    "ensure_search_schema",
+    "ensure_company_schema",
+    "merge_duplicate_companies",
+    "normalize_company_name",
 ]
@@ -1,7 +1,8 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from .base import Base
+from .company_names import normalize_company_name
 
 
 class Company(Base):
@@ -9,6 +10,8 @@ class Company(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
+    # Canonical key of the name, one company per key (see company_names.py)
+    normalized_name = Column(String(255), unique=True, index=True)
     description = Column(Text)
     
     # Company info
@@ -39,5 +42,10 @@ class Company(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    @validates("name")
+    def _normalize_name(self, key, name):
+        self.normalized_name = normalize_company_name(name or "") or None
+        return name
+
     def __repr__(self):
         return f"<Company(id={self.id}, name='{self.name}')>"
@@ -0,0 +1,201 @@
+"""
+Normalized company names.
+
+Scraped postings spell the same employer in many ways ("Doctolib",
+"doctolib", "Doctolib SAS"). companies.normalized_name holds a canonical
+key (case, accents, punctuation and unambiguous legal forms dropped) under
+a unique index, so each employer is a single row.
+
+create_all() does not add the column to an existing companies table, so
+ensure_company_schema() adds it at startup and creates the unique index,
+serialized across workers by an advisory lock on Postgres. Before the
+resolver serves lookups, it also fills the key of existing companies
+that are alone with theirs, which only writes the column.
+
+Companies sharing a key keep a NULL one until merged, which deletes rows:
+a one-off operation, run explicitly with
+scripts/merge_duplicate_companies.py (see merge_duplicate_companies()).
+The merge never deletes a company that already has a key, and resolvers
+only cache ids of those, so it can run while the API serves.
+"""
+import logging
+import re
+import unicodedata
+from typing import Dict, List, Tuple
+
+from sqlalchemy import bindparam, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# Legal forms dropped from the end of names. Only unambiguous ones: short
+# words such as "co", "sa" or "ag" also end genuine names, and dropping
+# them could merge different employers.
+LEGAL_SUFFIXES = {
+    "sas", "sasu", "sarl", "eurl",
+    "inc", "incorporated", "llc", "ltd", "plc", "corp", "corporation",
+    "gmbh",
+}
+
+# Arbitrary key of the advisory lock serializing the schema step
+SCHEMA_LOCK_ID = 74210622
+
+
+def normalize_company_name(name: str) -> str:
+    """
+    Canonical key of a company name.
+    
+    Example:
+        normalize_company_name("Doctolib S.A.S.")  # "doctolib"
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    key = "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+    key = key.replace("&", " and ")
+    # Dotted acronyms: "s.a.s." -> "sas"
+    key = re.sub(r"(?<=\b\w)\.", "", key)
+    words = re.findall(r"[^\W_]+", key)
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def ensure_company_schema(engine: Engine) -> None:
+    """
+    Add companies.normalized_name and its unique index if missing, and
+    fill the keys no other company has.
+    
+    Companies sharing a key keep a NULL one (the resolver does not find
+    them) until merge_duplicate_companies() has been run; a warning says so.
+    """
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": SCHEMA_LOCK_ID})
+            conn.execute(text("ALTER TABLE companies ADD COLUMN IF NOT EXISTS normalized_name VARCHAR(255)"))
+        else:
+            columns = {column["name"] for column in inspect(conn).get_columns("companies")}
+            if "normalized_name" not in columns:
+                conn.execute(text("ALTER TABLE companies ADD COLUMN normalized_name VARCHAR(255)"))
+        
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_companies_normalized_name"
+            " ON companies (normalized_name)"
+        ))
+        pending = _backfill_unambiguous_keys(conn)
+    
+    if pending:
+        logger.warning(
+            f"{pending} companies have no normalized name, "
+            "run scripts/merge_duplicate_companies.py"
+        )
+
+
+def _backfill_unambiguous_keys(conn: Connection) -> int:
+    """
+    Fill the key of companies that no other company shares.
+    
+    Returns:
+        Number of companies left without a key (to merge)
+    """
+    ids_by_key: Dict[str, List[int]] = {}
+    for company_id, name in conn.execute(text(
+        "SELECT id, name FROM companies WHERE normalized_name IS NULL AND name IS NOT NULL"
+    )):
+        key = normalize_company_name(name)
+        if key:
+            ids_by_key.setdefault(key, []).append(company_id)
+    if not ids_by_key:
+        return 0
+    
+    keys = list(ids_by_key)
+    taken = set()
+    for start in range(0, len(keys), 500):
+        taken.update(conn.execute(
+            text("SELECT normalized_name FROM companies WHERE normalized_name IN :keys").bindparams(
+                bindparam("keys", expanding=True)
+            ),
+            {"keys": keys[start:start + 500]},
+        ).scalars())
+    
+    left = 0
+    for key, company_ids in ids_by_key.items():
+        if len(company_ids) == 1 and key not in taken:
+            conn.execute(
+                text("UPDATE companies SET normalized_name = :key WHERE id = :id"),
+                {"key": key, "id": company_ids[0]},
+            )
+        else:
+            left += len(company_ids)
+    return left
+
+
+def company_references(conn: Connection) -> List[Tuple[str, str]]:
+    """(table, column) pairs with a foreign key to companies.id."""
+    inspector = inspect(conn)
+    references = []
+    for table in inspector.get_table_names():
+        for foreign_key in inspector.get_foreign_keys(table):
+            if foreign_key["referred_table"] == "companies":
+                references.extend((table, column) for column in foreign_key["constrained_columns"])
+    return references
+
+
+def merge_duplicate_companies(engine: Engine, dry_run: bool = False) -> int:
+    """
+    Fill normalized_name of existing companies, merging those sharing a key.
+    
+    Rows referencing a merged company (every foreign key to companies.id,
+    found by reflection) move to the company already holding its key, else
+    the oldest company of the key, then the duplicate is deleted. Companies
+    with a key are never deleted, so ids cached by running resolvers stay
+    valid. Run once after ensure_company_schema() added the column; later
+    runs only fill names left NULL.
+    
+    Args:
+        engine: Database to migrate
+        dry_run: Roll back instead of committing
+    
+    Returns:
+        Number of duplicate companies merged
+    """
+    merged = 0
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": SCHEMA_LOCK_ID})
+        references = company_references(conn)
+        
+        pending = conn.execute(text(
+            "SELECT id, name FROM companies WHERE normalized_name IS NULL ORDER BY id"
+        )).all()
+        canonical = {
+            key: company_id for company_id, key in conn.execute(text(
+                "SELECT id, normalized_name FROM companies WHERE normalized_name IS NOT NULL"
+            ))
+        }
+        for company_id, name in pending:
+            key = normalize_company_name(name or "") or None
+            target = canonical.get(key) if key else None
+            if target is None:
+                if key:
+                    canonical[key] = company_id
+                conn.execute(
+                    text("UPDATE companies SET normalized_name = :key WHERE id = :id"),
+                    {"key": key, "id": company_id},
+                )
+                continue
+            
+            for table, column in references:
+                conn.execute(
+                    text(f"UPDATE {table} SET {column} = :target WHERE {column} = :id"),
+                    {"target": target, "id": company_id},
+                )
+            conn.execute(text("DELETE FROM companies WHERE id = :id"), {"id": company_id})
+            logger.info(f"Merged company {company_id} ({name!r}) into {target}")
+            merged += 1
+        
+        if dry_run:
+            transaction.rollback()
+        else:
+            transaction.commit()
+    
+    return merged
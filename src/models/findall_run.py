@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class FindAllRun(Base):
+    """
+    A Parallel FindAll run started for a search.
+    
+    Runs take 10-20 minutes, so they are recorded here rather than in
+    process memory: a restarted or different worker can resume a run, and
+    identical searches reuse an in-progress or recent one instead of
+    starting another (see FindAllRunRegistry).
+    """
+    __tablename__ = "findall_runs"
+    __table_args__ = (
+        # Reuse lookups: latest runs of a search
+        Index("ix_findall_runs_search_created", "search_key", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    findall_id = Column(String(100), nullable=False, unique=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # None: anonymous search
+    
+    # Search
+    keywords = Column(String(255), nullable=False)
+    location = Column(String(100), nullable=False)
+    search_key = Column(String(400), nullable=False)  # normalized keywords + location
+    match_limit = Column(Integer)
+    
+    # Progress, as last polled
+    status = Column(String(50), nullable=False, default="queued")  # queued, running, completed, failed, cancelled, error, timeout
+    generated_count = Column(Integer, default=0)
+    matched_count = Column(Integer, default=0)
+    error = Column(Text)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    completed_at = Column(DateTime(timezone=True))
+    
+    def __repr__(self):
+        return f"<FindAllRun(findall_id='{self.findall_id}', status='{self.status}')>"
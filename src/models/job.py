@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Boolean, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from .base import Base
 
@@ -39,10 +40,16 @@ class Job(Base):
     skills = Column(JSON)  # List of required skills
     benefits = Column(JSON)  # List of benefits
     
+    # Weighted full-text document (title A, company B, description C),
+    # maintained by a Postgres trigger (see search_index.py); unused on SQLite
+    search_vector = deferred(Column(Text().with_variant(TSVECTOR(), "postgresql")))
+    
     # Relationships
     company_id = Column(Integer, ForeignKey("companies.id"))
     company = relationship("Company", back_populates="jobs")
     applications = relationship("Application", back_populates="job")
+    scores = relationship("JobScore", back_populates="job", cascade="all, delete-orphan")
+    features = relationship("JobFeatures", back_populates="job", uselist=False, cascade="all, delete-orphan")
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,65 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class JobFeatures(Base):
+    """
+    Normalized text features of a job, computed once when the job is saved.
+    
+    The scoring services read these instead of lowercasing and scanning the
+    raw fields on every call. Rows are (re)built by JobFeaturesService; rows
+    with an older version are ignored and recomputed.
+    """
+    __tablename__ = "job_features"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False, unique=True)
+    
+    # FEATURES_VERSION the row was computed with
+    version = Column(Integer, nullable=False)
+    
+    # Normalized fields
+    title = Column(String(255))  # lowercase title
+    location = Column(String(255))  # lowercase location
+    city = Column(String(255))  # parsed city, e.g. "toulouse" for "Toulouse (hybride)"
+    skills = Column(JSON)  # lowercase, stripped skills
+    description_tokens = Column(JSON)  # unique lowercase word tokens
+    description_length = Column(Integer)
+    description_length_bucket = Column(String(20))  # short, medium, long
+    
+    # Detected from title / location / remote type
+    seniority_level = Column(String(50))  # V2 level: head, senior, mid, junior
+    title_seniority = Column(String(50))  # legacy level: senior, junior, mid
+    work_mode = Column(String(50))  # remote type, or inferred from location
+    is_remote = Column(Boolean, default=False)
+    is_hybrid = Column(Boolean, default=False)
+    
+    # Relationships
+    job = relationship("Job", back_populates="features")
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<JobFeatures(job_id={self.job_id}, version={self.version})>"
+    
+    def to_dict(self) -> dict:
+        """Convert to the features dict consumed by the scoring services."""
+        return {
+            "version": self.version,
+            "title": self.title or "",
+            "location": self.location or "",
+            "city": self.city,
+            "skills": self.skills or [],
+            "description_tokens": self.description_tokens or [],
+            "description_length": self.description_length or 0,
+            "description_length_bucket": self.description_length_bucket,
+            "seniority_level": self.seniority_level,
+            "title_seniority": self.title_seniority,
+            "work_mode": self.work_mode or "",
+            "is_remote": bool(self.is_remote),
+            "is_hybrid": bool(self.is_hybrid),
+        }
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, UniqueConstraint, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class JobScore(Base):
+    """
+    Materialized V2 score of one job for one user.
+    
+    Rows are (re)computed by ScoreMaterializationService; the fingerprint
+    identifies the scoring preferences a row was computed with.
+    """
+    __tablename__ = "job_scores"
+    __table_args__ = (
+        UniqueConstraint("user_id", "job_id", name="uq_job_scores_user_job"),
+        # Serves the (score desc, job_id) ordering and keyset pagination
+        Index("ix_job_scores_user_score", "user_id", "score", "job_id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False, index=True)
+    
+    # V2 score (0-100) and per-category breakdown
+    score = Column(Float, nullable=False)
+    breakdown = Column(JSON)
+    
+    # Per-category hash of the scoring preferences used for this row
+    # (see ScoringServiceV2.preferences_fingerprint)
+    preferences_fingerprint = Column(String(64), nullable=False)
+    
+    # Relationships
+    job = relationship("Job", back_populates="scores")
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<JobScore(user_id={self.user_id}, job_id={self.job_id}, score={self.score})>"
@@ -0,0 +1,121 @@
+"""
+Postgres full-text and trigram search schema for jobs.
+
+jobs.search_vector holds a weighted tsvector (title A, company name B,
+description C), kept up to date by triggers and indexed with GIN. The
+title, location and company name columns get pg_trgm GIN indexes, which
+let the planner serve ILIKE '%...%' filters without a sequential scan.
+
+Tables are created with Base.metadata.create_all(), which neither adds
+columns to existing tables nor knows about triggers or extensions, so
+ensure_search_schema() applies the rest at startup. Statements that lock
+the jobs table (ALTER TABLE, CREATE TRIGGER, CREATE INDEX, the backfill)
+only run when their check finds them missing, so a started schema costs
+a few catalog reads, and the whole step holds an advisory lock: workers
+starting together run it one at a time instead of deadlocking. SQLite
+(tests) keeps the plain column and skips all of this.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+# Text search configuration. Postings mix French and English, so words are
+# indexed unstemmed rather than with a single language's dictionary.
+SEARCH_CONFIG = "simple"
+
+# Arbitrary key of the advisory lock serializing ensure_search_schema()
+SCHEMA_LOCK_ID = 74210010
+
+
+def _index_missing(name: str) -> str:
+    return f"SELECT to_regclass('{name}') IS NULL"
+
+
+def _trigger_missing(name: str, table: str) -> str:
+    return (
+        f"SELECT NOT EXISTS (SELECT 1 FROM pg_trigger"
+        f" WHERE tgname = '{name}' AND tgrelid = '{table}'::regclass)"
+    )
+
+
+# (check returning true when the statement is needed, or None: always run,
+# statement). Unchecked statements take no lock on jobs.
+SEARCH_SCHEMA_DDL = [
+    (None, "CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+    (
+        "SELECT NOT EXISTS (SELECT 1 FROM information_schema.columns"
+        " WHERE table_name = 'jobs' AND column_name = 'search_vector')",
+        "ALTER TABLE jobs ADD COLUMN search_vector tsvector",
+    ),
+    (None, f"""
+    CREATE OR REPLACE FUNCTION jobs_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(
+                (SELECT name FROM companies WHERE id = NEW.company_id), ''
+            )), 'B') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.description, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """),
+    (_trigger_missing("jobs_search_vector_trigger", "jobs"), """
+    CREATE TRIGGER jobs_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description, company_id ON jobs
+    FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_update()
+    """),
+    # A company rename touches its jobs' title, which re-runs the job trigger
+    (None, """
+    CREATE OR REPLACE FUNCTION companies_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        UPDATE jobs SET title = title WHERE company_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """),
+    (_trigger_missing("companies_search_vector_trigger", "companies"), """
+    CREATE TRIGGER companies_search_vector_trigger
+    AFTER UPDATE OF name ON companies
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION companies_search_vector_update()
+    """),
+    # Backfill rows written before the trigger existed
+    (
+        "SELECT EXISTS (SELECT 1 FROM jobs WHERE search_vector IS NULL)",
+        "UPDATE jobs SET title = title WHERE search_vector IS NULL",
+    ),
+    (
+        _index_missing("ix_jobs_search_vector"),
+        "CREATE INDEX ix_jobs_search_vector ON jobs USING gin (search_vector)",
+    ),
+    (
+        _index_missing("ix_jobs_title_trgm"),
+        "CREATE INDEX ix_jobs_title_trgm ON jobs USING gin (title gin_trgm_ops)",
+    ),
+    (
+        _index_missing("ix_jobs_location_trgm"),
+        "CREATE INDEX ix_jobs_location_trgm ON jobs USING gin (location gin_trgm_ops)",
+    ),
+    (
+        _index_missing("ix_companies_name_trgm"),
+        "CREATE INDEX ix_companies_name_trgm ON companies USING gin (name gin_trgm_ops)",
+    ),
+]
+
+
+def ensure_search_schema(engine: Engine) -> bool:
+    """
+    Apply the search schema on Postgres (no-op on other databases).
+    
+    Returns:
+        True if the schema was checked (and completed where needed)
+    """
+    if engine.dialect.name != "postgresql":
+        return False
+    
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": SCHEMA_LOCK_ID})
+        for check, statement in SEARCH_SCHEMA_DDL:
+            if check is None or conn.execute(text(check)).scalar():
+                conn.execute(text(statement))
+    return True
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from ..models import get_db, Company
+from ..services.company_resolver import get_company_resolver
 from ..schemas.company import CompanyCreate, CompanyUpdate, CompanyResponse, CompanyListResponse
 
 router = APIRouter()
@@ -44,7 +46,7 @@ async def create_company(company: CompanyCreate, db: Session = Depends(get_db)):
     """Create a new company."""
     db_company = Company(**company.model_dump())
     db.add(db_company)
-    db.commit()
+    _commit_company(db, db_company)
     db.refresh(db_company)
     return db_company
 
@@ -60,11 +62,15 @@ async def update_company(
     if not db_company:
         raise HTTPException(status_code=404, detail="Company not found")
     
+    old_key = db_company.normalized_name
     update_data = company.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_company, field, value)
     
-    db.commit()
+    _commit_company(db, db_company)
+    # A rename frees the old key, cached for this company
+    if db_company.normalized_name != old_key:
+        get_company_resolver().clear()
     db.refresh(db_company)
     return db_company
 
@@ -78,4 +84,18 @@ async def delete_company(company_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_company)
     db.commit()
+    get_company_resolver().clear()
     return {"message": "Company deleted successfully"}
+
+
+def _commit_company(db: Session, company: Company) -> None:
+    """Commit a created or renamed company; names are unique once normalized."""
+    name = company.name
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Company '{name}' already exists"
+        )
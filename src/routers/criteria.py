@@ -9,6 +9,7 @@ from ..models import (
     UserScoringPreferences, DEFAULT_SCORING_PREFERENCES
 )
 from ..services.auth import get_current_user_required
+from ..services.score_materialization import ScoreMaterializationService
 
 router = APIRouter()
 
@@ -439,6 +440,9 @@ async def update_scoring_preferences(
     db.commit()
     db.refresh(prefs)
     
+    # Rescore materialized jobs with the new preferences
+    ScoreMaterializationService(db).refresh_user(user.id)
+    
     return prefs
 
 
@@ -477,6 +481,9 @@ async def toggle_source_trust(
     db.commit()
     db.refresh(prefs)
     
+    # Rescore materialized jobs with the new preferences
+    ScoreMaterializationService(db).refresh_user(user.id)
+    
     return prefs
 
 
@@ -512,6 +519,9 @@ async def add_priority_skill(
         db.commit()
         db.refresh(prefs)
     
+    # Rescore materialized jobs with the new preferences
+    ScoreMaterializationService(db).refresh_user(user.id)
+    
     return prefs
 
 
@@ -543,6 +553,9 @@ async def remove_priority_skill(
     db.commit()
     db.refresh(prefs)
     
+    # Rescore materialized jobs with the new preferences
+    ScoreMaterializationService(db).refresh_user(user.id)
+    
     return prefs
 
 
@@ -568,4 +581,7 @@ async def reset_scoring_preferences(
     db.commit()
     db.refresh(prefs)
     
+    # Rescore materialized jobs with the new preferences
+    ScoreMaterializationService(db).refresh_user(user.id)
+    
     return prefs
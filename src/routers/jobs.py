@@ -1,12 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query as SQLQuery, Session
+from typing import List, Optional, Dict, Any, Tuple
 from pydantic import BaseModel
+import base64
+import json
 
-from ..models import get_db, Job, User, UserScoringPreferences, UserProfile, DEFAULT_SCORING_PREFERENCES
+from ..models import get_db, Job, JobScore, User, UserScoringPreferences, UserProfile, DEFAULT_SCORING_PREFERENCES
 from ..schemas.job import JobCreate, JobUpdate, JobResponse, JobListResponse
 from ..services.auth import get_current_user_required
 from ..services.scoring_v2 import scoring_service_v2
+from ..services.score_materialization import (
+    ScoreMaterializationService,
+    row_to_scoring_dict,
+    scoring_query,
+)
+from ..services.job_features import JobFeaturesService
+from ..services.job_text_search import apply_text_search
 
 router = APIRouter()
 
@@ -15,6 +26,7 @@ router = APIRouter()
 async def list_jobs(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    q: Optional[str] = None,
     title: Optional[str] = None,
     location: Optional[str] = None,
     remote_type: Optional[str] = None,
@@ -22,9 +34,17 @@ async def list_jobs(
     is_active: bool = True,
     db: Session = Depends(get_db)
 ):
-    """List all jobs with optional filters."""
+    """
+    List all jobs with optional filters.
+    
+    q is a full-text search over title, company and description; matching
+    jobs are returned best match first (on Postgres).
+    """
     query = db.query(Job).filter(Job.is_active == is_active)
     
+    rank = None
+    if q:
+        query, rank = apply_text_search(db, query, q)
     if title:
         query = query.filter(Job.title.ilike(f"%{title}%"))
     if location:
@@ -35,6 +55,8 @@ async def list_jobs(
         query = query.filter(Job.source_platform == source_platform)
     
     total = query.count()
+    if rank is not None:
+        query = query.order_by(rank.desc(), Job.id)
     jobs = query.offset(skip).limit(limit).all()
     
     return JobListResponse(jobs=jobs, total=total, skip=skip, limit=limit)
@@ -75,7 +97,14 @@ async def update_job(job_id: int, job: JobUpdate, db: Session = Depends(get_db))
     for field, value in update_data.items():
         setattr(db_job, field, value)
     
+    # Recompute normalized features from the edited fields
+    JobFeaturesService(db).refresh([db_job], force=True)
+    
     db.commit()
+    
+    # Materialized scores are recomputed on next read
+    ScoreMaterializationService(db).invalidate_jobs([job_id])
+    
     db.refresh(db_job)
     return db_job
 
@@ -109,25 +138,54 @@ class ScoredJobsListResponse(BaseModel):
     total: int
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 
-@router.get("/scored/v2", response_model=ScoredJobsListResponse)
-async def list_scored_jobs_v2(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
-    title: Optional[str] = None,
-    location: Optional[str] = None,
-    remote_type: Optional[str] = None,
-    source_platform: Optional[str] = None,
-    min_score: Optional[float] = Query(None, ge=0, le=100),
-    is_active: bool = True,
-    user: User = Depends(get_current_user_required),
-    db: Session = Depends(get_db)
-):
+# Rows fetched per round trip by the streaming endpoint
+STREAM_BATCH_SIZE = 200
+
+
+def encode_score_cursor(score: float, job_id: int) -> str:
+    """Opaque keyset cursor for the (score desc, job_id asc) ordering."""
+    payload = json.dumps([score, job_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_score_cursor(cursor: str) -> Tuple[float, int]:
+    """Decode a cursor from encode_score_cursor (HTTP 400 if malformed)."""
+    try:
+        score, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(score), int(job_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def after_score_cursor(query: SQLQuery, cursor: str) -> SQLQuery:
+    """Keep rows after the cursor in (score desc, job_id asc) order."""
+    after_score, after_job_id = decode_score_cursor(cursor)
+    return query.filter(or_(
+        JobScore.score < after_score,
+        and_(JobScore.score == after_score, JobScore.job_id > after_job_id)
+    ))
+
+
+def scored_jobs_query(
+    db: Session,
+    user: User,
+    q: Optional[str],
+    title: Optional[str],
+    location: Optional[str],
+    remote_type: Optional[str],
+    source_platform: Optional[str],
+    min_score: Optional[float],
+    is_active: bool
+) -> SQLQuery:
     """
-    List jobs with V2 scoring (fixed-point system).
+    Bring the user's materialized scores up to date and query them.
     
-    Jobs are sorted by score (highest first).
+    Rows carry the scoring_query() columns plus score and breakdown. The
+    query is filtered but not ordered: the listings keep score order, so the
+    text search (q) only filters.
     """
     # Get user preferences
     prefs = db.query(UserScoringPreferences).filter(
@@ -143,22 +201,24 @@ async def list_scored_jobs_v2(
         db.commit()
         db.refresh(prefs)
     
-    # Get user profile for CV skills
-    profile = db.query(UserProfile).filter(
-        UserProfile.user_id == user.id
-    ).first()
-    
-    cv_skills = []
-    if profile and profile.skills:
-        cv_skills = profile.skills if isinstance(profile.skills, list) else []
-    
-    # Build preferences dict for scoring
-    scoring_prefs = prefs.to_dict()
-    scoring_prefs["cv_skills"] = cv_skills
+    # Bring materialized scores up to date (only new or stale rows are scored)
+    materializer = ScoreMaterializationService(db)
+    scoring_prefs = materializer.get_scoring_prefs(user.id)
+    materializer.ensure_fresh(user.id, scoring_prefs)
     
-    # Query jobs
-    query = db.query(Job).filter(Job.is_active == is_active)
+    # Query materialized scores, selecting only the columns of the response
+    query = scoring_query(db).add_columns(
+        JobScore.score,
+        JobScore.breakdown
+    ).join(
+        JobScore, JobScore.job_id == Job.id
+    ).filter(
+        JobScore.user_id == user.id,
+        Job.is_active == is_active
+    )
     
+    if q:
+        query, _ = apply_text_search(db, query, q)
     if title:
         query = query.filter(Job.title.ilike(f"%{title}%"))
     if location:
@@ -167,54 +227,133 @@ async def list_scored_jobs_v2(
         query = query.filter(Job.remote_type == remote_type)
     if source_platform:
         query = query.filter(Job.source_platform == source_platform)
+    if min_score is not None:
+        query = query.filter(JobScore.score >= min_score)
     
-    jobs = query.all()
-    
-    # Score all jobs
-    scored_jobs = []
-    for job in jobs:
-        job_dict = {
-            "id": job.id,
-            "title": job.title,
-            "company": job.company.name if job.company else None,
-            "location": job.location,
-            "description": job.description,
-            "salary_min": job.salary_min,
-            "salary_max": job.salary_max,
-            "remote_type": job.remote_type,
-            "job_type": job.job_type,
-            "experience_level": job.experience_level,
-            "skills": job.skills if job.skills else [],
-            "source": job.source_platform,
-            "source_url": job.source_url,
-            "posted_at": job.posted_date.isoformat() if job.posted_date else None,
-            "created_at": job.created_at.isoformat() if job.created_at else None,
-        }
-        
-        score_result = scoring_service_v2.calculate_total_score(job_dict, scoring_prefs)
-        
-        # Filter by min_score if specified
-        if min_score is not None and score_result["score"] < min_score:
-            continue
-        
-        scored_jobs.append(ScoredJobResponse(
-            job=job_dict,
-            score=score_result["score"],
-            breakdown=score_result["breakdown"]
-        ))
+    return query
+
+
+@router.get("/scored/v2", response_model=ScoredJobsListResponse)
+async def list_scored_jobs_v2(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    title: Optional[str] = None,
+    location: Optional[str] = None,
+    remote_type: Optional[str] = None,
+    source_platform: Optional[str] = None,
+    min_score: Optional[float] = Query(None, ge=0, le=100),
+    is_active: bool = True,
+    user: User = Depends(get_current_user_required),
+    db: Session = Depends(get_db)
+):
+    """
+    List jobs with V2 scoring (fixed-point system).
+    
+    Jobs are sorted by score (highest first), ties by job id. Pages can be
+    requested by offset (skip) or, cheaper on deep pages, by passing the
+    previous response's next_cursor (skip is then ignored).
+    """
+    query = scored_jobs_query(
+        db, user, q, title, location, remote_type, source_platform, min_score, is_active
+    )
     
-    # Sort by score (highest first)
-    scored_jobs.sort(key=lambda x: x.score, reverse=True)
+    total = query.count()
+    
+    # Sort by score (highest first) and paginate in the database: only the
+    # page's rows are loaded and turned into response models
+    if cursor:
+        query = after_score_cursor(query, cursor)
+    
+    query = query.order_by(JobScore.score.desc(), JobScore.job_id)
+    if not cursor:
+        query = query.offset(skip)
+    rows = query.limit(limit).all()
     
-    # Apply pagination
-    total = len(scored_jobs)
-    paginated_jobs = scored_jobs[skip:skip + limit]
+    paginated_jobs = [
+        ScoredJobResponse(
+            job=row_to_scoring_dict(row),
+            score=row.score,
+            breakdown=row.breakdown or {}
+        )
+        for row in rows
+    ]
+    
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = encode_score_cursor(rows[-1].score, rows[-1].id)
     
     return ScoredJobsListResponse(
         jobs=paginated_jobs,
         total=total,
         skip=skip,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/scored/v2/stream")
+async def stream_scored_jobs_v2(
+    stream_format: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$"),
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    title: Optional[str] = None,
+    location: Optional[str] = None,
+    remote_type: Optional[str] = None,
+    source_platform: Optional[str] = None,
+    min_score: Optional[float] = Query(None, ge=0, le=100),
+    is_active: bool = True,
+    user: User = Depends(get_current_user_required),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream V2 scored jobs in score order, as NDJSON or SSE.
+    
+    Same filters and order as /scored/v2. Rows are fetched STREAM_BATCH_SIZE
+    at a time through a server-side cursor and sent as soon as they are
+    read, so the client gets the first jobs without waiting for the whole
+    list and memory stays bounded.
+    
+    - ndjson: one ScoredJobResponse JSON object per line
+    - sse: one "data: {...}" event per job, then a "complete" event
+    """
+    query = scored_jobs_query(
+        db, user, q, title, location, remote_type, source_platform, min_score, is_active
+    )
+    if cursor:
+        query = after_score_cursor(query, cursor)
+    query = query.order_by(JobScore.score.desc(), JobScore.job_id)
+    if limit:
+        query = query.limit(limit)
+    
+    def generate():
+        # Sync generator: Starlette iterates it in a worker thread, so the
+        # blocking database reads do not hold up the event loop
+        count = 0
+        for row in query.yield_per(STREAM_BATCH_SIZE):
+            payload = json.dumps({
+                "job": row_to_scoring_dict(row),
+                "score": row.score,
+                "breakdown": row.breakdown or {}
+            })
+            count += 1
+            if stream_format == "sse":
+                yield f"data: {payload}\n\n"
+            else:
+                yield payload + "\n"
+        
+        if stream_format == "sse":
+            yield f"data: {json.dumps({'event': 'complete', 'count': count})}\n\n"
+    
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream" if stream_format == "sse" else "application/x-ndjson",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
     )
 
 
@@ -227,8 +366,8 @@ async def get_job_score_v2(
     """
     Get V2 score breakdown for a specific job.
     """
-    job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
+    row = scoring_query(db).filter(Job.id == job_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Job not found")
     
     # Get user preferences
@@ -258,28 +397,13 @@ async def get_job_score_v2(
     scoring_prefs = prefs.to_dict()
     scoring_prefs["cv_skills"] = cv_skills
     
-    job_dict = {
-        "id": job.id,
-        "title": job.title,
-        "company": job.company.name if job.company else None,
-        "location": job.location,
-        "description": job.description,
-        "salary_min": job.salary_min,
-        "salary_max": job.salary_max,
-        "remote_type": job.remote_type,
-        "job_type": job.job_type,
-        "experience_level": job.experience_level,
-            "skills": job.skills if job.skills else [],
-            "source": job.source_platform,
-            "source_url": job.source_url,
-            "posted_at": job.posted_date.isoformat() if job.posted_date else None,
-        }
+    job_dict = row_to_scoring_dict(row)
     
     score_result = scoring_service_v2.calculate_total_score(job_dict, scoring_prefs)
     
     return {
         "job_id": job_id,
-        "job_title": job.title,
+        "job_title": row.title,
         "score": score_result["score"],
         "breakdown": score_result["breakdown"]
     }
@@ -13,7 +13,10 @@ import os
 
 from ..models import get_db, User, UserScoringPreferences, UserProfile, DEFAULT_SCORING_PREFERENCES
 from ..services.parallel_findall import ParallelFindAllService
+from ..services.findall_runs import FindAllRunRegistry
+from ..services.findall_poller import get_findall_poller
 from ..services.scoring_v2 import scoring_service_v2
+from ..services.score_materialization import load_scoring_dicts
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -22,9 +25,6 @@ logging.basicConfig(level=logging.INFO)
 
 router = APIRouter()
 
-# Store active findall runs in memory (for resume functionality)
-active_runs: dict = {}
-
 # JWT settings
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 JWT_ALGORITHM = "HS256"
@@ -89,19 +89,21 @@ async def get_findall_status(
     findall_service = ParallelFindAllService(db)
     
     try:
-        # Use the underlying client to get status
-        run = findall_service.client.beta.findall.retrieve(
-            findall_id=findall_id,
-            betas=[findall_service.beta_version]
-        )
+        registry = FindAllRunRegistry(db)
+        run = registry.get(findall_id)
+        if run is not None and get_findall_poller().is_polling(findall_id):
+            # Kept current by the run's poller: no extra API call
+            return {
+                "findall_id": findall_id,
+                "status": run.status,
+                "generated_count": run.generated_count,
+                "matched_count": run.matched_count,
+                "is_complete": run.completed_at is not None
+            }
         
-        return {
-            "findall_id": findall_id,
-            "status": run.status.status,
-            "generated_count": run.status.metrics.generated_candidates_count if hasattr(run.status.metrics, 'generated_candidates_count') else 0,
-            "matched_count": run.status.metrics.matched_candidates_count if hasattr(run.status.metrics, 'matched_candidates_count') else 0,
-            "is_complete": run.status.status in ["completed", "failed", "cancelled"]
-        }
+        status = await findall_service.get_status(findall_id)
+        registry.update(findall_id, status)
+        return {"findall_id": findall_id, **status}
     except Exception as e:
         logger.error(f"Error getting FindAll status: {e}")
         return {"error": str(e)}
@@ -143,87 +145,68 @@ async def search_findall_stream(
             findall_service = ParallelFindAllService(db)
             logger.info("ParallelFindAllService initialized successfully")
             
-            # Step 1: Create or resume FindAll run
-            if resume_id:
-                findall_id = resume_id
+            # Step 1: Create or resume FindAll run (an identical search
+            # reuses an in-progress or recently completed run)
+            registry = FindAllRunRegistry(db)
+            limit = match_limit if match_limit is not None else findall_service.default_match_limit
+            reusable = None if resume_id else registry.find_reusable(keywords, location, limit)
+            if resume_id or reusable:
+                findall_id = resume_id or reusable.findall_id
                 logger.info(f"Resuming existing FindAll run: {findall_id}")
-                yield f"data: {json.dumps({'event': 'findall_resumed', 'findall_id': findall_id, 'status': 'resuming'})}\n\n"
+                yield f"data: {json.dumps({'event': 'findall_resumed', 'findall_id': findall_id, 'status': 'resuming', 'reused': reusable is not None})}\n\n"
             else:
                 logger.info(f"Starting FindAll search: keywords='{keywords}', location='{location}'")
                 logger.info("Creating FindAll run...")
-                findall_id = findall_service.create_run(
+                findall_id = await findall_service.create_run(
                     keywords=keywords,
                     location=location,
-                    match_limit=match_limit
+                    match_limit=limit
                 )
                 logger.info(f"FindAll run created: {findall_id}")
-                # Store for potential resume
-                active_runs[f"{keywords}_{location}"] = findall_id
+                registry.register(findall_id, keywords, location, limit, user.id if user else None)
+                get_findall_poller().ensure_polling(findall_id)
                 yield f"data: {json.dumps({'event': 'findall_created', 'findall_id': findall_id, 'status': 'queued'})}\n\n"
             
-            # Step 2: Poll for progress with keepalive
-            progress = None
+            # Step 2: Follow the run's background poller, which records
+            # progress and saves the results even if this client leaves
             last_keepalive = asyncio.get_event_loop().time()
             
-            async for progress in findall_service.poll_status(findall_id):
+            async for event in get_findall_poller().subscribe(findall_id):
                 current_time = asyncio.get_event_loop().time()
                 elapsed = int(current_time - start_time)
                 
-                # Add elapsed time
-                progress['elapsed'] = elapsed
-                
-                # Emit progress event
-                yield f"data: {json.dumps({'event': 'findall_progress', **progress})}\n\n"
-                
-                # Send keepalive comment every 5 seconds to prevent timeout
-                if current_time - last_keepalive > 5:
-                    yield f": keepalive {elapsed}s\n\n"
-                    last_keepalive = current_time
+                if event['event'] == 'findall_progress':
+                    # Emit progress event, with elapsed time
+                    yield f"data: {json.dumps({**event, 'elapsed': elapsed})}\n\n"
+                    
+                    # Send keepalive comment every 5 seconds to prevent timeout
+                    if current_time - last_keepalive > 5:
+                        yield f": keepalive {elapsed}s\n\n"
+                        last_keepalive = current_time
+                    continue
                 
-                # Check if complete
-                if progress.get('is_complete'):
+                if event['event'] == 'error':
+                    # Run did not complete successfully
+                    yield f"data: {json.dumps(event)}\n\n"
                     break
-            
-            # Step 3: Get final results
-            if progress and progress.get('status') == 'completed':
-                candidates = findall_service.get_results(findall_id)
-                
-                # Convert to Job models
-                jobs = findall_service.convert_to_job_format(candidates)
                 
-                # Save to database
-                saved_jobs = findall_service.save_jobs(jobs)
+                # Step 3: Score the saved results for this user
+                # One column-projected query (company name joined in)
+                job_dicts = load_scoring_dicts(db, event['job_ids'])
                 
                 # Score jobs with V2 scoring if user is authenticated
                 scored_jobs = []
-                for job in saved_jobs:
-                    job_dict = {
-                        "id": job.id,
-                        "title": job.title,
-                        "company": job.company.name if job.company else None,
-                        "location": job.location,
-                        "description": job.description or "",
-                        "salary_min": job.salary_min,
-                        "salary_max": job.salary_max,
-                        "remote_type": job.remote_type,
-                        "job_type": job.job_type,
-                        "experience_level": job.experience_level,
-                        "skills": job.skills if job.skills else [],
-                        "source": job.source_platform,
-                        "source_url": job.source_url,
-                        "posted_at": job.posted_date.isoformat() if job.posted_date else None,
-                    }
-                    
-                    # Calculate V2 score if user preferences available
-                    if scoring_prefs:
-                        score_result = scoring_service_v2.calculate_total_score(job_dict, scoring_prefs)
+                if scoring_prefs:
+                    score_results = scoring_service_v2.score_batch(job_dicts, scoring_prefs)
+                    for job_dict, score_result in zip(job_dicts, score_results):
                         scored_jobs.append({
                             "job": job_dict,
                             "score": score_result["score"],
                             "breakdown": score_result["breakdown"]
                         })
-                    else:
-                        # No scoring - just return job data
+                else:
+                    # No scoring - just return job data
+                    for job_dict in job_dicts:
                         scored_jobs.append({
                             "job": job_dict,
                             "score": 0,
@@ -236,10 +219,6 @@ async def search_findall_stream(
                 # Emit complete event
                 execution_time = int(asyncio.get_event_loop().time() - start_time)
                 yield f"data: {json.dumps({'event': 'findall_complete', 'findall_id': findall_id, 'total_matched': len(scored_jobs), 'execution_time': execution_time, 'jobs': scored_jobs})}\n\n"
-            else:
-                # Run did not complete successfully
-                error_msg = progress.get('error', 'FindAll run did not complete') if progress else 'No progress received'
-                yield f"data: {json.dumps({'event': 'error', 'message': error_msg})}\n\n"
         
         except Exception as e:
             # Emit error event
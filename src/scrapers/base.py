@@ -1,10 +1,76 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Callable, List, Dict, Optional
+import asyncio
+import math
 import httpx
 from bs4 import BeautifulSoup
 import re
 
-from ..services.scraping_service import ScrapingService
+from .parsing import run_parser
+from ..services.rate_limiter import Priority
+from ..services.scraping_service import get_scraping_service
+from ..services.text_matching import get_keyword_matcher
+
+
+COMMON_SKILLS = [
+    "python", "javascript", "typescript", "react", "node.js", "nodejs",
+    "java", "c++", "c#", "go", "rust", "ruby", "php", "swift", "kotlin",
+    "sql", "postgresql", "mysql", "mongodb", "redis", "elasticsearch",
+    "aws", "azure", "gcp", "docker", "kubernetes", "terraform",
+    "git", "ci/cd", "agile", "scrum", "rest", "graphql", "api",
+    "machine learning", "ml", "ai", "data science", "deep learning",
+    "html", "css", "sass", "webpack", "vue", "angular", "svelte",
+    "django", "flask", "fastapi", "spring", "express", "nest.js",
+]
+COMMON_SKILLS_MATCHER = get_keyword_matcher(COMMON_SKILLS)
+
+# Result pages requested at most per search
+MAX_PAGES = 10
+
+
+def parse_salary(salary_text: str) -> Dict:
+    """Parse salary text into min/max values."""
+    result = {"min": None, "max": None, "currency": "EUR"}
+    
+    if not salary_text:
+        return result
+    
+    # Clean the text
+    salary_text = salary_text.replace(",", "").replace(" ", "")
+    
+    # Detect currency
+    if "$" in salary_text:
+        result["currency"] = "USD"
+    elif "£" in salary_text:
+        result["currency"] = "GBP"
+    elif "€" in salary_text:
+        result["currency"] = "EUR"
+    
+    # Extract numbers
+    numbers = re.findall(r"\d+(?:\.\d+)?", salary_text)
+    numbers = [float(n) for n in numbers]
+    
+    # Handle K notation (e.g., 50K)
+    if "k" in salary_text.lower():
+        numbers = [n * 1000 if n < 1000 else n for n in numbers]
+    
+    if len(numbers) >= 2:
+        result["min"] = min(numbers)
+        result["max"] = max(numbers)
+    elif len(numbers) == 1:
+        result["min"] = numbers[0]
+        result["max"] = numbers[0]
+    
+    return result
+
+
+def clean_text(text: str) -> str:
+    """Clean and normalize text."""
+    if not text:
+        return ""
+    # Remove extra whitespace
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
 
 
 class BaseScraper(ABC):
@@ -17,9 +83,16 @@ class BaseScraper(ABC):
             "Accept-Language": "en-US,en;q=0.5",
         }
         self.platform_name = "base"
-        self.scraping_service = ScrapingService()
+        self.page_size = 20  # new results per page, set by each platform
+        self.scraping_service = get_scraping_service()
+        # Live searches hedge slow providers and take rate limiter slots
+        # ahead of background work (see ScrapingService.fetch_page)
+        self.hedged = False
+        self.priority = Priority.BACKGROUND
+        # Incremental crawls: predicate telling postings already ingested
+        # and unchanged, which are not yielded (see paginate)
+        self.seen_filter: Optional[Callable[[Dict], bool]] = None
     
-    @abstractmethod
     async def search(
         self,
         keywords: str,
@@ -29,8 +102,97 @@ class BaseScraper(ABC):
         limit: int = 20
     ) -> List[Dict]:
         """Search for jobs on the platform."""
+        return [
+            job async for job in self.search_stream(
+                keywords, location, remote_only, experience_level, limit
+            )
+        ]
+    
+    @abstractmethod
+    def search_stream(
+        self,
+        keywords: str,
+        location: Optional[str] = None,
+        remote_only: bool = False,
+        experience_level: Optional[str] = None,
+        limit: int = 20
+    ) -> AsyncIterator[Dict]:
+        """Search for jobs on the platform, yielding them as pages are parsed."""
         pass
     
+    async def paginate(
+        self,
+        page_url: Callable[[int], str],
+        parser: Callable[[str, int], List[Dict]],
+        limit: int
+    ) -> AsyncIterator[Dict]:
+        """
+        Fetch result pages concurrently, yielding unique jobs as each parses.
+        
+        Enough pages for `limit` jobs (page_size per page, up to MAX_PAGES)
+        are requested at once; the shared rate limiter paces the fetches.
+        Fetching stops as soon as `limit` unique jobs were yielded, and an
+        empty page (end of the results, or the site refusing us) drops the
+        pages after it.
+        
+        With a seen_filter, known postings are skipped, and a page holding
+        only known postings also drops the pages after it: the crawl has
+        caught up with what was ingested, so it costs in proportion to new
+        postings.
+        
+        Args:
+            page_url: URL of a results page, by 0-based page index
+            parser: Module-level parse function (run in the parse pool)
+            limit: Number of unique jobs wanted
+        """
+        pages = min(MAX_PAGES, max(1, math.ceil(limit / self.page_size)))
+        tasks = {
+            asyncio.create_task(self._fetch_jobs(page_url(page), parser, limit)): page
+            for page in range(pages)
+        }
+        pending = set(tasks)
+        seen = set()
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=tasks.get):
+                    jobs = task.result()
+                    if self.seen_filter:
+                        jobs = [job for job in jobs if not self.seen_filter(job)]
+                    if not jobs:
+                        later = {other for other in pending if tasks[other] > tasks[task]}
+                        for other in later:
+                            other.cancel()
+                        pending -= later
+                        continue
+                    
+                    for job in jobs:
+                        key = job.get("source_url") or (job.get("title"), job.get("company_name"))
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        yield job
+                        if len(seen) >= limit:
+                            return
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _fetch_jobs(
+        self,
+        url: str,
+        parser: Callable[[str, int], List[Dict]],
+        limit: int
+    ) -> List[Dict]:
+        """Jobs of one results page (empty if it could not be fetched)."""
+        html = await self.fetch_page(url)
+        if not html:
+            return []
+        
+        # Parsed in the parse pool, off the event loop
+        return await run_parser(parser, html, limit)
+    
     async def fetch_page(self, url: str) -> Optional[str]:
         """
         Fetch a page and return its HTML content.
@@ -40,69 +202,18 @@ class BaseScraper(ABC):
         2. BrightData (if API key available)
         3. httpx simple (always available)
         """
-        return await self.scraping_service.fetch_page(url)
+        return await self.scraping_service.fetch_page(
+            url, hedged=self.hedged, priority=self.priority
+        )
     
     def parse_salary(self, salary_text: str) -> Dict:
         """Parse salary text into min/max values."""
-        result = {"min": None, "max": None, "currency": "EUR"}
-        
-        if not salary_text:
-            return result
-        
-        # Clean the text
-        salary_text = salary_text.replace(",", "").replace(" ", "")
-        
-        # Detect currency
-        if "$" in salary_text:
-            result["currency"] = "USD"
-        elif "£" in salary_text:
-            result["currency"] = "GBP"
-        elif "€" in salary_text:
-            result["currency"] = "EUR"
-        
-        # Extract numbers
-        numbers = re.findall(r"\d+(?:\.\d+)?", salary_text)
-        numbers = [float(n) for n in numbers]
-        
-        # Handle K notation (e.g., 50K)
-        if "k" in salary_text.lower():
-            numbers = [n * 1000 if n < 1000 else n for n in numbers]
-        
-        if len(numbers) >= 2:
-            result["min"] = min(numbers)
-            result["max"] = max(numbers)
-        elif len(numbers) == 1:
-            result["min"] = numbers[0]
-            result["max"] = numbers[0]
-        
-        return result
+        return parse_salary(salary_text)
     
     def clean_text(self, text: str) -> str:
         """Clean and normalize text."""
-        if not text:
-            return ""
-        # Remove extra whitespace
-        text = re.sub(r"\s+", " ", text)
-        return text.strip()
+        return clean_text(text)
     
     def extract_skills(self, text: str) -> List[str]:
-        """Extract common skills from job description."""
-        common_skills = [
-            "python", "javascript", "typescript", "react", "node.js", "nodejs",
-            "java", "c++", "c#", "go", "rust", "ruby", "php", "swift", "kotlin",
-            "sql", "postgresql", "mysql", "mongodb", "redis", "elasticsearch",
-            "aws", "azure", "gcp", "docker", "kubernetes", "terraform",
-            "git", "ci/cd", "agile", "scrum", "rest", "graphql", "api",
-            "machine learning", "ml", "ai", "data science", "deep learning",
-            "html", "css", "sass", "webpack", "vue", "angular", "svelte",
-            "django", "flask", "fastapi", "spring", "express", "nest.js",
-        ]
-        
-        text_lower = text.lower()
-        found_skills = []
-        
-        for skill in common_skills:
-            if skill in text_lower:
-                found_skills.append(skill)
-        
-        return list(set(found_skills))
+        """Extract common skills from job description (whole words only)."""
+        return list(COMMON_SKILLS_MATCHER.find_all(text))
@@ -0,0 +1,172 @@
+"""
+Compiled selectors for job cards on results pages.
+
+Each platform declares its cards and card fields once, as alternative
+(tag, attributes) selectors in BeautifulSoup's find() terms. They are
+compiled to lxml XPath expressions at import time, so a page is parsed
+by libxml2 in one pass and every field is one precompiled lookup, instead
+of chains of card.find(...) or card.find(...) walking a BeautifulSoup
+tree per field.
+
+The same declarations also drive a BeautifulSoup implementation (with a
+SoupStrainer that only builds the card subtrees). It returns the same
+values and serves as the reference in tests and benchmarks.
+"""
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
+
+import lxml.html
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+
+# Text of an element as BeautifulSoup's get_text() sees it (no script,
+# style or comment content)
+_TEXT = etree.XPath(".//text()[not(parent::script or parent::style)]")
+
+
+class Select(NamedTuple):
+    """One element selector: tag name and attribute filters, as for find()."""
+    tag: str
+    attrs: Dict[str, Union[str, bool]] = {}
+    
+    def xpath(self, root: str = ".//") -> str:
+        """XPath of the matching elements (descendants of the context node)."""
+        conditions = []
+        for name, value in self.attrs.items():
+            if value is True:
+                conditions.append(f"@{name}")
+            elif name == "class":
+                # Like class_="x" in BeautifulSoup: one of the element's classes
+                conditions.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {value} ')")
+            else:
+                conditions.append(f"@{name}='{value}'")
+        return root + self.tag + "".join(f"[{condition}]" for condition in conditions)
+    
+    def matches(self, tag: str, attrs: Dict[str, str]) -> bool:
+        """Whether a tag being parsed matches (SoupStrainer callback)."""
+        if tag != self.tag:
+            return False
+        for name, value in self.attrs.items():
+            actual = attrs.get(name)
+            if actual is None:
+                return False
+            if value is True:
+                continue
+            if name == "class":
+                classes = actual if isinstance(actual, list) else actual.split()
+                if value not in classes:
+                    return False
+            elif actual != value:
+                return False
+        return True
+
+
+class Field(NamedTuple):
+    """
+    A card field: alternative selectors (first found wins) and what to read.
+    
+    The value is the element's text, or its attribute `attr` ("" if the
+    element lacks it); None when no selector matches.
+    """
+    selectors: Sequence[Select]
+    attr: Optional[str] = None  # None: the element's text
+
+
+class CardSelectors:
+    """
+    Selectors of one platform's results page.
+    
+    Example:
+        SELECTORS = CardSelectors(
+            cards=[Select("div", {"class": "job_seen_beacon"})],
+            fields={"title": Field([Select("h2", {"class": "jobTitle"})])},
+        )
+        for card in SELECTORS.extract(html, limit=20):
+            card["title"]  # text, or None if the card has no such element
+    """
+    
+    def __init__(self, cards: Sequence[Select], fields: Dict[str, Field]):
+        """
+        Args:
+            cards: Alternative card selectors; the first one matching any
+                element on the page is used
+            fields: Values to extract from each card
+        """
+        self.cards = list(cards)
+        self.fields = dict(fields)
+        self._card_xpaths = [etree.XPath(select.xpath("//")) for select in self.cards]
+        self._field_xpaths = {
+            name: [etree.XPath(f"({select.xpath()})[1]") for select in field.selectors]
+            for name, field in self.fields.items()
+        }
+        card_tags = {select.tag for select in self.cards}
+        self.strainer = SoupStrainer(
+            lambda tag, attrs: tag in card_tags
+            and any(select.matches(tag, attrs) for select in self.cards)
+        )
+    
+    def extract(self, html: str, limit: int) -> List[Dict[str, Optional[str]]]:
+        """Field values of the first `limit` cards of a page (lxml XPath)."""
+        try:
+            root = lxml.html.document_fromstring(html)
+        except ValueError:
+            # Unicode input with an XML encoding declaration
+            root = lxml.html.document_fromstring(html.encode("utf-8"))
+        except etree.ParserError:
+            return []  # empty document
+        
+        cards = []
+        for card_xpath in self._card_xpaths:
+            cards = card_xpath(root)
+            if cards:
+                break
+        
+        results = []
+        for card in cards[:limit]:
+            values = {}
+            for name, xpaths in self._field_xpaths.items():
+                attr = self.fields[name].attr
+                value = None
+                for xpath in xpaths:
+                    found = xpath(card)
+                    if found:
+                        element = found[0]
+                        value = element.get(attr, "") if attr else "".join(_TEXT(element))
+                        break
+                values[name] = value
+            results.append(values)
+        return results
+    
+    def extract_soup(
+        self,
+        html: str,
+        limit: int,
+        strain: bool = True
+    ) -> List[Dict[str, Optional[str]]]:
+        """
+        Same as extract(), with BeautifulSoup find() calls.
+        
+        Args:
+            strain: Only build the card subtrees (SoupStrainer); False
+                parses the whole page, as the scrapers originally did
+        """
+        soup = BeautifulSoup(html, "lxml", parse_only=self.strainer if strain else None)
+        
+        cards = []
+        for select in self.cards:
+            cards = soup.find_all(select.tag, select.attrs)
+            if cards:
+                break
+        
+        results = []
+        for card in cards[:limit]:
+            values = {}
+            for name, field in self.fields.items():
+                value = None
+                for select in field.selectors:
+                    element = card.find(select.tag, select.attrs)
+                    if element is not None:
+                        value = element.get(field.attr, "") if field.attr else element.get_text()
+                        break
+                values[name] = value
+            results.append(values)
+        return results
@@ -1,7 +1,29 @@
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from urllib.parse import quote_plus
-from .base import BaseScraper
-from bs4 import BeautifulSoup
+from .base import BaseScraper, clean_text, parse_salary
+from .card_selectors import CardSelectors, Field, Select
+
+PLATFORM_NAME = "glassdoor"
+
+# Glassdoor uses various class names; alternatives in order of preference
+TITLE_LINK = [
+    Select("a", {"data-test": "job-link"}),
+    Select("a", {"class": "jobLink"}),
+]
+SELECTORS = CardSelectors(
+    cards=[
+        Select("li", {"class": "react-job-listing"}),
+        Select("div", {"data-test": "jobListing"}),
+    ],
+    fields={
+        "title": Field(TITLE_LINK),
+        "href": Field(TITLE_LINK, attr="href"),
+        "company": Field([Select("div", {"data-test": "employer-short-name"})]),
+        "location": Field([Select("span", {"data-test": "emp-location"})]),
+        "salary": Field([Select("span", {"data-test": "detailSalary"})]),
+        "rating": Field([Select("span", {"data-test": "rating"})]),
+    },
+)
 
 
 class GlassdoorScraper(BaseScraper):
@@ -14,25 +36,24 @@ class GlassdoorScraper(BaseScraper):
     
     def __init__(self):
         super().__init__()
-        self.platform_name = "glassdoor"
+        self.platform_name = PLATFORM_NAME
         self.base_url = "https://www.glassdoor.com/Job/jobs.htm"
+        self.page_size = 30
     
-    async def search(
+    def search_stream(
         self,
         keywords: str,
         location: Optional[str] = None,
         remote_only: bool = False,
         experience_level: Optional[str] = None,
         limit: int = 20
-    ) -> List[Dict]:
+    ) -> AsyncIterator[Dict]:
         """
         Search Glassdoor for jobs.
         
         For better results, use MCP tools (firecrawl, playwright) configured
         in your environment for enhanced scraping capabilities.
         """
-        jobs = []
-        
         # Build search URL
         params = [f"sc.keyword={quote_plus(keywords)}"]
         
@@ -44,93 +65,81 @@ class GlassdoorScraper(BaseScraper):
         
         url = f"{self.base_url}?{'&'.join(params)}"
         
-        html = await self.fetch_page(url)
-        if not html:
-            return jobs
-        
-        soup = BeautifulSoup(html, "lxml")
-        
-        # Parse job cards - Glassdoor uses various class names
-        job_cards = soup.find_all("li", class_="react-job-listing")[:limit]
-        
-        if not job_cards:
-            # Try alternative selector
-            job_cards = soup.find_all("div", {"data-test": "jobListing"})[:limit]
-        
-        for card in job_cards:
-            try:
-                job = self._parse_job_card(card)
-                if job:
-                    jobs.append(job)
-            except Exception as e:
-                print(f"Error parsing Glassdoor job card: {e}")
-                continue
+        def page_url(page: int) -> str:
+            # Glassdoor pages are numbered from 1
+            return f"{url}&p={page + 1}" if page else url
         
-        return jobs
+        return self.paginate(page_url, parse_search_results, limit)
+
+
+def parse_search_results(html: str, limit: int) -> List[Dict]:
+    """Job dicts of a Glassdoor results page (pure: runs in the parse pool)."""
+    jobs = []
     
-    def _parse_job_card(self, card) -> Optional[Dict]:
-        """Parse a Glassdoor job card."""
-        title_elem = card.find("a", {"data-test": "job-link"})
-        company_elem = card.find("div", {"data-test": "employer-short-name"})
-        location_elem = card.find("span", {"data-test": "emp-location"})
-        salary_elem = card.find("span", {"data-test": "detailSalary"})
-        rating_elem = card.find("span", {"data-test": "rating"})
-        
-        if not title_elem:
-            # Try alternative selectors
-            title_elem = card.find("a", class_="jobLink")
-        
-        if not title_elem:
-            return None
-        
-        title = self.clean_text(title_elem.get_text())
-        company_name = self.clean_text(company_elem.get_text()) if company_elem else None
-        location = self.clean_text(location_elem.get_text()) if location_elem else None
-        
-        # Get job URL
-        job_url = title_elem.get("href", "")
-        if job_url and not job_url.startswith("http"):
-            job_url = f"https://www.glassdoor.com{job_url}"
-        
-        # Parse salary
-        salary_info = {"min": None, "max": None, "currency": "EUR"}
-        if salary_elem:
-            salary_text = salary_elem.get_text()
-            salary_info = self.parse_salary(salary_text)
-        
-        # Get company rating
-        company_rating = None
-        if rating_elem:
-            try:
-                company_rating = float(rating_elem.get_text())
-            except:
-                pass
-        
-        # Determine remote type
-        remote_type = None
-        if location:
-            location_lower = location.lower()
-            if "remote" in location_lower:
-                remote_type = "remote"
-            elif "hybrid" in location_lower:
-                remote_type = "hybrid"
-            else:
-                remote_type = "onsite"
-        
-        return {
-            "title": title,
-            "company_name": company_name,
-            "location": location,
-            "remote_type": remote_type,
-            "source_url": job_url,
-            "source_platform": self.platform_name,
-            "description": None,
-            "salary_min": salary_info["min"],
-            "salary_max": salary_info["max"],
-            "salary_currency": salary_info["currency"],
-            "job_type": None,
-            "experience_level": None,
-            "skills": [],
-            "benefits": [],
-            "company_rating": company_rating,
-        }
+    for card in SELECTORS.extract(html, limit):
+        try:
+            job = _parse_job_card(card)
+            if job:
+                jobs.append(job)
+        except Exception as e:
+            print(f"Error parsing Glassdoor job card: {e}")
+            continue
+    
+    return jobs
+
+
+def _parse_job_card(card: Dict[str, Optional[str]]) -> Optional[Dict]:
+    """Build a job from a Glassdoor card's extracted fields."""
+    title = clean_text(card["title"])
+    if not title:
+        return None
+    
+    company_name = clean_text(card["company"]) if card["company"] is not None else None
+    location = clean_text(card["location"]) if card["location"] is not None else None
+    
+    # Get job URL
+    job_url = card["href"] or ""
+    if job_url and not job_url.startswith("http"):
+        job_url = f"https://www.glassdoor.com{job_url}"
+    
+    # Parse salary
+    salary_info = {"min": None, "max": None, "currency": "EUR"}
+    if card["salary"] is not None:
+        salary_info = parse_salary(card["salary"])
+    
+    # Get company rating
+    company_rating = None
+    if card["rating"] is not None:
+        try:
+            company_rating = float(card["rating"])
+        except:
+            pass
+    
+    # Determine remote type
+    remote_type = None
+    if location:
+        location_lower = location.lower()
+        if "remote" in location_lower:
+            remote_type = "remote"
+        elif "hybrid" in location_lower:
+            remote_type = "hybrid"
+        else:
+            remote_type = "onsite"
+    
+    return {
+        "title": title,
+        "company_name": company_name,
+        "location": location,
+        "remote_type": remote_type,
+        "source_url": job_url,
+        "source_platform": PLATFORM_NAME,
+        "description": None,
+        "salary_min": salary_info["min"],
+        "salary_max": salary_info["max"],
+        "salary_currency": salary_info["currency"],
+        "job_type": None,
+        "experience_level": None,
+        "skills": [],
+        "benefits": [],
+        "company_rating": company_rating,
+    }
@@ -1,7 +1,37 @@
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from urllib.parse import quote_plus
-from .base import BaseScraper
-from bs4 import BeautifulSoup
+from .base import BaseScraper, clean_text, parse_salary
+from .card_selectors import CardSelectors, Field, Select
+
+PLATFORM_NAME = "indeed"
+
+# Alternatives in order of preference (Indeed's markup varies)
+SELECTORS = CardSelectors(
+    cards=[
+        Select("div", {"class": "job_seen_beacon"}),
+        Select("div", {"data-testid": "slider_item"}),
+    ],
+    fields={
+        "title": Field([
+            Select("h2", {"class": "jobTitle"}),
+            Select("span", {"data-testid": "jobTitle"}),
+            Select("a", {"data-jk": True}),
+        ]),
+        "company": Field([
+            Select("span", {"data-testid": "company-name"}),
+            Select("span", {"class": "companyName"}),
+        ]),
+        "location": Field([
+            Select("div", {"data-testid": "text-location"}),
+            Select("div", {"class": "companyLocation"}),
+        ]),
+        "salary": Field([
+            Select("div", {"data-testid": "attribute_snippet_testid"}),
+            Select("div", {"class": "salary-snippet-container"}),
+        ]),
+        "href": Field([Select("a", {"href": True})], attr="href"),
+    },
+)
 
 
 class IndeedScraper(BaseScraper):
@@ -9,25 +39,24 @@ class IndeedScraper(BaseScraper):
     
     def __init__(self):
         super().__init__()
-        self.platform_name = "indeed"
+        self.platform_name = PLATFORM_NAME
         self.base_url = "https://www.indeed.com/jobs"
+        self.page_size = 10
     
-    async def search(
+    def search_stream(
         self,
         keywords: str,
         location: Optional[str] = None,
         remote_only: bool = False,
         experience_level: Optional[str] = None,
         limit: int = 20
-    ) -> List[Dict]:
+    ) -> AsyncIterator[Dict]:
         """
         Search Indeed for jobs.
         
         For better results, use MCP tools (firecrawl, playwright) configured
         in your environment for enhanced scraping capabilities.
         """
-        jobs = []
-        
         # Build search URL
         params = [f"q={quote_plus(keywords)}"]
         
@@ -48,101 +77,74 @@ class IndeedScraper(BaseScraper):
         
         url = f"{self.base_url}?{'&'.join(params)}"
         
-        html = await self.fetch_page(url)
-        if not html:
-            return jobs
-        
-        soup = BeautifulSoup(html, "lxml")
-        
-        # Parse job cards
-        job_cards = soup.find_all("div", class_="job_seen_beacon")[:limit]
-        
-        if not job_cards:
-            # Try alternative selectors
-            job_cards = soup.find_all("div", {"data-testid": "slider_item"})[:limit]
-        
-        for card in job_cards:
-            try:
-                job = self._parse_job_card(card)
-                if job:
-                    jobs.append(job)
-            except Exception as e:
-                print(f"Error parsing Indeed job card: {e}")
-                continue
+        def page_url(page: int) -> str:
+            # Indeed pages by result offset
+            return f"{url}&start={page * self.page_size}" if page else url
         
-        return jobs
+        return self.paginate(page_url, parse_search_results, limit)
+
+
+def parse_search_results(html: str, limit: int) -> List[Dict]:
+    """Job dicts of an Indeed results page (pure: runs in the parse pool)."""
+    jobs = []
     
-    def _parse_job_card(self, card) -> Optional[Dict]:
-        """Parse an Indeed job card."""
-        # Try multiple selectors for title
-        title_elem = (
-            card.find("h2", class_="jobTitle") or 
-            card.find("span", {"data-testid": "jobTitle"}) or
-            card.find("a", {"data-jk": True})
-        )
-        
-        company_elem = (
-            card.find("span", {"data-testid": "company-name"}) or
-            card.find("span", class_="companyName")
-        )
-        
-        location_elem = (
-            card.find("div", {"data-testid": "text-location"}) or
-            card.find("div", class_="companyLocation")
-        )
-        
-        salary_elem = (
-            card.find("div", {"data-testid": "attribute_snippet_testid"}) or
-            card.find("div", class_="salary-snippet-container")
-        )
-        
-        if not title_elem:
-            return None
-        
-        title = self.clean_text(title_elem.get_text())
-        company_name = self.clean_text(company_elem.get_text()) if company_elem else None
-        location = self.clean_text(location_elem.get_text()) if location_elem else None
-        
-        # Get job URL
-        link_elem = card.find("a", href=True)
-        job_url = ""
-        if link_elem:
-            href = link_elem.get("href", "")
-            if href.startswith("/"):
-                job_url = f"https://www.indeed.com{href}"
-            else:
-                job_url = href
-        
-        # Parse salary
-        salary_info = {"min": None, "max": None, "currency": "EUR"}
-        if salary_elem:
-            salary_text = salary_elem.get_text()
-            salary_info = self.parse_salary(salary_text)
-        
-        # Determine remote type
-        remote_type = None
-        if location:
-            location_lower = location.lower()
-            if "remote" in location_lower:
-                remote_type = "remote"
-            elif "hybrid" in location_lower:
-                remote_type = "hybrid"
-            else:
-                remote_type = "onsite"
-        
-        return {
-            "title": title,
-            "company_name": company_name,
-            "location": location,
-            "remote_type": remote_type,
-            "source_url": job_url,
-            "source_platform": self.platform_name,
-            "description": None,
-            "salary_min": salary_info["min"],
-            "salary_max": salary_info["max"],
-            "salary_currency": salary_info["currency"],
-            "job_type": None,
-            "experience_level": None,
-            "skills": [],
-            "benefits": [],
-        }
+    for card in SELECTORS.extract(html, limit):
+        try:
+            job = _parse_job_card(card)
+            if job:
+                jobs.append(job)
+        except Exception as e:
+            print(f"Error parsing Indeed job card: {e}")
+            continue
+    
+    return jobs
+
+
+def _parse_job_card(card: Dict[str, Optional[str]]) -> Optional[Dict]:
+    """Build a job from an Indeed card's extracted fields."""
+    title = clean_text(card["title"])
+    if not title:
+        return None
+    
+    company_name = clean_text(card["company"]) if card["company"] is not None else None
+    location = clean_text(card["location"]) if card["location"] is not None else None
+    
+    # Get job URL
+    href = card["href"] or ""
+    if href.startswith("/"):
+        job_url = f"https://www.indeed.com{href}"
+    else:
+        job_url = href
+    
+    # Parse salary
+    salary_info = {"min": None, "max": None, "currency": "EUR"}
+    if card["salary"] is not None:
+        salary_info = parse_salary(card["salary"])
+    
+    # Determine remote type
+    remote_type = None
+    if location:
+        location_lower = location.lower()
+        if "remote" in location_lower:
+            remote_type = "remote"
+        elif "hybrid" in location_lower:
+            remote_type = "hybrid"
+        else:
+            remote_type = "onsite"
+    
+    return {
+        "title": title,
+        "company_name": company_name,
+        "location": location,
+        "remote_type": remote_type,
+        "source_url": job_url,
+        "source_platform": PLATFORM_NAME,
+        "description": None,
+        "salary_min": salary_info["min"],
+        "salary_max": salary_info["max"],
+        "salary_currency": salary_info["currency"],
+        "job_type": None,
+        "experience_level": None,
+        "skills": [],
+        "benefits": [],
+    }
@@ -1,11 +1,24 @@
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from urllib.parse import quote_plus
-from .base import BaseScraper
-from bs4 import BeautifulSoup
+from .base import BaseScraper, clean_text
+from .card_selectors import CardSelectors, Field, Select
 
 # Import Unipile service for LinkedIn API integration
 from ..services.unipile import get_unipile_service
 
+PLATFORM_NAME = "linkedin"
+
+# Job cards of the public LinkedIn jobs page
+SELECTORS = CardSelectors(
+    cards=[Select("div", {"class": "base-card"})],
+    fields={
+        "title": Field([Select("h3", {"class": "base-search-card__title"})]),
+        "company": Field([Select("h4", {"class": "base-search-card__subtitle"})]),
+        "location": Field([Select("span", {"class": "job-search-card__location"})]),
+        "href": Field([Select("a", {"class": "base-card__full-link"})], attr="href"),
+    },
+)
+
 
 class LinkedInScraper(BaseScraper):
     """
@@ -18,8 +31,9 @@ class LinkedInScraper(BaseScraper):
     
     def __init__(self):
         super().__init__()
-        self.platform_name = "linkedin"
+        self.platform_name = PLATFORM_NAME
         self.base_url = "https://www.linkedin.com/jobs/search"
+        self.page_size = 25
         self._unipile = None
     
     @property
@@ -29,14 +43,14 @@ class LinkedInScraper(BaseScraper):
             self._unipile = get_unipile_service()
         return self._unipile
     
-    async def search(
+    async def search_stream(
         self,
         keywords: str,
         location: Optional[str] = None,
         remote_only: bool = False,
         experience_level: Optional[str] = None,
         limit: int = 20
-    ) -> List[Dict]:
+    ) -> AsyncIterator[Dict]:
         """
         Search LinkedIn for jobs using Unipile API.
         
@@ -44,6 +58,7 @@ class LinkedInScraper(BaseScraper):
         """
         # Try Unipile API first
         if self.unipile.is_configured():
+            jobs = None
             try:
                 jobs = await self.unipile.search_jobs(
                     keywords=keywords,
@@ -52,32 +67,36 @@ class LinkedInScraper(BaseScraper):
                     experience_level=experience_level,
                     limit=limit
                 )
-                if jobs:
-                    print(f"LinkedIn: Found {len(jobs)} jobs via Unipile API")
-                    return jobs
             except Exception as e:
                 print(f"Unipile API error, falling back to web scraping: {e}")
+            if jobs:
+                print(f"LinkedIn: Found {len(jobs)} jobs via Unipile API")
+                for job in jobs:
+                    yield job
+                return
         
         # Fallback to web scraping
-        return await self._search_web_scraping(
+        count = 0
+        async for job in self._search_web_scraping(
             keywords, location, remote_only, experience_level, limit
-        )
+        ):
+            count += 1
+            yield job
+        print(f"LinkedIn: Found {count} jobs via web scraping")
     
-    async def _search_web_scraping(
+    def _search_web_scraping(
         self,
         keywords: str,
         location: Optional[str] = None,
         remote_only: bool = False,
         experience_level: Optional[str] = None,
         limit: int = 20
-    ) -> List[Dict]:
+    ) -> AsyncIterator[Dict]:
         """
         Fallback web scraping method for LinkedIn jobs.
         
         Note: This method is less reliable due to LinkedIn's anti-scraping measures.
         """
-        jobs = []
-        
         # Build search URL
         params = [f"keywords={quote_plus(keywords)}"]
         
@@ -100,66 +119,63 @@ class LinkedInScraper(BaseScraper):
         
         url = f"{self.base_url}?{'&'.join(params)}"
         
-        html = await self.fetch_page(url)
-        if not html:
-            return jobs
+        def page_url(page: int) -> str:
+            # LinkedIn pages by result offset
+            return f"{url}&start={page * self.page_size}" if page else url
         
-        soup = BeautifulSoup(html, "lxml")
-        
-        # Parse job cards from public LinkedIn jobs page
-        job_cards = soup.find_all("div", class_="base-card")[:limit]
-        
-        for card in job_cards:
-            try:
-                job = self._parse_job_card(card)
-                if job:
-                    jobs.append(job)
-            except Exception as e:
-                print(f"Error parsing LinkedIn job card: {e}")
-                continue
-        
-        print(f"LinkedIn: Found {len(jobs)} jobs via web scraping")
-        return jobs
+        return self.paginate(page_url, parse_search_results, limit)
+
+
+def parse_search_results(html: str, limit: int) -> List[Dict]:
+    """Job dicts of a public LinkedIn results page (pure: runs in the parse pool)."""
+    jobs = []
     
-    def _parse_job_card(self, card) -> Optional[Dict]:
-        """Parse a LinkedIn job card from web scraping."""
-        title_elem = card.find("h3", class_="base-search-card__title")
-        company_elem = card.find("h4", class_="base-search-card__subtitle")
-        location_elem = card.find("span", class_="job-search-card__location")
-        link_elem = card.find("a", class_="base-card__full-link")
-        
-        if not title_elem or not link_elem:
-            return None
-        
-        title = self.clean_text(title_elem.get_text())
-        company_name = self.clean_text(company_elem.get_text()) if company_elem else None
-        location = self.clean_text(location_elem.get_text()) if location_elem else None
-        job_url = link_elem.get("href", "")
-        
-        # Determine remote type
-        remote_type = None
-        if location:
-            location_lower = location.lower()
-            if "remote" in location_lower:
-                remote_type = "remote"
-            elif "hybrid" in location_lower:
-                remote_type = "hybrid"
-            else:
-                remote_type = "onsite"
-        
-        return {
-            "title": title,
-            "company_name": company_name,
-            "location": location,
-            "remote_type": remote_type,
-            "source_url": job_url,
-            "source_platform": self.platform_name,
-            "description": None,  # Would need to fetch job detail page
-            "salary_min": None,
-            "salary_max": None,
-            "salary_currency": "EUR",
-            "job_type": None,
-            "experience_level": None,
-            "skills": [],
-            "benefits": [],
-        }
+    for card in SELECTORS.extract(html, limit):
+        try:
+            job = _parse_job_card(card)
+            if job:
+                jobs.append(job)
+        except Exception as e:
+            print(f"Error parsing LinkedIn job card: {e}")
+            continue
+    
+    return jobs
+
+
+def _parse_job_card(card: Dict[str, Optional[str]]) -> Optional[Dict]:
+    """Build a job from a LinkedIn card's extracted fields (web scraping)."""
+    title = clean_text(card["title"])
+    if not title or card["href"] is None:
+        return None
+    
+    company_name = clean_text(card["company"]) if card["company"] is not None else None
+    location = clean_text(card["location"]) if card["location"] is not None else None
+    job_url = card["href"]
+    
+    # Determine remote type
+    remote_type = None
+    if location:
+        location_lower = location.lower()
+        if "remote" in location_lower:
+            remote_type = "remote"
+        elif "hybrid" in location_lower:
+            remote_type = "hybrid"
+        else:
+            remote_type = "onsite"
+    
+    return {
+        "title": title,
+        "company_name": company_name,
+        "location": location,
+        "remote_type": remote_type,
+        "source_url": job_url,
+        "source_platform": PLATFORM_NAME,
+        "description": None,  # Would need to fetch job detail page
+        "salary_min": None,
+        "salary_max": None,
+        "salary_currency": "EUR",
+        "job_type": None,
+        "experience_level": None,
+        "skills": [],
+        "benefits": [],
+    }
@@ -0,0 +1,81 @@
+"""
+Off-loop parsing of scraped pages.
+
+Parsing a results page is pure CPU work (milliseconds with the compiled
+selectors, far more for large or malformed pages). Run on the event loop, it stalls
+every other request, SSE streams included. Scrapers therefore hand their
+parse functions to a bounded process pool, so pages of several platforms
+parse in parallel across cores while the API stays responsive.
+
+Parse functions must be module-level and pure (HTML in, plain dicts out)
+so they can be pickled to the workers. A thread pool is used instead when
+processes are unavailable or disabled (SCRAPING_PARSE_EXECUTOR=thread).
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Workers of the parse pool (SCRAPING_PARSE_WORKERS overrides)
+DEFAULT_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+_executor: Optional[Executor] = None
+
+
+def _thread_executor(workers: int) -> Executor:
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parse")
+
+
+def get_parse_executor() -> Executor:
+    """Get or create the parse pool (processes, else threads)."""
+    global _executor
+    if _executor is None:
+        workers = int(os.getenv("SCRAPING_PARSE_WORKERS", str(DEFAULT_PARSE_WORKERS)))
+        if os.getenv("SCRAPING_PARSE_EXECUTOR", "process").lower() == "thread":
+            _executor = _thread_executor(workers)
+        else:
+            try:
+                # Spawned, not forked: the parent runs an event loop and threads
+                _executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except (ImportError, NotImplementedError, OSError) as e:
+                logger.warning(f"Process pool unavailable, parsing in threads: {e}")
+                _executor = _thread_executor(workers)
+    return _executor
+
+
+async def run_parser(parser: Callable[..., T], *args) -> T:
+    """
+    Run parser(*args) in the parse pool and await its result.
+    
+    If the process pool breaks (e.g. a worker was killed), it is replaced
+    by a thread pool and the call retried once.
+    """
+    global _executor
+    loop = asyncio.get_running_loop()
+    executor = get_parse_executor()
+    try:
+        return await loop.run_in_executor(executor, parser, *args)
+    except BrokenProcessPool:
+        logger.error("Parse process pool broke, falling back to threads")
+        if _executor is executor:
+            _executor = _thread_executor(executor._max_workers)
+            executor.shutdown(wait=False)
+        return await loop.run_in_executor(_executor, parser, *args)
+
+
+def shutdown_parse_executor() -> None:
+    """Stop the parse pool (recreated on next use)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -1,7 +1,23 @@
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from urllib.parse import quote_plus
-from .base import BaseScraper
-from bs4 import BeautifulSoup
+from .base import BaseScraper, clean_text
+from .card_selectors import CardSelectors, Field, Select
+
+PLATFORM_NAME = "welcometothejungle"
+
+# WTTJ uses various selectors; alternatives in order of preference
+SELECTORS = CardSelectors(
+    cards=[
+        Select("article", {"data-testid": "search-results-list-item-wrapper"}),
+        Select("div", {"class": "ais-Hits-item"}),
+    ],
+    fields={
+        "title": Field([Select("h4"), Select("span", {"class": "job-title"})]),
+        "company": Field([Select("span", {"data-testid": "search-results-list-item-company-name"})]),
+        "location": Field([Select("span", {"data-testid": "search-results-list-item-contract-location"})]),
+        "href": Field([Select("a", {"href": True})], attr="href"),
+    },
+)
 
 
 class WTTJScraper(BaseScraper):
@@ -13,25 +29,24 @@ class WTTJScraper(BaseScraper):
     
     def __init__(self):
         super().__init__()
-        self.platform_name = "welcometothejungle"
+        self.platform_name = PLATFORM_NAME
         self.base_url = "https://www.welcometothejungle.com/fr/jobs"
+        self.page_size = 30
     
-    async def search(
+    def search_stream(
         self,
         keywords: str,
         location: Optional[str] = None,
         remote_only: bool = False,
         experience_level: Optional[str] = None,
         limit: int = 20
-    ) -> List[Dict]:
+    ) -> AsyncIterator[Dict]:
         """
         Search Welcome to the Jungle for jobs.
         
         For better results, use MCP tools (firecrawl, playwright) configured
         in your environment for enhanced scraping capabilities.
         """
-        jobs = []
-        
         # Build search URL
         params = [f"query={quote_plus(keywords)}"]
         
@@ -46,78 +61,69 @@ class WTTJScraper(BaseScraper):
         
         url = f"{self.base_url}?{'&'.join(params)}"
         
-        html = await self.fetch_page(url)
-        if not html:
-            return jobs
-        
-        soup = BeautifulSoup(html, "lxml")
-        
-        # Parse job cards
-        job_cards = soup.find_all("article", {"data-testid": "search-results-list-item-wrapper"})[:limit]
-        
-        if not job_cards:
-            # Try alternative selector
-            job_cards = soup.find_all("div", class_="ais-Hits-item")[:limit]
+        def page_url(page: int) -> str:
+            # WTTJ pages are numbered from 1
+            return f"{url}&page={page + 1}" if page else url
         
-        for card in job_cards:
-            try:
-                job = self._parse_job_card(card)
-                if job:
-                    jobs.append(job)
-            except Exception as e:
-                print(f"Error parsing WTTJ job card: {e}")
-                continue
-        
-        return jobs
+        return self.paginate(page_url, parse_search_results, limit)
+
+
+def parse_search_results(html: str, limit: int) -> List[Dict]:
+    """Job dicts of a Welcome to the Jungle results page (pure: runs in the parse pool)."""
+    jobs = []
     
-    def _parse_job_card(self, card) -> Optional[Dict]:
-        """Parse a WTTJ job card."""
-        # WTTJ uses various selectors
-        title_elem = card.find("h4") or card.find("span", class_="job-title")
-        company_elem = card.find("span", {"data-testid": "search-results-list-item-company-name"})
-        location_elem = card.find("span", {"data-testid": "search-results-list-item-contract-location"})
-        link_elem = card.find("a", href=True)
-        
-        if not title_elem:
-            return None
-        
-        title = self.clean_text(title_elem.get_text())
-        company_name = self.clean_text(company_elem.get_text()) if company_elem else None
-        location = self.clean_text(location_elem.get_text()) if location_elem else None
-        
-        # Get job URL
-        job_url = ""
-        if link_elem:
-            href = link_elem.get("href", "")
-            if href.startswith("/"):
-                job_url = f"https://www.welcometothejungle.com{href}"
-            else:
-                job_url = href
-        
-        # Determine remote type from WTTJ specific indicators
-        remote_type = None
-        if location:
-            location_lower = location.lower()
-            if "remote" in location_lower or "télétravail" in location_lower:
-                remote_type = "remote"
-            elif "hybrid" in location_lower or "hybride" in location_lower:
-                remote_type = "hybrid"
-            else:
-                remote_type = "onsite"
-        
-        return {
-            "title": title,
-            "company_name": company_name,
-            "location": location,
-            "remote_type": remote_type,
-            "source_url": job_url,
-            "source_platform": self.platform_name,
-            "description": None,
-            "salary_min": None,
-            "salary_max": None,
-            "salary_currency": "EUR",
-            "job_type": None,
-            "experience_level": None,
-            "skills": [],
-            "benefits": [],
-        }
+    for card in SELECTORS.extract(html, limit):
+        try:
+            job = _parse_job_card(card)
+            if job:
+                jobs.append(job)
+        except Exception as e:
+            print(f"Error parsing WTTJ job card: {e}")
+            continue
+    
+    return jobs
+
+
+def _parse_job_card(card: Dict[str, Optional[str]]) -> Optional[Dict]:
+    """Build a job from a WTTJ card's extracted fields."""
+    title = clean_text(card["title"])
+    if not title:
+        return None
+    
+    company_name = clean_text(card["company"]) if card["company"] is not None else None
+    location = clean_text(card["location"]) if card["location"] is not None else None
+    
+    # Get job URL
+    href = card["href"] or ""
+    if href.startswith("/"):
+        job_url = f"https://www.welcometothejungle.com{href}"
+    else:
+        job_url = href
+    
+    # Determine remote type from WTTJ specific indicators
+    remote_type = None
+    if location:
+        location_lower = location.lower()
+        if "remote" in location_lower or "télétravail" in location_lower:
+            remote_type = "remote"
+        elif "hybrid" in location_lower or "hybride" in location_lower:
+            remote_type = "hybrid"
+        else:
+            remote_type = "onsite"
+    
+    return {
+        "title": title,
+        "company_name": company_name,
+        "location": location,
+        "remote_type": remote_type,
+        "source_url": job_url,
+        "source_platform": PLATFORM_NAME,
+        "description": None,
+        "salary_min": None,
+        "salary_max": None,
+        "salary_currency": "EUR",
+        "job_type": None,
+        "experience_level": None,
+        "skills": [],
+        "benefits": [],
+    }
@@ -0,0 +1,181 @@
+"""
+Company resolution for ingestion.
+
+Maps company names to company ids by their normalized key (see
+models/company_names.py), so spelling variants of an employer share one
+row. An in-process LRU of key -> id sits in front of the database: a
+batch only queries the keys it has not seen, in one IN query, and inserts
+the missing companies in one statement.
+
+Inserts go through INSERT ... ON CONFLICT (normalized_name) DO NOTHING
+and the conflicting keys are read back, so concurrent ingestions of a new
+company resolve to the same row. Ids created in a transaction are only
+cached once it commits (a rollback would leave dangling ids).
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional
+
+from sqlalchemy import event, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..models import Company
+from ..models.company_names import normalize_company_name
+
+DEFAULT_MAX_ENTRIES = 10000
+
+# Keys per statement
+BATCH_SIZE = 500
+
+# Session.info key of the ids created in the session's transaction
+_PENDING = "company_resolver_pending"
+
+
+class CompanyResolver:
+    """
+    Company ids by name, created on demand.
+    
+    Example:
+        resolver = get_company_resolver()
+        company_ids = resolver.resolve(db, {"Doctolib SAS": {"website": url}})
+        company_ids["Doctolib SAS"]  # same id as for "doctolib"
+        db.commit()
+    """
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def resolve(self, db: Session, companies: Mapping[str, Mapping[str, Any]]) -> Dict[str, int]:
+        """
+        Company ids of names, creating missing companies (caller commits).
+        
+        Args:
+            companies: Column values (website, industry...) of new
+                companies by name; names without a key are left out
+        
+        Returns:
+            Company id by name
+        """
+        keys = {}
+        for name in companies:
+            key = normalize_company_name(name) if name else ""
+            if key:
+                keys[name] = key
+        
+        pending = db.info.get(_PENDING, {})
+        ids = {}
+        with self._lock:
+            for key in set(keys.values()):
+                company_id = pending.get(key)
+                if company_id is None:
+                    company_id = self._ids.get(key)
+                    if company_id is not None:
+                        self._ids.move_to_end(key)
+                if company_id is not None:
+                    ids[key] = company_id
+        
+        missing = [key for key in dict.fromkeys(keys.values()) if key not in ids]
+        if missing:
+            found = self._select(db, missing)
+            self._remember(found)
+            ids.update(found)
+            
+            # First name spelling of a key provides the new company's values
+            new = {}
+            for name, key in keys.items():
+                if key not in ids and key not in new:
+                    new[key] = {**companies[name], "name": name, "normalized_name": key}
+            if new:
+                created = self._insert(db, list(new.values()))
+                self._track(db, created)
+                ids.update(created)
+                # Keys inserted concurrently by another transaction
+                conflicts = [key for key in new if key not in created]
+                if conflicts:
+                    found = self._select(db, conflicts)
+                    self._remember(found)
+                    ids.update(found)
+        
+        return {name: ids[key] for name, key in keys.items() if key in ids}
+    
+    def resolve_one(self, db: Session, name: str, **values) -> Optional[int]:
+        """Company id of one name (None if it has no key), see resolve()."""
+        return self.resolve(db, {name: values}).get(name)
+    
+    def clear(self) -> None:
+        """Forget cached ids (e.g. after companies were deleted)."""
+        with self._lock:
+            self._ids.clear()
+    
+    def _select(self, db: Session, keys: List[str]) -> Dict[str, int]:
+        found = {}
+        for start in range(0, len(keys), BATCH_SIZE):
+            rows = db.query(Company.normalized_name, Company.id).filter(
+                Company.normalized_name.in_(keys[start:start + BATCH_SIZE])
+            )
+            for key, company_id in rows:
+                found[key] = company_id
+        return found
+    
+    def _insert(self, db: Session, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+        dialect = db.get_bind().dialect.name
+        created = {}
+        for start in range(0, len(rows), BATCH_SIZE):
+            batch = rows[start:start + BATCH_SIZE]
+            if dialect == "postgresql":
+                stmt = postgresql.insert(Company).values(batch).on_conflict_do_nothing(
+                    index_elements=[Company.normalized_name]
+                )
+            elif dialect == "sqlite":
+                stmt = sqlite.insert(Company).values(batch).on_conflict_do_nothing(
+                    index_elements=[Company.normalized_name]
+                )
+            else:
+                stmt = insert(Company).values(batch)
+            for key, company_id in db.execute(stmt.returning(Company.normalized_name, Company.id)):
+                created[key] = company_id
+        return created
+    
+    def _remember(self, ids: Mapping[str, int]) -> None:
+        with self._lock:
+            for key, company_id in ids.items():
+                self._ids[key] = company_id
+                self._ids.move_to_end(key)
+            while len(self._ids) > self.max_entries:
+                self._ids.popitem(last=False)
+    
+    def _track(self, db: Session, created: Dict[str, int]) -> None:
+        """Hold ids created in db's transaction until it commits."""
+        if not created:
+            return
+        if _PENDING not in db.info:
+            db.info[_PENDING] = {}
+            
+            @event.listens_for(db, "after_commit")
+            def cache_created(session):
+                self._remember(session.info.pop(_PENDING, {}))
+                session.info[_PENDING] = {}
+            
+            @event.listens_for(db, "after_rollback")
+            def drop_created(session):
+                session.info[_PENDING] = {}
+        
+        db.info[_PENDING].update(created)
+
+
+# Singleton instance, shared by the ingestion paths of the process
+_company_resolver: Optional[CompanyResolver] = None
+
+
+def get_company_resolver() -> CompanyResolver:
+    """Get or create the company resolver."""
+    global _company_resolver
+    if _company_resolver is None:
+        _company_resolver = CompanyResolver()
+    return _company_resolver
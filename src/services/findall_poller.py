@@ -0,0 +1,197 @@
+"""
+Background polling of FindAll runs, decoupled from client connections.
+
+One task per run polls the FindAll API, records progress in the run
+registry and, when the run completes, saves its matched jobs (which also
+materializes their scores). SSE streams only subscribe to the task's
+events through in-process queues, so a run is polled once however many
+tabs watch it, and its results are saved even if every viewer
+disconnected.
+
+Tasks use their own database sessions: they outlive the requests that
+started them. Their database work (registry updates, saving and scoring
+the matches) runs in a worker thread, so it does not stall the event
+loop. A run left unfinished by a restart is picked up again by the next
+stream subscribing to it.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from ..models import SessionLocal
+from .findall_runs import FindAllRunRegistry
+from .parallel_findall import ParallelFindAllService
+
+logger = logging.getLogger(__name__)
+
+# Events ending a run's stream
+FINAL_EVENTS = ("findall_complete", "error")
+
+# Final events are replayed to late subscribers for this long, without
+# polling the run again
+FINISHED_TTL_SECONDS = 600.0
+
+
+class FindAllPoller:
+    """
+    Pollers of FindAll runs and their subscribers.
+    
+    Example:
+        poller = get_findall_poller()
+        async for event in poller.subscribe(findall_id):
+            ...  # findall_progress events, then findall_complete or error
+    """
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        poll_interval: int = 10,
+        max_iterations: int = 120,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.max_iterations = max_iterations
+        self._clock = clock
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        # Latest event of each run (final events until FINISHED_TTL_SECONDS)
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._finished_at: Dict[str, float] = {}
+    
+    def is_polling(self, findall_id: str) -> bool:
+        """Whether a poller task runs for the run."""
+        task = self._tasks.get(findall_id)
+        return task is not None and not task.done()
+    
+    def ensure_polling(self, findall_id: str) -> None:
+        """Start the run's poller unless it runs or the run just finished."""
+        self._expire_finished()
+        if self.is_polling(findall_id) or findall_id in self._finished_at:
+            return
+        self._tasks[findall_id] = asyncio.create_task(self._poll(findall_id))
+    
+    async def subscribe(self, findall_id: str) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Events of a run, starting with its latest one, until its final
+        event. Starts polling the run if nobody does.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(findall_id, set()).add(queue)
+        try:
+            self._expire_finished()
+            latest = self._latest.get(findall_id)
+            if latest is not None:
+                queue.put_nowait(latest)
+            self.ensure_polling(findall_id)
+            
+            while True:
+                event = await queue.get()
+                yield event
+                if event["event"] in FINAL_EVENTS:
+                    break
+        finally:
+            subscribers = self._subscribers.get(findall_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[findall_id]
+    
+    async def aclose(self) -> None:
+        """Cancel all pollers (their runs resume on next subscription)."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+    
+    def _publish(self, findall_id: str, event: Dict[str, Any]) -> None:
+        self._latest[findall_id] = event
+        if event["event"] in FINAL_EVENTS:
+            self._finished_at[findall_id] = self._clock()
+        for queue in self._subscribers.get(findall_id, ()):
+            queue.put_nowait(event)
+    
+    def _expire_finished(self) -> None:
+        now = self._clock()
+        for findall_id, finished_at in list(self._finished_at.items()):
+            if now - finished_at >= FINISHED_TTL_SECONDS:
+                del self._finished_at[findall_id]
+                self._latest.pop(findall_id, None)
+    
+    async def _poll(self, findall_id: str) -> None:
+        """Poll a run to its end, then save its results."""
+        db = self.session_factory()
+        try:
+            service = ParallelFindAllService(db)
+            registry = FindAllRunRegistry(db)
+            
+            progress = None
+            async for progress in service.poll_status(findall_id, self.poll_interval, self.max_iterations):
+                await self._in_thread(registry.update, findall_id, progress)
+                self._publish(findall_id, {"event": "findall_progress", **progress})
+            
+            if not progress or progress.get("status") != "completed":
+                message = progress.get("error", "FindAll run did not complete") if progress else "No progress received"
+                self._publish(findall_id, {"event": "error", "message": message})
+                return
+            
+            candidates = await service.get_results(findall_id)
+            job_ids = await self._in_thread(self._save_results, service, candidates)
+            self._publish(findall_id, {
+                "event": "findall_complete",
+                "findall_id": findall_id,
+                "job_ids": job_ids,
+            })
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"FindAll poller for {findall_id} failed: {type(e).__name__}: {e}")
+            self._publish(findall_id, {"event": "error", "message": str(e)})
+            await self._in_thread(self._record_error, db, findall_id, str(e))
+        finally:
+            db.close()
+            if self._tasks.get(findall_id) is asyncio.current_task():
+                del self._tasks[findall_id]
+    
+    async def _in_thread(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run blocking database work in a worker thread. If the poller is
+        cancelled meanwhile, the work is waited for before cancelling, so
+        the session is never used by two threads at once.
+        """
+        future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait([future])
+            raise
+    
+    @staticmethod
+    def _save_results(service: ParallelFindAllService, candidates: List[Dict[str, Any]]) -> List[int]:
+        """
+        Save a run's matches (already saved ones are skipped), which
+        materializes their scores for every user; ids of all its jobs.
+        """
+        service.save_jobs(service.convert_to_job_format(candidates))
+        return service.saved_job_ids(candidates)
+    
+    @staticmethod
+    def _record_error(db: Session, findall_id: str, message: str) -> None:
+        db.rollback()
+        FindAllRunRegistry(db).update(findall_id, {"status": "error", "error": message, "is_complete": True})
+
+
+# Singleton instance, shared by the streams of the process
+_findall_poller: Optional[FindAllPoller] = None
+
+
+def get_findall_poller() -> FindAllPoller:
+    """Get or create the FindAll poller."""
+    global _findall_poller
+    if _findall_poller is None:
+        _findall_poller = FindAllPoller()
+    return _findall_poller
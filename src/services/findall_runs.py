@@ -0,0 +1,122 @@
+"""
+Registry of FindAll runs, persisted in the findall_runs table.
+
+A FindAll run costs 10-20 minutes and API credits, so a search reuses a
+run of the same (keywords, location) that is still in progress, or that
+completed recently, instead of starting another. Being in the database,
+runs survive restarts and are shared by all workers.
+"""
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models import FindAllRun
+from .parallel_findall import TERMINAL_STATUSES
+
+# Completed runs are reused for this long (FINDALL_REUSE_HOURS overrides)
+DEFAULT_REUSE_HOURS = 6.0
+
+# Runs not finished after this long are abandoned (polling gives up after
+# 20 minutes), not reused
+STALE_RUN_MINUTES = 30
+
+
+def search_key(keywords: str, location: str) -> str:
+    """Normalized (keywords, location) of a search."""
+    def normalize(value: str) -> str:
+        return re.sub(r"\s+", " ", value).strip().casefold()
+    return f"{normalize(keywords)}|{normalize(location)}"
+
+
+class FindAllRunRegistry:
+    """
+    Persisted FindAll runs.
+    
+    Example:
+        registry = FindAllRunRegistry(db)
+        run = registry.find_reusable("Product Manager", "Paris", match_limit=50)
+        if run is None:
+            findall_id = await findall_service.create_run(...)
+            run = registry.register(findall_id, "Product Manager", "Paris", 50)
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.reuse_hours = float(os.getenv("FINDALL_REUSE_HOURS", str(DEFAULT_REUSE_HOURS)))
+    
+    def get(self, findall_id: str) -> Optional[FindAllRun]:
+        """The run with this FindAll id, if recorded."""
+        return self.db.query(FindAllRun).filter(FindAllRun.findall_id == findall_id).first()
+    
+    def find_reusable(
+        self,
+        keywords: str,
+        location: str,
+        match_limit: Optional[int] = None
+    ) -> Optional[FindAllRun]:
+        """
+        Latest run of the same search that is in progress, or completed
+        within the reuse window, with at least match_limit matches asked.
+        """
+        now = datetime.now(timezone.utc)
+        query = self.db.query(FindAllRun).filter(
+            FindAllRun.search_key == search_key(keywords, location),
+            FindAllRun.created_at >= now - timedelta(hours=max(self.reuse_hours, STALE_RUN_MINUTES / 60)),
+        )
+        if match_limit is not None:
+            query = query.filter(FindAllRun.match_limit >= match_limit)
+        
+        for run in query.order_by(FindAllRun.created_at.desc(), FindAllRun.id.desc()):
+            if run.status == "completed":
+                completed_at = _as_utc(run.completed_at or run.created_at)
+                if now - completed_at <= timedelta(hours=self.reuse_hours):
+                    return run
+            elif run.status not in TERMINAL_STATUSES + ("error", "timeout"):
+                if now - _as_utc(run.created_at) <= timedelta(minutes=STALE_RUN_MINUTES):
+                    return run
+        return None
+    
+    def register(
+        self,
+        findall_id: str,
+        keywords: str,
+        location: str,
+        match_limit: Optional[int] = None,
+        user_id: Optional[int] = None
+    ) -> FindAllRun:
+        """Record a run just created."""
+        run = FindAllRun(
+            findall_id=findall_id,
+            user_id=user_id,
+            keywords=keywords,
+            location=location,
+            search_key=search_key(keywords, location),
+            match_limit=match_limit,
+            status="queued",
+        )
+        self.db.add(run)
+        self.db.commit()
+        return run
+    
+    def update(self, findall_id: str, progress: Dict[str, Any]) -> Optional[FindAllRun]:
+        """Record a progress update from poll_status() or get_status()."""
+        run = self.get(findall_id)
+        if run is None:
+            return None
+        
+        run.status = progress["status"]
+        run.generated_count = progress.get("generated_count", run.generated_count)
+        run.matched_count = progress.get("matched_count", run.matched_count)
+        run.error = progress.get("error")
+        if progress.get("is_complete") and run.completed_at is None:
+            run.completed_at = datetime.now(timezone.utc)
+        self.db.commit()
+        return run
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes (stored in UTC)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
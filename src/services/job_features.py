@@ -0,0 +1,192 @@
+"""
+Per-job normalized text features.
+
+Computed once when a job is saved and stored in the job_features table, so
+the scoring services mostly do lookups (token sets, detected seniority,
+remote flags) instead of lowercasing and scanning the raw fields for every
+user and every request.
+"""
+import re
+from typing import Dict, Any, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models import Job, JobFeatures
+from .text_matching import tokenize
+
+# Bump when the computation below changes; older rows are recomputed
+FEATURES_VERSION = 1
+
+# Description length buckets (upper bounds, exclusive). "short" matches the
+# V2 short-description penalty threshold.
+DESCRIPTION_LENGTH_BUCKETS = (
+    ("short", 100),
+    ("medium", 1000),
+)
+
+# Stored feature fields, as returned by compute_job_features()
+FEATURE_FIELDS = (
+    "version", "title", "location", "city", "skills",
+    "description_tokens", "description_length", "description_length_bucket",
+    "seniority_level", "title_seniority", "work_mode", "is_remote", "is_hybrid",
+)
+
+# Location suffixes that are not part of the city name
+CITY_SEPARATORS = re.compile(r"[,(/|]|\s+-\s+")
+REMOTE_LOCATION_WORDS = ("remote", "télétravail")
+
+
+def description_length_bucket(length: int) -> str:
+    """Bucket a description length (short, medium, long)."""
+    for bucket, upper in DESCRIPTION_LENGTH_BUCKETS:
+        if length < upper:
+            return bucket
+    return "long"
+
+
+def parse_city(location: Optional[str]) -> Optional[str]:
+    """
+    Extract the city from a free-text location.
+    
+    "Toulouse (hybride)" -> "toulouse", "Paris, Île-de-France" -> "paris".
+    Returns None for remote-only or empty locations.
+    """
+    if not location:
+        return None
+    city = CITY_SEPARATORS.split(location.lower(), maxsplit=1)[0]
+    city = re.sub(r"\d+", "", city).strip()
+    if not city or any(word in city for word in REMOTE_LOCATION_WORDS):
+        return None
+    return city
+
+
+def compute_job_features(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compute the features dict of a job given in scoring dict form.
+    
+    Field semantics match what the scoring services compute on the fly, so
+    scoring with or without stored features gives the same result.
+    """
+    # Imported here: the scoring services import this module for fallbacks
+    from .scoring import SENIORITY_TITLE_MATCHER
+    from .scoring_v2 import ScoringServiceV2
+    
+    title_lower = (job.get("title") or "").lower()
+    location_lower = (job.get("location") or "").lower()
+    remote_lower = (job.get("remote_type") or "").lower()
+    description = job.get("description") or ""
+    
+    is_remote, is_hybrid = ScoringServiceV2.remote_flags(location_lower, remote_lower)
+    
+    # Legacy work mode: remote type, else inferred from the location
+    work_mode = remote_lower
+    if not work_mode:
+        if "remote" in location_lower:
+            work_mode = "remote"
+        elif "hybrid" in location_lower:
+            work_mode = "hybrid"
+    
+    return {
+        "version": FEATURES_VERSION,
+        "title": title_lower,
+        "location": location_lower,
+        "city": parse_city(job.get("location")),
+        "skills": [s.lower().strip() for s in (job.get("skills") or [])],
+        "description_tokens": sorted(tokenize(description)),
+        "description_length": len(description),
+        "description_length_bucket": description_length_bucket(len(description)),
+        "seniority_level": ScoringServiceV2.SENIORITY_MATCHER.match(title_lower),
+        "title_seniority": SENIORITY_TITLE_MATCHER.match(title_lower),
+        "work_mode": work_mode,
+        "is_remote": is_remote,
+        "is_hybrid": is_hybrid,
+    }
+
+
+def job_feature_input(job: Job) -> Dict[str, Any]:
+    """The Job fields features are computed from, in scoring dict form."""
+    return {
+        "title": job.title,
+        "location": job.location,
+        "remote_type": job.remote_type,
+        "description": job.description,
+        "skills": job.skills or [],
+    }
+
+
+def stored_features(job: Job) -> Optional[Dict[str, Any]]:
+    """Features dict of a Job model, or None if missing or outdated."""
+    features = job.features
+    if features is None or features.version != FEATURES_VERSION:
+        return None
+    return features.to_dict()
+
+
+def feature_columns() -> List[Any]:
+    """JobFeatures columns for column-projected queries (see features_from_row)."""
+    return [getattr(JobFeatures, field).label(f"features_{field}") for field in FEATURE_FIELDS]
+
+
+def features_from_row(row: Any) -> Optional[Dict[str, Any]]:
+    """Features dict from a row selected with feature_columns(), if up to date."""
+    if row.features_version != FEATURES_VERSION:
+        return None
+    return {field: getattr(row, f"features_{field}") for field in FEATURE_FIELDS}
+
+
+class JobFeaturesService:
+    """Service maintaining the job_features table."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def refresh(self, jobs: Iterable[Job], force: bool = False) -> int:
+        """
+        Compute and store features for jobs (caller commits).
+        
+        Jobs with up-to-date features are skipped unless force is set, e.g.
+        after their title or description was edited.
+        
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        for job in jobs:
+            if not force and stored_features(job) is not None:
+                continue
+            
+            values = compute_job_features(job_feature_input(job))
+            row = job.features
+            if row is None:
+                row = JobFeatures(job_id=job.id)
+                job.features = row
+                self.db.add(row)
+            for field, value in values.items():
+                setattr(row, field, value)
+            written += 1
+        
+        return written
+    
+    def store(self, features_by_job: Dict[int, Dict[str, Any]]) -> None:
+        """
+        Upsert already computed features, keyed by job id (caller commits).
+        
+        Existing rows are fetched in one query, so this suits jobs loaded
+        through column-projected queries rather than as Job objects.
+        """
+        if not features_by_job:
+            return
+        
+        existing = {
+            row.job_id: row
+            for row in self.db.query(JobFeatures).filter(
+                JobFeatures.job_id.in_(list(features_by_job))
+            )
+        }
+        for job_id, values in features_by_job.items():
+            row = existing.get(job_id)
+            if row is None:
+                row = JobFeatures(job_id=job_id)
+                self.db.add(row)
+            for field, value in values.items():
+                setattr(row, field, value)
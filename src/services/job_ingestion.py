@@ -0,0 +1,131 @@
+"""
+Bulk ingestion of scraped jobs.
+
+Saving a search's results one ORM object at a time costs several round
+trips per job (duplicate check, company lookup, company commit and
+refresh, job refresh). Here a whole batch takes a handful: companies are
+resolved by the company resolver (cached ids, else one IN query, and the
+missing ones inserted in one statement), then jobs are inserted in one
+multi-row INSERT ... ON CONFLICT (source_url) DO NOTHING RETURNING id,
+and the caller commits once.
+
+Jobs whose source_url is already stored (e.g. saved by a concurrent
+search) are skipped by the database rather than failing the batch.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..models import Job
+from .company_resolver import get_company_resolver
+
+# Rows per statement (bounded by SQLite's limit on bound parameters)
+BATCH_SIZE = 500
+
+# Job columns filled from scraped job dicts
+JOB_FIELDS = (
+    "title",
+    "description",
+    "requirements",
+    "location",
+    "remote_type",
+    "salary_min",
+    "salary_max",
+    "job_type",
+    "experience_level",
+    "source_url",
+    "source_platform",
+    "external_id",
+    "skills",
+    "benefits",
+)
+
+
+def job_key(job: Dict[str, Any]) -> Optional[Tuple]:
+    """Key matching a scraped job dict to its inserted row, if it has one."""
+    if job.get("source_url"):
+        return ("url", job["source_url"])
+    if job.get("external_id") and job.get("source_platform"):
+        return ("external", job["source_platform"], str(job["external_id"]))
+    return None
+
+
+class JobIngestionService:
+    """
+    Insert scraped jobs and their companies in bulk.
+    
+    Example:
+        ingestion = JobIngestionService(db)
+        inserted = ingestion.insert_jobs(scraped_jobs)
+        db.commit()
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+        self.company_resolver = get_company_resolver()
+    
+    def resolve_companies(self, jobs: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Company ids by name for the jobs' company names, creating missing
+        companies (caller commits).
+        """
+        # First job naming a company provides its details
+        companies = {}
+        for job in jobs:
+            name = job.get("company_name")
+            if name and name not in companies:
+                companies[name] = {
+                    "website": job.get("company_website"),
+                    "linkedin_url": job.get("company_linkedin"),
+                    "logo_url": job.get("company_logo"),
+                    "industry": job.get("company_industry"),
+                }
+        return self.company_resolver.resolve(self.db, companies)
+    
+    def insert_jobs(self, jobs: List[Dict[str, Any]]) -> Dict[Tuple, int]:
+        """
+        Insert scraped jobs, skipping source URLs already stored (caller
+        commits).
+        
+        Returns:
+            Inserted job ids by job_key() (jobs without a key are inserted
+            but not returned)
+        """
+        if not jobs:
+            return {}
+        
+        company_ids = self.resolve_companies(jobs)
+        rows = []
+        for job in jobs:
+            row = {field: job.get(field) for field in JOB_FIELDS}
+            row["salary_currency"] = job.get("salary_currency", "EUR")
+            row["company_id"] = company_ids.get(job.get("company_name"))
+            rows.append(row)
+        
+        inserted = {}
+        for start in range(0, len(rows), BATCH_SIZE):
+            stmt = self._insert_jobs_stmt(rows[start:start + BATCH_SIZE])
+            for row in self.db.execute(stmt):
+                key = job_key(row._asdict())
+                if key is not None:
+                    inserted[key] = row.id
+        return inserted
+    
+    def _insert_jobs_stmt(self, rows: List[Dict[str, Any]]):
+        """Multi-row job INSERT, ignoring source_url conflicts where supported."""
+        if self.dialect == "postgresql":
+            stmt = postgresql.insert(Job).values(rows).on_conflict_do_nothing(
+                index_elements=[Job.source_url]
+            )
+        elif self.dialect == "sqlite":
+            stmt = sqlite.insert(Job).values(rows).on_conflict_do_nothing(
+                index_elements=[Job.source_url]
+            )
+        else:
+            # Callers filter known URLs beforehand; a concurrent insert of
+            # the same URL fails the batch here
+            stmt = insert(Job).values(rows)
+        return stmt.returning(Job.id, Job.source_url, Job.source_platform, Job.external_id)
@@ -2,14 +2,23 @@ from typing import List, Dict, Optional, Any
 from sqlalchemy.orm import Session
 import asyncio
 
-from ..models import Job, Company
-from ..scrapers import LinkedInScraper, IndeedScraper, GlassdoorScraper, WTTJScraper
+from ..models import Job
+from .job_features import JobFeaturesService
+from .job_ingestion import JobIngestionService, job_key
+from .page_cache import normalize_url
+from .rate_limiter import Priority
+from .score_materialization import ScoreMaterializationService
+from .seen_index import get_seen_index, listing_fingerprint
 
 
 class JobSearchService:
     """Service for searching and scraping jobs from multiple platforms."""
     
     def __init__(self, db: Session):
+        # Imported here: the scrapers import the services package, so
+        # src.scrapers can be imported first (e.g. by parse pool workers)
+        from ..scrapers import LinkedInScraper, IndeedScraper, GlassdoorScraper, WTTJScraper
+        
         self.db = db
         self.scrapers = {
             "linkedin": LinkedInScraper(),
@@ -17,6 +26,13 @@ class JobSearchService:
             "glassdoor": GlassdoorScraper(),
             "welcometothejungle": WTTJScraper(),
         }
+        # Searches are live (a user is waiting): hedge slow providers and go
+        # ahead of background scraping for rate-limited quotas
+        for scraper in self.scrapers.values():
+            scraper.hedged = True
+            scraper.priority = Priority.INTERACTIVE
+        self.seen_index = get_seen_index()
+        self.ingestion = JobIngestionService(db)
     
     async def search(
         self,
@@ -25,7 +41,8 @@ class JobSearchService:
         platforms: List[str] = None,
         remote_only: bool = False,
         experience_level: Optional[str] = None,
-        save_results: bool = True
+        save_results: bool = True,
+        incremental: bool = False
     ) -> Dict[str, Any]:
         """
         Search for jobs across multiple platforms.
@@ -37,6 +54,9 @@ class JobSearchService:
             remote_only: Filter for remote jobs only
             experience_level: Filter by experience level
             save_results: Whether to save results to database
+            incremental: Only return postings that are new or whose listing
+                changed since they were ingested (those are refreshed when
+                saving); scrapers stop at pages of known postings
             
         Returns:
             Dict containing jobs, total count, and platforms searched
@@ -44,6 +64,11 @@ class JobSearchService:
         if platforms is None:
             platforms = list(self.scrapers.keys())
         
+        if incremental:
+            self.seen_index.sync(self.db)
+        for scraper in self.scrapers.values():
+            scraper.seen_filter = self.seen_index.is_unchanged if incremental else None
+        
         all_jobs = []
         platforms_searched = []
         
@@ -68,7 +93,7 @@ class JobSearchService:
         
         # Save results to database if requested
         if save_results:
-            saved_jobs = self._save_jobs(all_jobs)
+            saved_jobs = self._save_jobs(all_jobs, refresh_changed=incremental)
             return {
                 "jobs": saved_jobs,
                 "total": len(saved_jobs),
@@ -122,74 +147,105 @@ class JobSearchService:
             "total": len(jobs)
         }
     
-    def _save_jobs(self, jobs: List[Dict]) -> List[Job]:
-        """Save scraped jobs to database, avoiding duplicates."""
-        saved_jobs = []
+    def _save_jobs(self, jobs: List[Dict], refresh_changed: bool = False) -> List[Job]:
+        """
+        Save scraped jobs to database, avoiding duplicates.
+        
+        Known postings are found in one query on the batch's URLs and
+        skipped. With refresh_changed (incremental searches), they are
+        recognized with the seen index instead (canonical URL or external
+        id) and updated when their listing metadata changed. New jobs and
+        their companies are inserted in bulk and committed once.
+        
+        Returns:
+            New jobs, then refreshed ones
+        """
+        known_urls = set()
+        if refresh_changed:
+            self.seen_index.sync(self.db)
+        else:
+            # The seen index holds every stored job in memory (see
+            # seen_index.py), so plain searches do not load it
+            urls = [job_data["source_url"] for job_data in jobs if job_data.get("source_url")]
+            if urls:
+                known_urls = {
+                    url for (url,) in self.db.query(Job.source_url).filter(Job.source_url.in_(urls))
+                }
+        new_data = []
+        changed = {}
+        batch_urls = set()
         
         for job_data in jobs:
-            # Check if job already exists by source_url
-            existing = self.db.query(Job).filter(
-                Job.source_url == job_data.get("source_url")
-            ).first()
-            
-            if existing:
+            if refresh_changed:
+                seen = self.seen_index.lookup(job_data)
+                if seen is not None:
+                    if seen.fingerprint != listing_fingerprint(job_data):
+                        changed[seen.job_id] = job_data
+                    continue
+            elif job_data.get("source_url") in known_urls:
                 continue
             
-            # Handle company
-            company_id = None
-            if job_data.get("company_name"):
-                company = self._get_or_create_company(job_data)
-                company_id = company.id
+            # Also dedupe within the batch (not in the index until saved)
+            if job_data.get("source_url"):
+                url_key = normalize_url(job_data["source_url"])
+                if url_key in batch_urls:
+                    continue
+                batch_urls.add(url_key)
             
-            # Create job
-            job = Job(
-                title=job_data.get("title"),
-                description=job_data.get("description"),
-                requirements=job_data.get("requirements"),
-                location=job_data.get("location"),
-                remote_type=job_data.get("remote_type"),
-                salary_min=job_data.get("salary_min"),
-                salary_max=job_data.get("salary_max"),
-                salary_currency=job_data.get("salary_currency", "EUR"),
-                job_type=job_data.get("job_type"),
-                experience_level=job_data.get("experience_level"),
-                source_url=job_data.get("source_url"),
-                source_platform=job_data.get("source_platform"),
-                external_id=job_data.get("external_id"),
-                skills=job_data.get("skills"),
-                benefits=job_data.get("benefits"),
-                company_id=company_id
-            )
-            
-            self.db.add(job)
-            saved_jobs.append(job)
+            new_data.append(job_data)
         
+        inserted = self.ingestion.insert_jobs(new_data)
+        refreshed_jobs = self._refresh_listings(changed)
         self.db.commit()
         
-        # Refresh to get IDs
-        for job in saved_jobs:
-            self.db.refresh(job)
+        # Load the new jobs in one query, in scraped order
+        saved_data = []
+        for job_data in new_data:
+            key = job_key(job_data)
+            if key in inserted:
+                saved_data.append((inserted[key], job_data))
+        jobs_by_id = {}
+        if saved_data:
+            jobs_by_id = {
+                job.id: job
+                for job in self.db.query(Job).filter(Job.id.in_([job_id for job_id, _ in saved_data]))
+            }
+        saved_jobs = [jobs_by_id[job_id] for job_id, _ in saved_data]
+        
+        # Materialize V2 scores for the new jobs; refreshed ones are
+        # rescored on next read
+        ScoreMaterializationService(self.db).refresh_jobs(saved_jobs)
+        ScoreMaterializationService(self.db).invalidate_jobs([job.id for job in refreshed_jobs])
+        
+        if refresh_changed:
+            for job_id, job_data in saved_data:
+                self.seen_index.add(job_id, job_data)
+            for job in refreshed_jobs:
+                self.seen_index.add(job.id, changed[job.id])
         
-        return saved_jobs
+        return saved_jobs + refreshed_jobs
     
-    def _get_or_create_company(self, job_data: Dict) -> Company:
-        """Get existing company or create new one."""
-        company_name = job_data.get("company_name")
-        
-        company = self.db.query(Company).filter(
-            Company.name == company_name
-        ).first()
-        
-        if not company:
-            company = Company(
-                name=company_name,
-                website=job_data.get("company_website"),
-                linkedin_url=job_data.get("company_linkedin"),
-                logo_url=job_data.get("company_logo"),
-                industry=job_data.get("company_industry"),
-            )
-            self.db.add(company)
-            self.db.commit()
-            self.db.refresh(company)
-        
-        return company
+    def _refresh_listings(self, changed: Dict[int, Dict]) -> List[Job]:
+        """
+        Update known jobs from their changed listings (caller commits).
+        
+        Fields a listing leaves out, and companies it does not name or that
+        do not resolve, keep their stored values.
+        """
+        if not changed:
+            return []
+        
+        jobs = self.db.query(Job).filter(Job.id.in_(list(changed))).all()
+        company_ids = self.ingestion.resolve_companies(list(changed.values()))
+        for job in jobs:
+            job_data = changed[job.id]
+            for field in ("title", "location", "remote_type", "salary_min", "salary_max"):
+                if job_data.get(field) is not None:
+                    setattr(job, field, job_data[field])
+            company_id = company_ids.get(job_data.get("company_name"))
+            if company_id is not None:
+                job.company_id = company_id
+        
+        # Recompute normalized features from the updated fields
+        JobFeaturesService(self.db).refresh(jobs, force=True)
+        return jobs
@@ -0,0 +1,50 @@
+"""
+Ranked full-text search over jobs (the q= parameter of the job listings).
+
+On Postgres the query is matched against the trigger-maintained, weighted
+jobs.search_vector (see models/search_index.py) through its GIN index and
+ranked with ts_rank. Other databases, i.e. SQLite in tests, fall back to
+requiring each word in the title, company name or description with ILIKE,
+without ranking.
+"""
+from typing import Optional, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..models import Job, Company
+from ..models.search_index import SEARCH_CONFIG
+
+
+def apply_text_search(
+    db: Session,
+    query: Query,
+    q: str
+) -> Tuple[Query, Optional[ColumnElement]]:
+    """
+    Filter a query over Job to the jobs matching q.
+    
+    Args:
+        db: Session the query runs in (selects the implementation)
+        query: Query whose FROM includes jobs
+        q: Search text, in web search syntax on Postgres ("quoted phrase",
+           or, -excluded)
+    
+    Returns:
+        (filtered query, rank expression to order by, or None when the
+        fallback does not rank)
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        query = query.filter(Job.search_vector.op("@@")(tsquery))
+        return query, func.ts_rank(Job.search_vector, tsquery)
+    
+    for word in q.split():
+        pattern = f"%{word}%"
+        query = query.filter(or_(
+            Job.title.ilike(pattern),
+            Job.company.has(Company.name.ilike(pattern)),
+            Job.description.ilike(pattern)
+        ))
+    return query, None
@@ -0,0 +1,244 @@
+"""
+Two-tier cache of fetched pages, keyed by normalized URL and provider.
+
+Scraped search and job pages are requested again and again (same search
+by several users, repeated pipeline runs), and paid providers bill every
+call. Entries live in an in-memory LRU and, optionally, in a SQLite file
+with zlib-compressed content, so they survive restarts and are shared by
+the API and the scripts.
+
+Each entry is fresh for its domain's TTL, then stale for a further window
+during which it can still be served while a refresh runs in the background
+(stale-while-revalidate, see ScrapingService.fetch_page).
+
+The SQLite file is shared by processes, so async callers use aget()/aset(),
+which run disk I/O in a worker thread, and the file is opened in WAL mode
+(readers do not wait for writers). A disk tier error is logged and treated
+as a miss: the cache never fails a fetch.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .provider_health import domain_key
+
+logger = logging.getLogger(__name__)
+
+# (fresh seconds, extra stale-while-revalidate seconds) per domain
+DEFAULT_TTL = (3600.0, 24 * 3600.0)
+DOMAIN_TTLS = {
+    "indeed.com": (3600.0, 12 * 3600.0),
+    "glassdoor.com": (3600.0, 12 * 3600.0),
+    "glassdoor.fr": (3600.0, 12 * 3600.0),
+    "linkedin.com": (1800.0, 6 * 3600.0),
+    "welcometothejungle.com": (6 * 3600.0, 24 * 3600.0),
+}
+
+# Query parameters that do not change the page content
+IGNORED_QUERY_PARAMS = ("utm_", "fbclid", "gclid", "trk", "refid", "trackingid")
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for cache keys.
+    
+    Lowercases scheme and host, drops the fragment, "www." and tracking
+    parameters, sorts the query and strips a trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port:
+        host = f"{host}:{parts.port}"
+    
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(IGNORED_QUERY_PARAMS)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), host, path, urlencode(query), ""))
+
+
+def cache_key(url: str, provider: str) -> str:
+    """Content address of a (URL, provider) pair."""
+    return hashlib.sha256(f"{provider}\n{normalize_url(url)}".encode()).hexdigest()
+
+
+def ttl_for(url: str) -> Tuple[float, float]:
+    """(fresh, stale) seconds for a URL's domain."""
+    return DOMAIN_TTLS.get(domain_key(url), DEFAULT_TTL)
+
+
+class CacheEntry(NamedTuple):
+    """A cached page."""
+    content: str
+    provider: str
+    fetched_at: float
+    fresh_until: float
+    stale_until: float
+    
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+
+class PageCache:
+    """
+    In-memory LRU in front of an optional SQLite file.
+    
+    Example:
+        cache = PageCache(path="cache/pages.sqlite3")
+        await cache.aset(url, "firecrawl", html)
+        entry = await cache.aget(url, ["parallel", "firecrawl"])
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        memory_entries: int = 256,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            path: SQLite file of the disk tier (None: memory only)
+            memory_entries: Size of the in-memory LRU
+            clock: Wall clock (entries outlive the process)
+        """
+        self.path = path
+        self.memory_entries = memory_entries
+        self._clock = clock
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+    
+    @classmethod
+    def from_env(cls) -> Optional["PageCache"]:
+        """Cache configured by SCRAPING_CACHE* variables, or None if disabled."""
+        if os.getenv("SCRAPING_CACHE", "true").lower() == "false":
+            return None
+        return cls(
+            path=os.getenv("SCRAPING_CACHE_PATH", "cache/pages.sqlite3") or None,
+            memory_entries=int(os.getenv("SCRAPING_CACHE_MEMORY_ENTRIES", "256")),
+        )
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Open the disk tier on first use, dropping fully expired rows."""
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            try:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS pages ("
+                    " key TEXT PRIMARY KEY, url TEXT, provider TEXT, content BLOB,"
+                    " fetched_at REAL, fresh_until REAL, stale_until REAL)"
+                )
+                db.execute("DELETE FROM pages WHERE stale_until < ?", (self._clock(),))
+                db.commit()
+            except sqlite3.Error:
+                db.close()
+                raise
+            self._db = db
+        return self._db
+    
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+    
+    def _lookup(self, key: str) -> Optional[CacheEntry]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+        if not self.path:
+            return None
+        
+        try:
+            row = self._connection().execute(
+                "SELECT content, provider, fetched_at, fresh_until, stale_until"
+                " FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Page cache read failed, treated as a miss: {type(e).__name__}: {e}")
+            return None
+        if row is None:
+            return None
+        entry = CacheEntry(zlib.decompress(row[0]).decode("utf-8"), *row[1:])
+        self._remember(key, entry)
+        return entry
+    
+    def get(self, url: str, providers: Sequence[str]) -> Optional[CacheEntry]:
+        """
+        Cached page of url from the first provider (in the given order) with
+        a fresh entry, else the first still within its stale window.
+        """
+        now = self._clock()
+        stale = None
+        with self._lock:
+            for provider in providers:
+                entry = self._lookup(cache_key(url, provider))
+                if entry is None or now >= entry.stale_until:
+                    continue
+                if entry.is_fresh(now):
+                    return entry
+                stale = stale or entry
+        return stale
+    
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Whether an entry is still fresh (otherwise stale, to revalidate)."""
+        return entry.is_fresh(self._clock())
+    
+    def set(self, url: str, provider: str, content: str) -> CacheEntry:
+        """Store a page fetched now with provider."""
+        now = self._clock()
+        fresh, stale = ttl_for(url)
+        entry = CacheEntry(content, provider, now, now + fresh, now + fresh + stale)
+        key = cache_key(url, provider)
+        
+        with self._lock:
+            self._remember(key, entry)
+            if self.path:
+                try:
+                    db = self._connection()
+                    db.execute(
+                        "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (key, normalize_url(url), provider,
+                         zlib.compress(content.encode("utf-8")), *entry[2:])
+                    )
+                    db.commit()
+                except (sqlite3.Error, OSError) as e:
+                    logger.warning(f"Page cache write failed for {url}: {type(e).__name__}: {e}")
+        return entry
+    
+    async def aget(self, url: str, providers: Sequence[str]) -> Optional[CacheEntry]:
+        """get() with the disk tier read in a worker thread."""
+        if not self.path:
+            return self.get(url, providers)
+        return await asyncio.to_thread(self.get, url, providers)
+    
+    async def aset(self, url: str, provider: str, content: str) -> CacheEntry:
+        """set() with compression and the disk write in a worker thread."""
+        if not self.path:
+            return self.set(url, provider, content)
+        return await asyncio.to_thread(self.set, url, provider, content)
+    
+    def close(self) -> None:
+        """Close the disk tier (reopened on next use)."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
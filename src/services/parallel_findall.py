@@ -1,13 +1,44 @@
 """
 Service for interacting with Parallel FindAll API for comprehensive job searches.
+
+Runs last up to 20 minutes and are polled from SSE streams, so every API
+call goes through the SDK's async client: a round trip suspends the
+stream instead of blocking the event loop (and every other request on
+the worker). One client, and its connection pool, is shared by all runs.
 """
 import os
 import asyncio
 from typing import Dict, Any, List, Optional, AsyncGenerator
-from parallel import Parallel
+from parallel import AsyncParallel
 from sqlalchemy.orm import Session
 
-from ..models import Job, Company
+from ..models import Job
+from .job_ingestion import JobIngestionService
+from .score_materialization import ScoreMaterializationService
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+# Shared async client, created on first use
+_client: Optional[AsyncParallel] = None
+
+
+def get_findall_client() -> AsyncParallel:
+    """Get or create the shared async Parallel client."""
+    global _client
+    if _client is None:
+        api_key = os.getenv("PARALLEL_API_KEY")
+        if not api_key:
+            raise ValueError("PARALLEL_API_KEY environment variable not set")
+        _client = AsyncParallel(api_key=api_key)
+    return _client
+
+
+async def close_findall_client() -> None:
+    """Close the shared client's connections (recreated on next use)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
 
 
 class ParallelFindAllService:
@@ -15,16 +46,12 @@ class ParallelFindAllService:
     
     def __init__(self, db: Session):
         self.db = db
-        api_key = os.getenv("PARALLEL_API_KEY")
-        if not api_key:
-            raise ValueError("PARALLEL_API_KEY environment variable not set")
-        
-        self.client = Parallel(api_key=api_key)
+        self.client = get_findall_client()
         self.beta_version = os.getenv("FINDALL_BETA", "findall-2025-09-15")
         self.default_generator = os.getenv("FINDALL_DEFAULT_GENERATOR", "core")
         self.default_match_limit = int(os.getenv("FINDALL_DEFAULT_MATCH_LIMIT", "50"))
     
-    def create_run(
+    async def create_run(
         self,
         keywords: str,
         location: str,
@@ -61,7 +88,7 @@ class ParallelFindAllService:
         ]
         
         # Create FindAll run
-        findall_run = self.client.beta.findall.create(
+        findall_run = await self.client.beta.findall.create(
             objective=f"Find all jobs for {keywords} in {location}, France on Glassdoor, Welcome to the Jungle, Indeed, and LinkedIn websites",
             entity_type="jobs",
             match_conditions=match_conditions,
@@ -89,32 +116,25 @@ class ParallelFindAllService:
         Yields:
             Progress dict with status, generated_count, matched_count, iteration
         """
-        terminal_statuses = ["completed", "failed", "cancelled"]
         iteration = 0
         
         while iteration < max_iterations:
             iteration += 1
             
             try:
-                findall_run = self.client.beta.findall.retrieve(
-                    findall_id=findall_id,
-                    betas=[self.beta_version]
-                )
-                
-                status = findall_run.status.status
-                metrics = findall_run.status.metrics
+                status = await self.get_status(findall_id)
                 
                 # Yield progress
                 yield {
-                    "status": status,
-                    "generated_count": metrics.generated_candidates_count if hasattr(metrics, 'generated_candidates_count') else 0,
-                    "matched_count": metrics.matched_candidates_count if hasattr(metrics, 'matched_candidates_count') else 0,
+                    "status": status["status"],
+                    "generated_count": status["generated_count"],
+                    "matched_count": status["matched_count"],
                     "iteration": iteration,
-                    "is_complete": status in terminal_statuses
+                    "is_complete": status["is_complete"]
                 }
                 
                 # Stop if terminal status reached
-                if status in terminal_statuses:
+                if status["is_complete"]:
                     break
                 
                 # Wait before next poll (non-blocking)
@@ -138,7 +158,28 @@ class ParallelFindAllService:
                 "is_complete": True
             }
     
-    def get_results(self, findall_id: str) -> List[Dict[str, Any]]:
+    async def get_status(self, findall_id: str) -> Dict[str, Any]:
+        """
+        Current status of a FindAll run.
+        
+        Returns:
+            Dict with status, generated_count, matched_count, is_complete
+        """
+        findall_run = await self.client.beta.findall.retrieve(
+            findall_id=findall_id,
+            betas=[self.beta_version]
+        )
+        
+        status = findall_run.status.status
+        metrics = findall_run.status.metrics
+        return {
+            "status": status,
+            "generated_count": getattr(metrics, "generated_candidates_count", 0),
+            "matched_count": getattr(metrics, "matched_candidates_count", 0),
+            "is_complete": status in TERMINAL_STATUSES
+        }
+    
+    async def get_results(self, findall_id: str) -> List[Dict[str, Any]]:
         """
         Retrieve final results from completed FindAll run.
         
@@ -148,7 +189,7 @@ class ParallelFindAllService:
         Returns:
             List of matched candidate dicts
         """
-        result = self.client.beta.findall.result(
+        result = await self.client.beta.findall.result(
             findall_id=findall_id,
             betas=[self.beta_version]
         )
@@ -182,55 +223,28 @@ class ParallelFindAllService:
             "output": output
         }
     
-    def convert_to_job_format(self, candidates: List[Dict[str, Any]]) -> List[Job]:
+    def convert_to_job_format(self, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Convert FindAll candidates to Job model instances.
+        Convert FindAll candidates to job dicts, as saved by save_jobs().
         
         Args:
             candidates: List of candidate dicts from get_results()
         
         Returns:
-            List of Job instances (not yet committed to DB)
+            List of job dicts (company name extracted from the title)
         """
-        jobs = []
-        
-        for candidate in candidates:
-            # Check if job already exists by URL
-            existing = self.db.query(Job).filter(
-                Job.source_url == candidate["url"]
-            ).first()
-            
-            if existing:
-                continue
-            
-            # Extract company name from job title
-            company_name = self._extract_company_name(candidate["name"])
-            company_id = None
-            
-            if company_name:
-                company = self._get_or_create_company(company_name)
-                company_id = company.id
-            
-            # Create Job instance
-            job = Job(
-                title=candidate["name"],
-                description=candidate.get("description", ""),
-                location=candidate.get("location", ""),
-                source_url=candidate["url"],
-                source_platform="findall",
-                external_id=candidate["candidate_id"],
-                company_id=company_id,
-                # FindAll provides high-quality matches
-                salary_min=None,  # Could add via enrichments
-                salary_max=None,
-                job_type=None,
-                experience_level=None,
-                remote_type=None
-            )
-            
-            jobs.append(job)
-        
-        return jobs
+        return [
+            {
+                "title": candidate["name"],
+                "description": candidate.get("description", ""),
+                "location": candidate.get("location", ""),
+                "source_url": candidate["url"],
+                "source_platform": "findall",
+                "external_id": candidate["candidate_id"],
+                "company_name": self._extract_company_name(candidate["name"]),
+            }
+            for candidate in candidates
+        ]
     
     def _extract_company_name(self, job_title: str) -> Optional[str]:
         """Extract company name from job title."""
@@ -248,37 +262,48 @@ class ParallelFindAllService:
         
         return None
     
-    def _get_or_create_company(self, company_name: str) -> Company:
-        """Get existing company or create new one."""
-        company = self.db.query(Company).filter(
-            Company.name == company_name
-        ).first()
-        
-        if not company:
-            company = Company(name=company_name)
-            self.db.add(company)
-            self.db.commit()
-            self.db.refresh(company)
-        
-        return company
+    def saved_job_ids(self, candidates: List[Dict[str, Any]]) -> List[int]:
+        """Ids of the saved jobs of candidates, in one query."""
+        urls = [candidate["url"] for candidate in candidates]
+        if not urls:
+            return []
+        return [
+            job_id for (job_id,) in self.db.query(Job.id).filter(Job.source_url.in_(urls))
+        ]
     
-    def save_jobs(self, jobs: List[Job]) -> List[Job]:
+    def save_jobs(self, jobs: List[Dict[str, Any]]) -> List[Job]:
         """
-        Save jobs to database.
+        Save job dicts from convert_to_job_format(), skipping known URLs.
+        
+        Known URLs are filtered in one query, then companies and jobs are
+        inserted in bulk (see JobIngestionService) and committed once.
         
         Args:
-            jobs: List of Job instances
+            jobs: List of job dicts
         
         Returns:
             List of saved Job instances with IDs
         """
+        urls = [job["source_url"] for job in jobs]
+        known = set()
+        if urls:
+            known = {
+                url for (url,) in self.db.query(Job.source_url).filter(Job.source_url.in_(urls))
+            }
+        new_jobs = []
         for job in jobs:
-            self.db.add(job)
+            if job["source_url"] not in known:
+                known.add(job["source_url"])
+                new_jobs.append(job)
         
+        inserted = JobIngestionService(self.db).insert_jobs(new_jobs)
         self.db.commit()
         
-        # Refresh to get IDs
-        for job in jobs:
-            self.db.refresh(job)
+        saved = []
+        if inserted:
+            saved = self.db.query(Job).filter(Job.id.in_(list(inserted.values()))).all()
+        
+        # Materialize V2 scores for the new jobs
+        ScoreMaterializationService(self.db).refresh_jobs(saved)
         
-        return jobs
+        return saved
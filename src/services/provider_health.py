@@ -0,0 +1,216 @@
+"""
+Per-provider health tracking for the scraping service.
+
+Every fetch attempt is recorded per (target domain, provider) in a rolling
+window. That gives a recent success rate and p95 latency, used to try the
+providers for a domain cheapest-first (expected time to get the page), and
+a circuit breaker that skips a provider after consecutive failures until a
+cooldown has passed.
+"""
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+# Attempts kept per (domain, provider)
+WINDOW_SIZE = 50
+
+# Attempts needed before a provider is ranked on its own stats; until then
+# it keeps its default position, ahead of providers with known costs
+MIN_SAMPLES = 3
+
+# Circuit breaker: consecutive failures to open, seconds before a retry
+FAILURE_THRESHOLD = 3
+COOLDOWN_SECONDS = 120.0
+
+# Hedged fetches: wait for the running provider's recent p90 latency (or
+# the default while it has fewer than MIN_SAMPLES attempts) before firing
+# the next one. Each fetch earns HEDGE_BUDGET_RATIO of a paid hedge, banked
+# up to HEDGE_BUDGET_MAX, so paid providers are double-called on at most
+# ~10% of fetches. Hedging to a free provider is not budgeted.
+HEDGE_QUANTILE = 0.9
+DEFAULT_HEDGE_DELAY = 5.0
+HEDGE_BUDGET_RATIO = 0.1
+HEDGE_BUDGET_MAX = 5.0
+
+# Domains keyed by their registrable name, e.g. fr.indeed.com -> indeed.com
+KNOWN_DOMAINS = (
+    "indeed.com", "glassdoor.com", "glassdoor.fr", "linkedin.com",
+    "welcometothejungle.com",
+)
+
+
+def domain_key(url: str) -> str:
+    """Domain a URL's stats are grouped under."""
+    host = (urlparse(url).hostname or "").lower()
+    for domain in KNOWN_DOMAINS:
+        if host == domain or host.endswith("." + domain):
+            return domain
+    return host[4:] if host.startswith("www.") else host
+
+
+@dataclass
+class ProviderStats:
+    """Rolling stats and circuit breaker of one provider on one domain."""
+    
+    attempts: Deque[Tuple[bool, float]] = field(
+        default_factory=lambda: deque(maxlen=WINDOW_SIZE)
+    )
+    consecutive_failures: int = 0
+    opened_at: Optional[float] = None
+    
+    @property
+    def success_rate(self) -> Optional[float]:
+        if not self.attempts:
+            return None
+        return sum(1 for success, _ in self.attempts if success) / len(self.attempts)
+    
+    def latency_quantile(self, q: float) -> Optional[float]:
+        """Nearest-rank latency quantile of the window, e.g. 0.95 for p95."""
+        if not self.attempts:
+            return None
+        latencies = sorted(latency for _, latency in self.attempts)
+        return latencies[min(len(latencies) - 1, max(0, math.ceil(q * len(latencies)) - 1))]
+    
+    @property
+    def p95_latency(self) -> Optional[float]:
+        return self.latency_quantile(0.95)
+    
+    def expected_cost(self) -> float:
+        """
+        Expected seconds spent per page obtained (p95 latency / success rate).
+        
+        0 while there are fewer than MIN_SAMPLES attempts, so new providers
+        get tried and measured.
+        """
+        if len(self.attempts) < MIN_SAMPLES:
+            return 0.0
+        return self.p95_latency / max(self.success_rate, 0.05)
+    
+    def state(self, now: float) -> str:
+        """Circuit state: closed, open (skipped) or half_open (one trial)."""
+        if self.opened_at is None:
+            return "closed"
+        if now - self.opened_at < COOLDOWN_SECONDS:
+            return "open"
+        return "half_open"
+    
+    def record(self, success: bool, latency: float, now: float) -> None:
+        self.attempts.append((success, latency))
+        if success:
+            self.consecutive_failures = 0
+            self.opened_at = None
+        else:
+            # Also re-opens the circuit for a full cooldown after a failed
+            # half-open trial (the count was not reset while open)
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= FAILURE_THRESHOLD:
+                self.opened_at = now
+    
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        success_rate = self.success_rate
+        p95 = self.p95_latency
+        return {
+            "state": self.state(now),
+            "attempts": len(self.attempts),
+            "success_rate": round(success_rate, 3) if success_rate is not None else None,
+            "p95_latency": round(p95, 3) if p95 is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+class ProviderHealth:
+    """
+    Health of the scraping providers, per target domain.
+    
+    Example:
+        health = ProviderHealth()
+        for provider in health.order(["parallel", "httpx"], url):
+            if health.begin(provider, url):
+                ...  # fetch, then health.record(provider, url, ok, seconds)
+    """
+    
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._stats: Dict[str, Dict[str, ProviderStats]] = {}
+    
+    def _get(self, domain: str, provider: str) -> ProviderStats:
+        return self._stats.setdefault(domain, {}).setdefault(provider, ProviderStats())
+    
+    def order(self, providers: Sequence[str], url: str) -> List[str]:
+        """
+        Providers to try for url, cheapest first, without open circuits.
+        
+        Ties (e.g. no data yet) keep the given default order. A provider
+        whose cooldown has passed is kept for one trial, claimed by begin()
+        when it is actually called.
+        """
+        domain = domain_key(url)
+        now = self._clock()
+        available = [
+            provider for provider in providers
+            if self._get(domain, provider).state(now) != "open"
+        ]
+        return sorted(available, key=lambda p: self._get(domain, p).expected_cost())
+    
+    def begin(self, provider: str, url: str) -> bool:
+        """
+        Claim provider for a fetch attempt; False if its circuit is open.
+        
+        Claiming a half-open provider's trial re-stamps its circuit, so
+        concurrent calls skip it until the trial is recorded.
+        """
+        stats = self._get(domain_key(url), provider)
+        now = self._clock()
+        state = stats.state(now)
+        if state == "open":
+            return False
+        if state == "half_open":
+            stats.opened_at = now
+        return True
+    
+    def hedge_delay(self, provider: str, url: str) -> float:
+        """Seconds to wait on provider before hedging (its recent p90 latency)."""
+        stats = self._get(domain_key(url), provider)
+        if len(stats.attempts) < MIN_SAMPLES:
+            return DEFAULT_HEDGE_DELAY
+        return stats.latency_quantile(HEDGE_QUANTILE)
+    
+    def record(self, provider: str, url: str, success: bool, latency: float) -> None:
+        """Record the outcome and duration (seconds) of a fetch attempt."""
+        self._get(domain_key(url), provider).record(success, latency, self._clock())
+    
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Stats per domain and provider, for diagnostics."""
+        now = self._clock()
+        return {
+            domain: {provider: stats.to_dict(now) for provider, stats in providers.items()}
+            for domain, providers in self._stats.items()
+        }
+
+
+class HedgeBudget:
+    """
+    Budget of extra (hedge) calls to paid providers.
+    
+    Every fetch earns `ratio` of a hedge, banked up to `max_tokens`; a paid
+    hedge spends one. Over time, paid hedges stay within `ratio` of fetches.
+    """
+    
+    def __init__(self, ratio: float = HEDGE_BUDGET_RATIO, max_tokens: float = HEDGE_BUDGET_MAX):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+    
+    def earn(self) -> None:
+        """Credit one fetch."""
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+    
+    def try_spend(self) -> bool:
+        """Take one paid hedge if the budget allows it."""
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
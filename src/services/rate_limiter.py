@@ -0,0 +1,238 @@
+"""
+Shared rate limiting and concurrency scheduling for outbound calls.
+
+Every provider (Firecrawl, BrightData, Parallel, Unipile, Apify) and every
+target domain fetched directly has a token bucket (sustained rate + burst)
+and a concurrency cap. Callers take a slot on the keys their call counts
+against and are served as soon as the quota allows, instead of sleeping
+fixed delays. Waiting callers are served by priority class, so interactive
+searches go ahead of queued background enrichment.
+"""
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional
+
+from .provider_health import domain_key
+
+
+class Priority(IntEnum):
+    """Priority classes (lower is served first)."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class Limit(NamedTuple):
+    """Quota of one key."""
+    rate: float  # sustained calls per second
+    burst: float  # calls allowed at once after idling
+    concurrency: int  # calls in flight
+
+
+# Defaults per key, overridable with RATE_LIMIT_<KEY>="rate,burst,concurrency"
+# (key upper-cased, non-alphanumerics as "_", e.g. RATE_LIMIT_DOMAIN_INDEED_COM)
+DEFAULT_LIMITS = {
+    "provider:parallel": Limit(5.0, 10, 10),
+    "provider:firecrawl": Limit(2.0, 5, 5),
+    "provider:brightdata": Limit(2.0, 5, 5),
+    "provider:unipile": Limit(1.0, 2, 2),
+    "provider:apify": Limit(0.5, 1, 2),
+    "domain:indeed.com": Limit(1.0, 2, 2),
+    "domain:glassdoor.com": Limit(0.5, 1, 1),
+    "domain:glassdoor.fr": Limit(0.5, 1, 1),
+    "domain:linkedin.com": Limit(0.5, 1, 1),
+    "domain:welcometothejungle.com": Limit(1.0, 2, 2),
+}
+DEFAULT_DOMAIN_LIMIT = Limit(2.0, 4, 4)
+DEFAULT_PROVIDER_LIMIT = Limit(2.0, 4, 4)
+
+
+def provider_key(provider: str) -> str:
+    return f"provider:{provider}"
+
+
+def url_domain_key(url: str) -> str:
+    return f"domain:{domain_key(url)}"
+
+
+def limit_for(key: str) -> Limit:
+    """Configured limit of a key (environment, then defaults)."""
+    env_name = "RATE_LIMIT_" + "".join(c if c.isalnum() else "_" for c in key.upper())
+    value = os.getenv(env_name)
+    if value:
+        rate, burst, concurrency = value.split(",")
+        return Limit(float(rate), float(burst), int(concurrency))
+    if key in DEFAULT_LIMITS:
+        return DEFAULT_LIMITS[key]
+    return DEFAULT_DOMAIN_LIMIT if key.startswith("domain:") else DEFAULT_PROVIDER_LIMIT
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` per second, up to `burst`."""
+    
+    def __init__(self, rate: float, burst: float, clock=time.monotonic):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self._clock = clock
+        self._updated = clock()
+    
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def try_take(self) -> float:
+        """Take a token if available; else return the seconds until one is."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class _KeyScheduler:
+    """Bucket, concurrency cap and priority queue of one key."""
+    
+    def __init__(self, limit: Limit):
+        self.limit = limit
+        self.bucket = TokenBucket(limit.rate, limit.burst)
+        self.active = 0
+        self._waiters: List[list] = []  # heap of [priority, seq, future]
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()  # for wait_sync
+    
+    async def acquire(self, priority: Priority) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, next(self._seq), future])
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Granted just before the cancellation: give the slot back
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+    
+    def release(self) -> None:
+        self.active -= 1
+        self._dispatch()
+    
+    def _dispatch(self) -> None:
+        """Grant slots to the best waiters while quota allows."""
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done() or future.get_loop().is_closed():
+                # Cancelled while waiting, or left by a finished event loop
+                heapq.heappop(self._waiters)
+                continue
+            if self.active >= self.limit.concurrency:
+                return  # re-run on release
+            wait = self.bucket.try_take()
+            if wait > 0:
+                if self._timer is None or self._timer_loop.is_closed():
+                    self._timer_loop = future.get_loop()
+                    self._timer = self._timer_loop.call_later(wait, self._on_timer)
+                return
+            heapq.heappop(self._waiters)
+            self.active += 1
+            future.set_result(None)
+    
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+
+class RateLimiter:
+    """
+    Token-bucket scheduler over provider and domain keys.
+    
+    Example:
+        limiter = get_rate_limiter()
+        async with limiter.slot(provider_key("firecrawl"), priority=Priority.BACKGROUND):
+            ...  # call Firecrawl
+    """
+    
+    def __init__(self, limit: Optional[Limit] = None):
+        """
+        Args:
+            limit: Limit applied to every key instead of the configured ones
+        """
+        self.limit = limit
+        self._schedulers: Dict[str, _KeyScheduler] = {}
+    
+    def _scheduler(self, key: str) -> _KeyScheduler:
+        scheduler = self._schedulers.get(key)
+        if scheduler is None:
+            scheduler = _KeyScheduler(self.limit or limit_for(key))
+            self._schedulers[key] = scheduler
+        return scheduler
+    
+    @asynccontextmanager
+    async def slot(
+        self,
+        *keys: str,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> AsyncIterator[None]:
+        """
+        Hold one call's slot on each key (token taken, concurrency counted).
+        
+        Keys are acquired in sorted order, so callers sharing keys cannot
+        deadlock; the slots are released when the block exits.
+        """
+        acquired: List[_KeyScheduler] = []
+        try:
+            for key in sorted(set(keys)):
+                scheduler = self._scheduler(key)
+                await scheduler.acquire(priority)
+                acquired.append(scheduler)
+            yield
+        finally:
+            for scheduler in acquired:
+                scheduler.release()
+    
+    def wait_sync(self, key: str) -> None:
+        """
+        Blocking variant for sequential scripts: wait for a token on key.
+        
+        Only the rate applies (a sequential caller has one call in flight).
+        """
+        scheduler = self._scheduler(key)
+        while True:
+            with scheduler._lock:
+                wait = scheduler.bucket.try_take()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+    
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Current state per key, for diagnostics."""
+        return {
+            key: {
+                "rate": s.limit.rate,
+                "concurrency": s.limit.concurrency,
+                "active": s.active,
+                "waiting": sum(1 for w in s._waiters if not w[2].done()),
+                "tokens": round(s.bucket.tokens, 2),
+            }
+            for key, s in self._schedulers.items()
+        }
+
+
+# Singleton instance, shared by all outbound callers of the process
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get or create the rate limiter instance."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+    return _rate_limiter
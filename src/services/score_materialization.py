@@ -0,0 +1,352 @@
+"""
+Materialized V2 scores.
+
+Keeps one JobScore row per (user, job) so the scored dashboard can sort and
+paginate in the database instead of rescoring the whole corpus per request.
+Rows are refreshed incrementally:
+- new jobs are scored for every user when they are ingested
+- a user's rows are rescored when their scoring preferences change; only
+  the categories depending on the changed fields are recomputed
+- jobs without a row (created through other paths) are scored lazily
+
+Jobs are read with column-projected queries (scoring_query) and scored
+from their stored normalized features (see job_features), which are
+computed here too when missing.
+
+Rows are written with INSERT ... ON CONFLICT (user_id, job_id) DO UPDATE
+where the database supports it: refreshes of the same scores may run
+concurrently (two dashboard tabs, a search saving jobs while a listing
+materializes them), and the last one simply wins.
+"""
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import and_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import func
+
+from ..models import Job, Company, JobFeatures, JobScore, UserScoringPreferences, UserProfile
+from .job_features import (
+    JobFeaturesService,
+    compute_job_features,
+    feature_columns,
+    features_from_row,
+)
+from .scoring_v2 import scoring_service_v2
+
+
+# Job fields read by the scorer and returned by the scored listing. The
+# company name is joined in, so no Job or Company objects are loaded.
+SCORING_COLUMNS = (
+    Job.id,
+    Job.title,
+    Company.name.label("company_name"),
+    Job.location,
+    Job.description,
+    Job.salary_min,
+    Job.salary_max,
+    Job.remote_type,
+    Job.job_type,
+    Job.experience_level,
+    Job.skills,
+    Job.source_platform,
+    Job.source_url,
+    Job.posted_date,
+    Job.created_at,
+)
+
+
+def scoring_query(db: Session, with_features: bool = False) -> Query:
+    """
+    Column-projected query over jobs and their company name.
+    
+    Rows convert to scoring dicts with row_to_scoring_dict(). With
+    with_features, stored features are selected too (see features_from_row).
+    """
+    columns = list(SCORING_COLUMNS)
+    if with_features:
+        columns += feature_columns()
+    
+    query = db.query(*columns).select_from(Job).outerjoin(
+        Company, Company.id == Job.company_id
+    )
+    if with_features:
+        query = query.outerjoin(JobFeatures, JobFeatures.job_id == Job.id)
+    return query
+
+
+def row_to_scoring_dict(row: Any) -> Dict[str, Any]:
+    """Convert a scoring_query() row to the dict shape expected by ScoringServiceV2."""
+    return {
+        "id": row.id,
+        "title": row.title,
+        "company": row.company_name,
+        "location": row.location,
+        "description": row.description,
+        "salary_min": row.salary_min,
+        "salary_max": row.salary_max,
+        "remote_type": row.remote_type,
+        "job_type": row.job_type,
+        "experience_level": row.experience_level,
+        "skills": row.skills if row.skills else [],
+        "source": row.source_platform,
+        "source_url": row.source_url,
+        "posted_at": row.posted_date.isoformat() if row.posted_date else None,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+    }
+
+
+def load_scoring_dicts(db: Session, job_ids: List[int]) -> List[Dict[str, Any]]:
+    """Load jobs as scoring dicts in one query, without stored features."""
+    if not job_ids:
+        return []
+    return [
+        row_to_scoring_dict(row)
+        for row in scoring_query(db).filter(Job.id.in_(job_ids))
+    ]
+
+
+class ScoreMaterializationService:
+    """Service maintaining the job_scores table."""
+    
+    # Jobs loaded and scored per round trip
+    BATCH_SIZE = 500
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+    
+    def get_scoring_prefs(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Build the V2 scoring preferences dict for a user.
+        
+        Returns None if the user has no scoring preferences yet.
+        """
+        prefs = self.db.query(UserScoringPreferences).filter(
+            UserScoringPreferences.user_id == user_id
+        ).first()
+        
+        if not prefs:
+            return None
+        
+        profile = self.db.query(UserProfile).filter(
+            UserProfile.user_id == user_id
+        ).first()
+        
+        cv_skills = []
+        if profile and profile.skills:
+            cv_skills = profile.skills if isinstance(profile.skills, list) else []
+        
+        scoring_prefs = prefs.to_dict()
+        scoring_prefs["cv_skills"] = cv_skills
+        return scoring_prefs
+    
+    def ensure_fresh(self, user_id: int, scoring_prefs: Dict[str, Any]) -> int:
+        """
+        Bring a user's materialized scores up to date.
+        
+        Rows computed with different preferences are partially rescored
+        (only the categories whose preference fields changed), and jobs
+        without a row are fully scored.
+        
+        Returns:
+            Number of rows written
+        """
+        fingerprint = scoring_service_v2.preferences_fingerprint(scoring_prefs)
+        
+        # Group stale rows by the preferences they were computed with
+        stale_by_fingerprint: Dict[str, List[int]] = {}
+        for job_id, old_fingerprint in self.db.query(
+            JobScore.job_id, JobScore.preferences_fingerprint
+        ).filter(
+            JobScore.user_id == user_id,
+            JobScore.preferences_fingerprint != fingerprint
+        ):
+            stale_by_fingerprint.setdefault(old_fingerprint, []).append(job_id)
+        
+        missing_ids = [
+            job_id for (job_id,) in self.db.query(Job.id).outerjoin(
+                JobScore,
+                and_(JobScore.job_id == Job.id, JobScore.user_id == user_id)
+            ).filter(JobScore.id.is_(None))
+        ]
+        
+        written = 0
+        for old_fingerprint, job_ids in stale_by_fingerprint.items():
+            categories = scoring_service_v2.changed_categories(old_fingerprint, fingerprint)
+            written += self._store_in_batches(
+                user_id, job_ids, scoring_prefs, fingerprint, categories
+            )
+        written += self._store_in_batches(
+            user_id, missing_ids, scoring_prefs, fingerprint, None
+        )
+        
+        if written:
+            self.db.commit()
+        return written
+    
+    def refresh_user(self, user_id: int) -> int:
+        """Rescore a user's jobs after their scoring preferences changed."""
+        scoring_prefs = self.get_scoring_prefs(user_id)
+        if scoring_prefs is None:
+            return 0
+        return self.ensure_fresh(user_id, scoring_prefs)
+    
+    def refresh_jobs(self, jobs: List[Job]) -> int:
+        """
+        Score newly ingested jobs for every user with scoring preferences.
+        
+        Their normalized features are computed and stored here, once.
+        
+        Returns:
+            Number of rows written
+        """
+        if not jobs:
+            return 0
+        
+        job_dicts = self._load_jobs([job.id for job in jobs])
+        self._ensure_features(job_dicts)
+        
+        user_ids = [
+            user_id for (user_id,) in self.db.query(UserScoringPreferences.user_id)
+        ]
+        
+        written = 0
+        for user_id in user_ids:
+            scoring_prefs = self.get_scoring_prefs(user_id)
+            fingerprint = scoring_service_v2.preferences_fingerprint(scoring_prefs)
+            written += self._store_scores(user_id, job_dicts, scoring_prefs, fingerprint, None)
+        
+        self.db.commit()
+        return written
+    
+    def invalidate_jobs(self, job_ids: List[int]) -> None:
+        """Drop materialized scores so the jobs are rescored on next read."""
+        if not job_ids:
+            return
+        self.db.query(JobScore).filter(
+            JobScore.job_id.in_(job_ids)
+        ).delete(synchronize_session=False)
+        self.db.commit()
+    
+    def _load_jobs(self, job_ids: List[int]) -> List[Dict[str, Any]]:
+        """Load jobs as scoring dicts, with stored features, in one query."""
+        jobs = []
+        for row in scoring_query(self.db, with_features=True).filter(Job.id.in_(job_ids)):
+            job = row_to_scoring_dict(row)
+            job["features"] = features_from_row(row)
+            jobs.append(job)
+        return jobs
+    
+    def _ensure_features(self, jobs: List[Dict[str, Any]]) -> None:
+        """Compute and store features of jobs loaded without up-to-date ones."""
+        computed = {}
+        for job in jobs:
+            if job["features"] is None:
+                job["features"] = compute_job_features(job)
+                computed[job["id"]] = job["features"]
+        JobFeaturesService(self.db).store(computed)
+    
+    def _store_in_batches(
+        self,
+        user_id: int,
+        job_ids: List[int],
+        scoring_prefs: Dict[str, Any],
+        fingerprint: str,
+        categories: Optional[List[str]]
+    ) -> int:
+        """Load and score jobs BATCH_SIZE at a time (caller commits)."""
+        written = 0
+        for start in range(0, len(job_ids), self.BATCH_SIZE):
+            jobs = self._load_jobs(job_ids[start:start + self.BATCH_SIZE])
+            # Backfill features of jobs saved before they existed
+            self._ensure_features(jobs)
+            written += self._store_scores(
+                user_id, jobs, scoring_prefs, fingerprint, categories
+            )
+        return written
+    
+    def _store_scores(
+        self,
+        user_id: int,
+        jobs: List[Dict[str, Any]],
+        scoring_prefs: Dict[str, Any],
+        fingerprint: str,
+        categories: Optional[List[str]]
+    ) -> int:
+        """
+        Score job dicts (from _load_jobs) and upsert their rows (caller commits).
+        
+        If categories is given, only those are recomputed and the others are
+        taken from the existing rows; jobs without a row are fully scored.
+        """
+        if not jobs:
+            return 0
+        
+        existing = {
+            row.job_id: row
+            for row in self.db.query(JobScore).filter(
+                JobScore.user_id == user_id,
+                JobScore.job_id.in_([job["id"] for job in jobs])
+            )
+        }
+        
+        partial_jobs = []
+        full_jobs = []
+        for job in jobs:
+            row = existing.get(job["id"])
+            if categories is not None and row is not None and row.breakdown:
+                partial_jobs.append(job)
+            else:
+                full_jobs.append(job)
+        
+        scored = list(zip(full_jobs, scoring_service_v2.score_batch(
+            full_jobs,
+            scoring_prefs
+        )))
+        if partial_jobs:
+            scored += list(zip(partial_jobs, scoring_service_v2.rescore_batch(
+                partial_jobs,
+                scoring_prefs,
+                [existing[job["id"]].breakdown for job in partial_jobs],
+                categories
+            )))
+        
+        rows = [
+            {
+                "user_id": user_id,
+                "job_id": job["id"],
+                "score": result["score"],
+                "breakdown": result["breakdown"],
+                "preferences_fingerprint": fingerprint,
+            }
+            for job, result in scored
+        ]
+        if self.dialect in ("postgresql", "sqlite"):
+            for start in range(0, len(rows), self.BATCH_SIZE):
+                self.db.execute(self._upsert_stmt(rows[start:start + self.BATCH_SIZE]))
+        else:
+            for values in rows:
+                row = existing.get(values["job_id"])
+                if row is None:
+                    row = JobScore(user_id=user_id, job_id=values["job_id"])
+                    self.db.add(row)
+                row.score = values["score"]
+                row.breakdown = values["breakdown"]
+                row.preferences_fingerprint = fingerprint
+        
+        return len(jobs)
+    
+    def _upsert_stmt(self, rows: List[Dict[str, Any]]):
+        """Multi-row JobScore INSERT, updating rows written concurrently."""
+        dialect = postgresql if self.dialect == "postgresql" else sqlite
+        stmt = dialect.insert(JobScore).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[JobScore.user_id, JobScore.job_id],
+            set_={
+                "score": stmt.excluded.score,
+                "breakdown": stmt.excluded.breakdown,
+                "preferences_fingerprint": stmt.excluded.preferences_fingerprint,
+                "updated_at": func.now(),
+            },
+        )
@@ -2,6 +2,17 @@ from typing import List, Dict, Any, Optional
 from difflib import SequenceMatcher
 import re
 
+from .job_features import compute_job_features
+from .text_matching import PriorityPatternMatcher
+
+
+# Seniority keywords inferred from job titles (checked in order: senior → junior → mid)
+SENIORITY_TITLE_MATCHER = PriorityPatternMatcher([
+    ("senior", [re.escape(k) for k in ["senior", "sr.", "lead", "principal"]]),
+    ("junior", [re.escape(k) for k in ["junior", "jr.", "entry"]]),
+    ("mid", ["mid"]),
+])
+
 
 class ScoringService:
     """
@@ -34,6 +45,10 @@ class ScoringService:
         total_weight = 0
         breakdown = {}
         
+        # Normalized features, computed once for all criteria if not stored
+        if not job.get("features"):
+            job = {**job, "features": compute_job_features(job)}
+        
         for criterion in criteria:
             if not criterion.get("enabled", False):
                 continue
@@ -98,6 +113,10 @@ class ScoringService:
         
         return {"score": 50, "details": "Unknown criterion type"}
     
+    def _features(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalized features of a job (see job_features)."""
+        return job.get("features") or compute_job_features(job)
+    
     def _score_job_title(
         self,
         job: Dict[str, Any],
@@ -105,7 +124,7 @@ class ScoringService:
         sub_criteria: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Score job title match using fuzzy matching."""
-        job_title = (job.get("title") or "").lower()
+        job_title = self._features(job)["title"]
         
         # Get target titles from sub_criteria custom list or profile
         target_titles = []
@@ -152,7 +171,7 @@ class ScoringService:
         sub_criteria: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Score location match."""
-        job_location = (job.get("location") or "").lower()
+        job_location = self._features(job)["location"]
         target_location = (sub_criteria.get("value") or profile.get("preferred_location") or "").lower()
         
         if not target_location:
@@ -266,15 +285,8 @@ class ScoringService:
         sub_criteria: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Score work mode match (remote, hybrid, onsite)."""
-        job_remote = (job.get("remote_type") or "").lower()
-        
-        if not job_remote:
-            # Try to infer from location
-            location = (job.get("location") or "").lower()
-            if "remote" in location:
-                job_remote = "remote"
-            elif "hybrid" in location:
-                job_remote = "hybrid"
+        # Remote type, or inferred from location
+        job_remote = self._features(job)["work_mode"]
         
         if not job_remote:
             return {"score": 50, "details": "Work mode not specified"}
@@ -337,16 +349,10 @@ class ScoringService:
     ) -> Dict[str, Any]:
         """Score seniority level match."""
         job_level = (job.get("experience_level") or "").lower()
-        job_title = (job.get("title") or "").lower()
         
         # Try to infer from title if not specified
         if not job_level:
-            if any(x in job_title for x in ["senior", "sr.", "lead", "principal"]):
-                job_level = "senior"
-            elif any(x in job_title for x in ["junior", "jr.", "entry"]):
-                job_level = "junior"
-            elif "mid" in job_title:
-                job_level = "mid"
+            job_level = self._features(job)["title_seniority"] or ""
         
         if not job_level:
             return {"score": 50, "details": "Seniority level not specified"}
@@ -380,7 +386,7 @@ class ScoringService:
         sub_criteria: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Score skills match."""
-        job_skills = set(s.lower() for s in (job.get("skills") or []))
+        job_skills = set(self._features(job)["skills"])
         job_desc = (job.get("description") or "").lower()
         
         # Get user skills from profile and custom sub_criteria
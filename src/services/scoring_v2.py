@@ -10,8 +10,20 @@ Categories (100 pts max + penalties):
 - Penalties: -10 pts max
 """
 
-from typing import Dict, Any, List, Optional, Tuple
-import re
+from typing import Dict, Any, List, Optional, Iterable, Set, Tuple
+import hashlib
+import json
+
+import numpy as np
+
+from .job_features import compute_job_features
+from .text_matching import (
+    KeywordMatcher,
+    PriorityPatternMatcher,
+    get_keyword_matcher,
+    normalize_keyword,
+    tokenize,
+)
 
 
 class ScoringServiceV2:
@@ -28,6 +40,26 @@ class ScoringServiceV2:
     MAX_ATTRACTIVENESS_POINTS = 10
     MAX_PENALTY_POINTS = -10
     
+    # Score categories, in the order they are summed
+    CATEGORIES = ("role", "geography", "salary", "skills", "attractiveness", "penalties")
+    
+    # Preference fields each category depends on
+    CATEGORY_DEPENDENCIES = {
+        "role": ["target_seniority"],
+        "geography": ["preferred_city"],
+        "salary": ["min_salary"],
+        "skills": ["cv_skills", "priority_skills"],
+        "attractiveness": ["attractiveness_keywords"],
+        "penalties": ["trusted_sources"],
+    }
+    
+    # Bumped when a category's matching logic changes, so materialized rows
+    # are rescored for that category (2: word-boundary keyword matching)
+    CATEGORY_VERSIONS = {
+        "skills": 2,
+        "attractiveness": 2,
+    }
+    
     # Seniority detection patterns (checked in order: Head → Senior → PM → Junior)
     SENIORITY_PATTERNS = {
         "head": {
@@ -77,6 +109,12 @@ class ScoringServiceV2:
         }
     }
     
+    # All seniority patterns compiled into one matcher, in detection order
+    SENIORITY_MATCHER = PriorityPatternMatcher(
+        [(level, config["patterns"]) for level, config in SENIORITY_PATTERNS.items()],
+        word_start=True
+    )
+    
     # Attractiveness keywords
     DEFAULT_ATTRACTIVENESS_KEYWORDS = {
         "high": [  # 10 pts - Mission-driven / Hot tech
@@ -193,6 +231,205 @@ class ScoringServiceV2:
             "breakdown": breakdown
         }
     
+    def score_batch(
+        self,
+        jobs: List[Dict[str, Any]],
+        preferences: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Score many jobs in one pass.
+        
+        Salary, geography and penalties are computed on NumPy columns, and
+        the text categories reuse keyword lists normalized once for the whole
+        batch. Jobs may carry precomputed features under "features" (see
+        job_features). Results are identical to calling
+        calculate_total_score() on each job.
+        
+        Args:
+            jobs: List of job dicts (same shape as calculate_total_score)
+            preferences: User preferences (same shape as calculate_total_score)
+        
+        Returns:
+            List of {"score", "breakdown"} dicts, in the same order as jobs
+        """
+        return self.rescore_batch(jobs, preferences, None, self.CATEGORIES)
+    
+    def rescore_batch(
+        self,
+        jobs: List[Dict[str, Any]],
+        preferences: Dict[str, Any],
+        breakdowns: Optional[List[Dict[str, Any]]],
+        categories: Iterable[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Recompute only some categories and re-sum the total.
+        
+        Categories not listed are copied from the previous breakdowns, so
+        after a single preference change (see changed_categories) only the
+        affected partial scores are recomputed.
+        
+        Args:
+            jobs: List of job dicts (same shape as calculate_total_score)
+            preferences: New user preferences
+            breakdowns: Previous breakdown of each job (None if all
+                        categories are recomputed)
+            categories: Categories to recompute
+        
+        Returns:
+            List of {"score", "breakdown"} dicts, in the same order as jobs
+        """
+        if not jobs:
+            return []
+        
+        categories = set(categories)
+        computed = self._score_categories_batch(jobs, preferences, categories)
+        
+        per_category = {}
+        for category in self.CATEGORIES:
+            if category in computed:
+                per_category[category] = computed[category]
+            else:
+                per_category[category] = [b[category] for b in breakdowns]
+        
+        # Same summation order as calculate_total_score
+        totals = np.zeros(len(jobs))
+        for category in self.CATEGORIES:
+            totals = totals + np.array(
+                [r["points"] for r in per_category[category]], dtype=float
+            )
+        totals = np.clip(totals, 0, 100)
+        
+        results = []
+        for i, total in enumerate(totals.tolist()):
+            results.append({
+                "score": round(total, 1),
+                "breakdown": {
+                    category: per_category[category][i]
+                    for category in self.CATEGORIES
+                }
+            })
+        
+        return results
+    
+    def changed_categories(
+        self,
+        old_fingerprint: str,
+        new_fingerprint: str
+    ) -> List[str]:
+        """
+        Categories whose preference fields differ between two fingerprints.
+        
+        Unknown or malformed fingerprints mark every category as changed.
+        """
+        old_parts = old_fingerprint.split(".") if old_fingerprint else []
+        new_parts = new_fingerprint.split(".")
+        if len(old_parts) != len(self.CATEGORIES) or len(new_parts) != len(self.CATEGORIES):
+            return list(self.CATEGORIES)
+        
+        return [
+            category
+            for category, old, new in zip(self.CATEGORIES, old_parts, new_parts)
+            if old != new
+        ]
+    
+    def preferences_fingerprint(self, preferences: Dict[str, Any]) -> str:
+        """
+        Fingerprint of the preferences, made of one short hash per category.
+        
+        Each part only covers the fields listed in CATEGORY_DEPENDENCIES (and
+        the CATEGORY_VERSIONS entry), so comparing two fingerprints tells
+        which categories need rescoring.
+        """
+        parts = []
+        for category in self.CATEGORIES:
+            values = {
+                field: preferences.get(field)
+                for field in self.CATEGORY_DEPENDENCIES[category]
+            }
+            if category in self.CATEGORY_VERSIONS:
+                values["_version"] = self.CATEGORY_VERSIONS[category]
+            payload = json.dumps(values, sort_keys=True, default=str)
+            parts.append(hashlib.sha256(payload.encode("utf-8")).hexdigest()[:8])
+        return ".".join(parts)
+    
+    def _score_categories_batch(
+        self,
+        jobs: List[Dict[str, Any]],
+        preferences: Dict[str, Any],
+        categories: Set[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Compute the requested categories for every job.
+        
+        Text processing goes through the jobs' normalized features (see
+        job_features), read from job["features"] when they were stored at
+        ingest and computed here otherwise.
+        """
+        computed = {}
+        
+        features = []
+        if categories - {"salary"}:
+            features = [job.get("features") or compute_job_features(job) for job in jobs]
+        
+        # Columnar categories
+        if "salary" in categories:
+            computed["salary"] = self._score_salary_batch(
+                jobs, preferences.get("min_salary")
+            )
+        if "geography" in categories:
+            computed["geography"] = self._score_geography_batch(
+                jobs, features, preferences.get("preferred_city", "")
+            )
+        if "penalties" in categories:
+            computed["penalties"] = self._calculate_penalties_batch(
+                jobs, features, preferences.get("trusted_sources") or {}
+            )
+        
+        # Text categories, with preferences resolved once for the whole batch
+        if "role" in categories:
+            target_seniority = preferences.get("target_seniority")
+            computed["role"] = [
+                self._role_result(f["seniority_level"], target_seniority)
+                for f in features
+            ]
+        
+        if "skills" in categories:
+            all_user_skills = list(set(
+                (preferences.get("cv_skills") or []) + 
+                (preferences.get("priority_skills") or [])
+            ))
+            user_skills_lower = [s.lower().strip() for s in all_user_skills]
+            if user_skills_lower:
+                skills_matcher = get_keyword_matcher(user_skills_lower)
+                computed["skills"] = [
+                    self._match_skills(
+                        set(f["skills"]),
+                        job.get("description", ""),
+                        set(f["description_tokens"]),
+                        user_skills_lower,
+                        skills_matcher
+                    )
+                    for job, f in zip(jobs, features)
+                ]
+            else:
+                computed["skills"] = [self._no_skills_result() for _ in jobs]
+        
+        if "attractiveness" in categories:
+            keyword_tiers = self._prepare_attractiveness_keywords(
+                preferences.get("attractiveness_keywords") or self.DEFAULT_ATTRACTIVENESS_KEYWORDS
+            )
+            computed["attractiveness"] = [
+                self._match_attractiveness(
+                    job.get("description", ""),
+                    job.get("company", {}),
+                    keyword_tiers,
+                    set(f["description_tokens"])
+                )
+                for job, f in zip(jobs, features)
+            ]
+        
+        return computed
+    
     def score_role_seniority(
         self,
         job_title: str,
@@ -203,23 +440,23 @@ class ScoringServiceV2:
         
         Detection order: Head/VP → Senior → PM → Junior
         """
-        title_lower = job_title.lower()
-        
-        detected_level = None
+        # Highest-priority level in one scan (Head → Senior → PM → Junior)
+        detected_level = self.SENIORITY_MATCHER.match(job_title.lower())
+        return self._role_result(detected_level, target_seniority)
+    
+    def _role_result(
+        self,
+        detected_level: Optional[str],
+        target_seniority: Optional[str]
+    ) -> Dict[str, Any]:
+        """Role result for an already-detected seniority level."""
         detected_points = 0
         detected_label = "Unknown"
         
-        # Check patterns in order of seniority (highest first)
-        for level in ["head", "senior", "mid", "junior"]:
-            config = self.SENIORITY_PATTERNS[level]
-            for pattern in config["patterns"]:
-                if re.search(pattern, title_lower):
-                    detected_level = level
-                    detected_points = config["points"]
-                    detected_label = config["label"]
-                    break
-            if detected_level:
-                break
+        if detected_level:
+            config = self.SENIORITY_PATTERNS[detected_level]
+            detected_points = config["points"]
+            detected_label = config["label"]
         
         # If no match, give base points
         if not detected_level:
@@ -256,18 +493,7 @@ class ScoringServiceV2:
         remote_lower = (remote_type or "").lower()
         city_lower = (preferred_city or "").lower()
         
-        # Check for full remote
-        is_remote = (
-            "remote" in remote_lower or
-            "remote" in location_lower or
-            "télétravail" in location_lower or
-            "full remote" in location_lower
-        )
-        
-        is_hybrid = (
-            "hybrid" in remote_lower or
-            "hybride" in location_lower
-        )
+        is_remote, is_hybrid = self.remote_flags(location_lower, remote_lower)
         
         if is_remote and not is_hybrid:
             return {
@@ -304,6 +530,24 @@ class ScoringServiceV2:
             "details": f"Office - {job_location or 'Unknown'}"
         }
     
+    @staticmethod
+    def remote_flags(location_lower: str, remote_lower: str) -> Tuple[bool, bool]:
+        """(is_remote, is_hybrid) from a lowercase location and remote type."""
+        # Check for full remote
+        is_remote = (
+            "remote" in remote_lower or
+            "remote" in location_lower or
+            "télétravail" in location_lower or
+            "full remote" in location_lower
+        )
+        
+        is_hybrid = (
+            "hybrid" in remote_lower or
+            "hybride" in location_lower
+        )
+        
+        return is_remote, is_hybrid
+    
     def score_salary(
         self,
         salary_min: Optional[int],
@@ -377,25 +621,44 @@ class ScoringServiceV2:
         - 10+ skills matched → 20 pts
         """
         if not user_skills:
-            return {
-                "points": 10,  # Default
-                "max": self.MAX_SKILLS_POINTS,
-                "matched": 0,
-                "matched_skills": [],
-                "details": "No skills configured"
-            }
+            return self._no_skills_result()
         
-        # Normalize for comparison
-        job_skills_lower = set(s.lower().strip() for s in job_skills)
-        desc_lower = (job_description or "").lower()
         user_skills_lower = [s.lower().strip() for s in user_skills]
+        return self._match_skills(
+            set(s.lower().strip() for s in job_skills),
+            job_description,
+            None,
+            user_skills_lower,
+            get_keyword_matcher(user_skills_lower)
+        )
+    
+    def _no_skills_result(self) -> Dict[str, Any]:
+        """Skills result when the user has not configured any skills."""
+        return {
+            "points": 10,  # Default
+            "max": self.MAX_SKILLS_POINTS,
+            "matched": 0,
+            "matched_skills": [],
+            "details": "No skills configured"
+        }
+    
+    def _match_skills(
+        self,
+        job_skills_lower: Set[str],
+        job_description: str,
+        description_tokens: Optional[Set[str]],
+        user_skills_lower: List[str],
+        skills_matcher: KeywordMatcher
+    ) -> Dict[str, Any]:
+        """Match already-normalized user skills against one job's normalized skills."""
+        desc_matches = skills_matcher.find_all(job_description, description_tokens)
         
-        # Find matches
+        # Find matches (whole words only, "go" must not match "google")
         matched = []
         for skill in user_skills_lower:
             if skill in job_skills_lower:
                 matched.append(skill)
-            elif skill in desc_lower:
+            elif skill in desc_matches:
                 matched.append(skill)
         
         matched = list(set(matched))  # Dedupe
@@ -444,6 +707,49 @@ class ScoringServiceV2:
         - Fast-growing startup → 6 pts
         - Mission-driven/AI company → 10 pts
         """
+        return self._match_attractiveness(
+            job_description,
+            company_info,
+            self._prepare_attractiveness_keywords(keywords)
+        )
+    
+    def _prepare_attractiveness_keywords(
+        self,
+        keywords: Dict[str, List[str]]
+    ) -> Dict[str, Any]:
+        """
+        Resolve keyword tiers to (keyword, normalized) pairs plus one matcher
+        covering every tier.
+        
+        The user's custom keywords count as high-value: they name what the
+        user is specifically looking for.
+        """
+        tiers = {
+            tier: [
+                (kw, normalize_keyword(kw))
+                for kw in keywords.get(tier, self.DEFAULT_ATTRACTIVENESS_KEYWORDS[tier])
+                if kw and kw.strip()
+            ]
+            for tier in ("high", "medium")
+        }
+        tiers["high"] += [
+            (kw, normalize_keyword(kw))
+            for kw in keywords.get("custom") or []
+            if kw and kw.strip()
+        ]
+        tiers["matcher"] = get_keyword_matcher(
+            kw_lower for tier in ("high", "medium") for _, kw_lower in tiers[tier]
+        )
+        return tiers
+    
+    def _match_attractiveness(
+        self,
+        job_description: str,
+        company_info: Dict[str, Any],
+        keyword_tiers: Dict[str, Any],
+        description_tokens: Optional[Set[str]] = None
+    ) -> Dict[str, Any]:
+        """Match prepared keyword tiers against one job."""
         desc_lower = (job_description or "").lower()
         
         # Also check company info if available
@@ -455,10 +761,13 @@ class ScoringServiceV2:
             ).lower()
         
         all_text = desc_lower + " " + company_desc
+        tokens = None
+        if description_tokens is not None:
+            tokens = description_tokens | tokenize(company_desc)
+        found = keyword_tiers["matcher"].find_all(all_text, tokens)
         
         # Check high-value keywords (10 pts)
-        high_keywords = keywords.get("high", self.DEFAULT_ATTRACTIVENESS_KEYWORDS["high"])
-        high_matches = [kw for kw in high_keywords if kw.lower() in all_text]
+        high_matches = [kw for kw, kw_lower in keyword_tiers["high"] if kw_lower in found]
         
         if high_matches:
             return {
@@ -470,8 +779,7 @@ class ScoringServiceV2:
             }
         
         # Check medium-value keywords (6 pts)
-        medium_keywords = keywords.get("medium", self.DEFAULT_ATTRACTIVENESS_KEYWORDS["medium"])
-        medium_matches = [kw for kw in medium_keywords if kw.lower() in all_text]
+        medium_matches = [kw for kw, kw_lower in keyword_tiers["medium"] if kw_lower in found]
         
         if medium_matches:
             return {
@@ -536,6 +844,173 @@ class ScoringServiceV2:
             "details": ", ".join(reasons) if reasons else "No penalties"
         }
 
+    # ------------------------------------------------------------------
+    # Columnar helpers for score_batch()
+    # ------------------------------------------------------------------
+    
+    def _score_salary_batch(
+        self,
+        jobs: List[Dict[str, Any]],
+        user_min_salary: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """Vectorized score_salary() over a list of jobs."""
+        job_salaries = [
+            job.get("salary_max") or job.get("salary_min") or 0
+            for job in jobs
+        ]
+        salary = np.array(job_salaries, dtype=float)
+        
+        raw_points = np.select(
+            [salary >= 80000, salary >= 60000, salary >= 50000],
+            [
+                np.full_like(salary, 15),
+                10 + (salary - 60000) / 20000 * 5,
+                5 + (salary - 50000) / 10000 * 5,
+            ],
+            default=np.maximum(0, salary / 50000 * 5)
+        )
+        # Python's round() (not np.round) so rounding matches score_salary()
+        points = [round(p, 1) for p in raw_points.tolist()]
+        
+        results = []
+        for i, job in enumerate(jobs):
+            if not job_salaries[i]:
+                points[i] = 7
+                results.append({
+                    "points": 7,  # Middle ground
+                    "max": self.MAX_SALARY_POINTS,
+                    "salary": None,
+                    "details": "Salary not disclosed"
+                })
+                continue
+            
+            salary_min = job.get("salary_min")
+            salary_max = job.get("salary_max")
+            job_salary = job_salaries[i]
+            
+            salary_display = f"€{job_salary // 1000}k"
+            if salary_min and salary_max and salary_min != salary_max:
+                salary_display = f"€{salary_min // 1000}k - €{salary_max // 1000}k"
+            
+            details = salary_display
+            if user_min_salary:
+                if job_salary >= user_min_salary:
+                    details += " ✓"
+                else:
+                    details += f" (below €{user_min_salary // 1000}k target)"
+            
+            results.append({
+                "points": points[i],
+                "max": self.MAX_SALARY_POINTS,
+                "salary": job_salary,
+                "details": details
+            })
+        
+        return results
+    
+    def _score_geography_batch(
+        self,
+        jobs: List[Dict[str, Any]],
+        features: List[Dict[str, Any]],
+        preferred_city: str
+    ) -> List[Dict[str, Any]]:
+        """Vectorized score_geography() over a list of jobs."""
+        city_lower = (preferred_city or "").lower()
+        
+        locations = [job.get("location", "") for job in jobs]
+        
+        is_remote = np.array([f["is_remote"] for f in features], dtype=bool)
+        is_hybrid = np.array([f["is_hybrid"] for f in features], dtype=bool)
+        in_city = np.array([
+            bool(city_lower) and city_lower in f["location"]
+            for f in features
+        ], dtype=bool)
+        
+        # Same precedence as score_geography()
+        conditions = [
+            is_remote & ~is_hybrid,
+            in_city & ~is_hybrid,
+            in_city & is_hybrid,
+            is_hybrid,
+        ]
+        points = np.select(conditions, [25, 20, 22, 15], default=10)
+        kinds = np.select(conditions, [0, 1, 2, 3], default=4)
+        
+        results = []
+        for i, (kind, geo_points) in enumerate(zip(kinds.tolist(), points.tolist())):
+            if kind == 0:
+                geo_type, details = "remote", "Full remote 🏠"
+            elif kind == 1:
+                geo_type, details = "local", f"In {preferred_city}"
+            elif kind == 2:
+                geo_type, details = "hybrid_local", f"In {preferred_city} (hybrid)"
+            elif kind == 3:
+                geo_type, details = "hybrid_distant", f"Hybrid - {locations[i] or 'Unknown'}"
+            else:
+                geo_type, details = "onsite_distant", f"Office - {locations[i] or 'Unknown'}"
+            
+            results.append({
+                "points": geo_points,
+                "max": self.MAX_GEO_POINTS,
+                "type": geo_type,
+                "details": details
+            })
+        
+        return results
+    
+    def _calculate_penalties_batch(
+        self,
+        jobs: List[Dict[str, Any]],
+        features: List[Dict[str, Any]],
+        trusted_sources: Dict[str, bool]
+    ) -> List[Dict[str, Any]]:
+        """Vectorized calculate_penalties() over a list of jobs."""
+        sources = [(job.get("source") or "").lower() for job in jobs]
+        
+        no_date = np.array([
+            not (job.get("posted_at") or job.get("posted_date"))
+            for job in jobs
+        ], dtype=bool)
+        short_description = np.array([
+            f["description_length_bucket"] == "short"
+            for f in features
+        ], dtype=bool)
+        untrusted = np.array([
+            bool(source and trusted_sources) and
+            source in trusted_sources and not trusted_sources[source]
+            for source in sources
+        ], dtype=bool)
+        
+        penalties = np.maximum(
+            -10,
+            -5 * no_date.astype(int) - 3 * short_description.astype(int) - 2 * untrusted.astype(int)
+        )
+        
+        results = []
+        for source, penalty, missing_date, short, untrusted_source in zip(
+            sources,
+            penalties.tolist(),
+            no_date.tolist(),
+            short_description.tolist(),
+            untrusted.tolist()
+        ):
+            reasons = []
+            if missing_date:
+                reasons.append("No posting date (-5)")
+            if short:
+                reasons.append("Short description (-3)")
+            if untrusted_source:
+                reasons.append(f"Untrusted source: {source} (-2)")
+            
+            results.append({
+                "points": penalty,
+                "max": self.MAX_PENALTY_POINTS,
+                "reasons": reasons,
+                "details": ", ".join(reasons) if reasons else "No penalties"
+            })
+        
+        return results
+
 
 # Singleton instance
 scoring_service_v2 = ScoringServiceV2()
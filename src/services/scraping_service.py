@@ -4,14 +4,27 @@ Centralized scraping service with fallback mechanism.
 Uses Firecrawl and BrightData APIs for reliable web scraping,
 with httpx as fallback.
 """
-from typing import Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+import asyncio
 import httpx
 import os
 import logging
+import time
 from enum import Enum
 
+from .page_cache import PageCache, normalize_url
+from .provider_health import HedgeBudget, ProviderHealth
+from .rate_limiter import Priority, get_rate_limiter, provider_key, url_domain_key
+from .single_flight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401 (HTTP/2 support for httpx, from httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 class ScrapingMethod(str, Enum):
     """Scraping methods available."""
@@ -21,8 +34,28 @@ class ScrapingMethod(str, Enum):
     HTTPX = "httpx"
 
 
+# Providers billed per call
+PAID_METHODS = (ScrapingMethod.PARALLEL, ScrapingMethod.FIRECRAWL, ScrapingMethod.BRIGHTDATA)
+
+# Request timeout (seconds) per provider
+PROVIDER_TIMEOUTS = {
+    ScrapingMethod.PARALLEL: 30.0,
+    ScrapingMethod.FIRECRAWL: 10.0,
+    ScrapingMethod.BRIGHTDATA: 60.0,
+    ScrapingMethod.HTTPX: 30.0,
+}
+
+
 class ScrapingService:
-    """Service for fetching web pages with multiple fallback strategies."""
+    """
+    Service for fetching web pages with multiple fallback strategies.
+    
+    Each provider gets one long-lived httpx.AsyncClient (HTTP/2 when h2 is
+    installed, keep-alive, bounded pool), so repeated requests reuse open
+    connections instead of paying a TCP+TLS handshake each time. The app
+    opens the clients at startup (start) and closes them at shutdown
+    (aclose); used outside the app, they are opened on first use.
+    """
     
     def __init__(self):
         self.parallel_api_key = os.getenv("PARALLEL_API_KEY")
@@ -34,56 +67,244 @@ class ScrapingService:
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
         }
+        
+        # Connection pool settings, shared by all provider clients
+        self.limits = httpx.Limits(
+            max_connections=int(os.getenv("SCRAPING_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("SCRAPING_MAX_KEEPALIVE_CONNECTIONS", "10")),
+            keepalive_expiry=float(os.getenv("SCRAPING_KEEPALIVE_EXPIRY", "30")),
+        )
+        self.http2 = HTTP2_AVAILABLE and os.getenv("SCRAPING_HTTP2", "true").lower() != "false"
+        self._clients: Dict[ScrapingMethod, httpx.AsyncClient] = {}
+        
+        # Fetch implementation per method, in default order
+        self._fetchers: Dict[ScrapingMethod, Callable[[str], Awaitable[Optional[str]]]] = {
+            ScrapingMethod.PARALLEL: self._fetch_with_parallel,
+            ScrapingMethod.FIRECRAWL: self._fetch_with_firecrawl,
+            ScrapingMethod.BRIGHTDATA: self._fetch_with_brightdata,
+            ScrapingMethod.HTTPX: self._fetch_with_httpx,
+        }
+        self.health = ProviderHealth()
+        self.hedge_budget = HedgeBudget()
+        
+        # Fetched pages (None when SCRAPING_CACHE=false), the background
+        # refreshes of stale entries and the provider calls in flight
+        self.page_cache = PageCache.from_env()
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        self._single_flight = SingleFlight()
+        self.rate_limiter = get_rate_limiter()
+    
+    def _client(self, method: ScrapingMethod) -> httpx.AsyncClient:
+        """Get the shared client of a provider, creating it on first use."""
+        client = self._clients.get(method)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=PROVIDER_TIMEOUTS[method],
+                limits=self.limits,
+                http2=self.http2,
+            )
+            self._clients[method] = client
+        return client
+    
+    async def start(self) -> None:
+        """Open the provider clients (called from the app lifespan)."""
+        if not self.http2:
+            logger.info("HTTP/2 unavailable (install httpx[http2]), scraping over HTTP/1.1 keep-alive")
+        for method in ScrapingMethod:
+            self._client(method)
+    
+    async def aclose(self) -> None:
+        """Close the provider clients and their pooled connections."""
+        for task in self._refresh_tasks:
+            task.cancel()
+        await asyncio.gather(*self._refresh_tasks, return_exceptions=True)
+        if self.page_cache:
+            self.page_cache.close()
+        
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
     
-    async def fetch_page(self, url: str) -> Optional[str]:
+    async def fetch_page(
+        self,
+        url: str,
+        hedged: bool = False,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> Optional[str]:
         """
         Fetch a page with fallback strategy.
         
-        Tries methods in order:
+        Pages are first looked up in the page cache (by normalized URL, for
+        each configured method). A fresh entry is returned as is; a stale one
+        is returned too, while a background fetch refreshes it.
+        
+        Tries the configured methods, by default in this order:
         1. Parallel Search (fast, AI-powered extraction)
         2. Firecrawl (fast, bypass anti-bot)
         3. BrightData (slower but powerful with proxies)
         4. httpx (simple fallback)
         
+        Once enough attempts are recorded for the target domain, the order
+        follows each method's recent cost there (p95 latency / success
+        rate), and methods that failed repeatedly are skipped until their
+        circuit breaker cooldown passes (see provider_health.py).
+        
+        In hedged mode, when the running method has not answered within its
+        recent p90 latency, the next one is started alongside it; the first
+        HTML wins and the other call is cancelled. Hedges to paid providers
+        are limited by a budget (HedgeBudget), so they are not double-billed
+        on every call.
+        
         Args:
             url: Target URL to scrape
-            
+            hedged: Trade extra provider calls for lower tail latency
+                    (live searches)
+            priority: Rate limiter class; BACKGROUND work waits behind
+                      interactive calls for provider and domain quotas
+        
         Returns:
             HTML content or None if all methods fail
         """
-        # Try Parallel Search first (AI-powered, agentic mode)
-        if self.parallel_api_key:
-            html = await self._fetch_with_parallel(url)
-            if html:
-                logger.info(f"Successfully scraped {url} with Parallel Search")
-                return html
-            logger.warning(f"Parallel Search failed for {url}, trying Firecrawl")
+        methods = [method for method in ScrapingMethod if self._is_configured(method)]
+        
+        if self.page_cache:
+            cached = await self.page_cache.aget(url, [method.value for method in methods])
+            if cached:
+                if not self.page_cache.is_fresh(cached):
+                    self._refresh_in_background(url)
+                logger.info(f"Served {url} from cache ({cached.provider})")
+                return cached.content
         
-        # Try Firecrawl (fastest, most reliable)
-        if self.firecrawl_api_key:
-            html = await self._fetch_with_firecrawl(url)
-            if html:
-                logger.info(f"Successfully scraped {url} with Firecrawl")
-                return html
-            logger.warning(f"Firecrawl failed for {url}, trying BrightData")
+        # Concurrent fetches of the same page share one provider call
+        return await self._single_flight.do(
+            normalize_url(url), lambda: self._fetch_uncached(url, methods, hedged, priority)
+        )
+    
+    def _refresh_in_background(self, url: str) -> None:
+        """Refetch a stale page once, without waiting for it."""
+        key = normalize_url(url)
+        if self._single_flight.in_flight(key):
+            return
+        
+        methods = [method for method in ScrapingMethod if self._is_configured(method)]
+        task = asyncio.create_task(self._single_flight.do(
+            key, lambda: self._fetch_uncached(url, methods, False, Priority.BACKGROUND)
+        ))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+    
+    async def _fetch_uncached(
+        self,
+        url: str,
+        methods: List[ScrapingMethod],
+        hedged: bool,
+        priority: Priority
+    ) -> Optional[str]:
+        """Fetch from the providers (see fetch_page); successes are cached."""
+        ordered = self.health.order([method.value for method in methods], url)
+        if len(ordered) < len(methods):
+            skipped = [method.value for method in methods if method.value not in ordered]
+            logger.info(f"Circuit open for {', '.join(skipped)} on {url}, skipping")
         
-        # Try BrightData (powerful but slower)
-        if self.brightdata_api_key:
-            html = await self._fetch_with_brightdata(url)
-            if html:
-                logger.info(f"Successfully scraped {url} with BrightData")
-                return html
-            logger.warning(f"BrightData failed for {url}, trying httpx fallback")
+        self.hedge_budget.earn()
+        if hedged:
+            html = await self._fetch_hedged(url, ordered, priority)
+        else:
+            html = None
+            for name in ordered:
+                html = await self._attempt(name, url, priority)
+                if html:
+                    break
         
-        # Fallback to simple httpx
-        html = await self._fetch_with_httpx(url)
+        if html is None:
+            logger.error(f"All scraping methods failed for {url}")
+        return html
+    
+    async def _attempt(self, name: str, url: str, priority: Priority) -> Optional[str]:
+        """
+        Fetch with one method, recording its outcome and latency.
+        
+        The call takes a rate limiter slot first: on the provider's quota for
+        paid providers, on the target domain's quota for direct fetches.
+        """
+        method = ScrapingMethod(name)
+        key = provider_key(name) if method in PAID_METHODS else url_domain_key(url)
+        async with self.rate_limiter.slot(key, priority=priority):
+            # Another call may have taken a half-open provider's trial
+            if not self.health.begin(name, url):
+                logger.info(f"Circuit open for {name} on {url}, skipping")
+                return None
+            started = time.monotonic()
+            html = await self._fetchers[method](url)
+            self.health.record(name, url, bool(html), time.monotonic() - started)
         if html:
-            logger.info(f"Successfully scraped {url} with httpx")
+            logger.info(f"Successfully scraped {url} with {name}")
+            if self.page_cache:
+                await self.page_cache.aset(url, name, html)
             return html
-        
-        logger.error(f"All scraping methods failed for {url}")
+        logger.warning(f"{name} failed for {url}")
         return None
     
+    async def _fetch_hedged(
+        self,
+        url: str,
+        ordered: List[str],
+        priority: Priority
+    ) -> Optional[str]:
+        """Run methods in order, starting the next early when one is slow."""
+        remaining = list(ordered)
+        running: Dict[asyncio.Task, str] = {}
+        
+        def start_next() -> None:
+            name = remaining.pop(0)
+            running[asyncio.create_task(self._attempt(name, url, priority))] = name
+        
+        try:
+            while remaining or running:
+                if not running:
+                    # Plain fallback after a failure, not a hedge
+                    start_next()
+                
+                # Only wait out the hedge delay if a hedge would be allowed
+                timeout = None
+                if remaining and (
+                    ScrapingMethod(remaining[0]) not in PAID_METHODS
+                    or self.hedge_budget.tokens >= 1
+                ):
+                    latest = list(running.values())[-1]
+                    timeout = self.health.hedge_delay(latest, url)
+                
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    if ScrapingMethod(remaining[0]) not in PAID_METHODS or self.hedge_budget.try_spend():
+                        logger.info(f"{list(running.values())[-1]} slow for {url}, hedging with {remaining[0]}")
+                        start_next()
+                    continue
+                
+                for task in done:
+                    del running[task]
+                    html = task.result()
+                    if html:
+                        return html
+            return None
+        finally:
+            # The losing call(s) are cancelled (and not recorded as failures)
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+    
+    def _is_configured(self, method: ScrapingMethod) -> bool:
+        """Whether a method can be used (paid providers need an API key)."""
+        if method == ScrapingMethod.PARALLEL:
+            return bool(self.parallel_api_key)
+        if method == ScrapingMethod.FIRECRAWL:
+            return bool(self.firecrawl_api_key)
+        if method == ScrapingMethod.BRIGHTDATA:
+            return bool(self.brightdata_api_key)
+        return True
+    
     async def _fetch_with_firecrawl(self, url: str) -> Optional[str]:
         """
         Fetch page using Firecrawl API.
@@ -93,42 +314,42 @@ class ScrapingService:
         Docs: https://docs.firecrawl.dev/
         """
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    "https://api.firecrawl.dev/v1/scrape",
-                    headers={
-                        "Authorization": f"Bearer {self.firecrawl_api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "url": url,
-                        "formats": ["html"],
-                    }
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    # Firecrawl V1 API returns data in nested structure
-                    if data.get("success"):
-                        actual_data = data.get("data", {})
-                        html = actual_data.get("html", "")
-                        if html:
-                            return html
-                        else:
-                            logger.warning(f"Firecrawl returned success but no HTML for {url}")
-                            return None
+            client = self._client(ScrapingMethod.FIRECRAWL)
+            response = await client.post(
+                "https://api.firecrawl.dev/v1/scrape",
+                headers={
+                    "Authorization": f"Bearer {self.firecrawl_api_key}",
+                    "Content-Type": "application/json",
+                },
+                json={
+                    "url": url,
+                    "formats": ["html"],
+                }
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                # Firecrawl V1 API returns data in nested structure
+                if data.get("success"):
+                    actual_data = data.get("data", {})
+                    html = actual_data.get("html", "")
+                    if html:
+                        return html
                     else:
-                        logger.warning(f"Firecrawl returned success=false for {url}. Response: {data}")
+                        logger.warning(f"Firecrawl returned success but no HTML for {url}")
                         return None
                 else:
-                    logger.warning(f"Firecrawl returned status {response.status_code} for {url}")
-                    try:
-                        error_data = response.json()
-                        logger.warning(f"Firecrawl error details: {error_data}")
-                    except:
-                        logger.warning(f"Firecrawl response text: {response.text[:500]}")
+                    logger.warning(f"Firecrawl returned success=false for {url}. Response: {data}")
                     return None
-                    
+            else:
+                logger.warning(f"Firecrawl returned status {response.status_code} for {url}")
+                try:
+                    error_data = response.json()
+                    logger.warning(f"Firecrawl error details: {error_data}")
+                except:
+                    logger.warning(f"Firecrawl response text: {response.text[:500]}")
+                return None
+        
         except Exception as e:
             logger.warning(f"Firecrawl error for {url}: {type(e).__name__}: {e}")
             return None
@@ -147,58 +368,58 @@ class ScrapingService:
         Docs: https://docs.parallel.ai/integrations/mcp/search-mcp
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Use MCP JSON-RPC protocol to call web_fetch tool
-                response = await client.post(
-                    "https://search-mcp.parallel.ai/mcp",
-                    headers={
-                        "Authorization": f"Bearer {self.parallel_api_key}",
-                        "Content-Type": "application/json",
-                        "Accept": "application/json, text/event-stream",
-                    },
-                    json={
-                        "jsonrpc": "2.0",
-                        "id": 1,
-                        "method": "tools/call",
-                        "params": {
-                            "name": "web_fetch",
-                            "arguments": {
-                                "urls": [url],  # web_fetch expects array of URLs
-                            }
+            client = self._client(ScrapingMethod.PARALLEL)
+            # Use MCP JSON-RPC protocol to call web_fetch tool
+            response = await client.post(
+                "https://search-mcp.parallel.ai/mcp",
+                headers={
+                    "Authorization": f"Bearer {self.parallel_api_key}",
+                    "Content-Type": "application/json",
+                    "Accept": "application/json, text/event-stream",
+                },
+                json={
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "tools/call",
+                    "params": {
+                        "name": "web_fetch",
+                        "arguments": {
+                            "urls": [url],  # web_fetch expects array of URLs
                         }
                     }
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    # MCP returns result in JSON-RPC format
-                    if "result" in data:
-                        result = data["result"]
-                        # Extract content from MCP tool result
-                        if isinstance(result, dict):
-                            content = result.get("content") or result.get("html") or result.get("text")
-                            if isinstance(content, list) and len(content) > 0:
-                                # MCP often returns array of content blocks
-                                content = content[0].get("text") if isinstance(content[0], dict) else str(content[0])
-                            if content:
-                                return str(content)
-                        logger.warning(f"Parallel Search MCP returned result but no content for {url}. Result: {result}")
-                        return None
-                    elif "error" in data:
-                        logger.warning(f"Parallel Search MCP returned error for {url}: {data['error']}")
-                        return None
-                    else:
-                        logger.warning(f"Parallel Search MCP unexpected response format for {url}. Response: {data}")
-                        return None
+                }
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                # MCP returns result in JSON-RPC format
+                if "result" in data:
+                    result = data["result"]
+                    # Extract content from MCP tool result
+                    if isinstance(result, dict):
+                        content = result.get("content") or result.get("html") or result.get("text")
+                        if isinstance(content, list) and len(content) > 0:
+                            # MCP often returns array of content blocks
+                            content = content[0].get("text") if isinstance(content[0], dict) else str(content[0])
+                        if content:
+                            return str(content)
+                    logger.warning(f"Parallel Search MCP returned result but no content for {url}. Result: {result}")
+                    return None
+                elif "error" in data:
+                    logger.warning(f"Parallel Search MCP returned error for {url}: {data['error']}")
+                    return None
                 else:
-                    logger.warning(f"Parallel Search MCP returned status {response.status_code} for {url}")
-                    try:
-                        error_data = response.json()
-                        logger.warning(f"Parallel Search MCP error: {error_data}")
-                    except:
-                        logger.warning(f"Parallel Search MCP response: {response.text[:500]}")
+                    logger.warning(f"Parallel Search MCP unexpected response format for {url}. Response: {data}")
                     return None
-                    
+            else:
+                logger.warning(f"Parallel Search MCP returned status {response.status_code} for {url}")
+                try:
+                    error_data = response.json()
+                    logger.warning(f"Parallel Search MCP error: {error_data}")
+                except:
+                    logger.warning(f"Parallel Search MCP response: {response.text[:500]}")
+                return None
+        
         except Exception as e:
             logger.warning(f"Parallel Search MCP error for {url}: {type(e).__name__}: {e}")
             return None
@@ -216,41 +437,41 @@ class ScrapingService:
         Using MCP SSE endpoint: https://mcp.brightdata.com/sse
         """
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                # BrightData MCP uses POST with URL and token
-                response = await client.post(
-                    self.brightdata_mcp_url,
-                    params={
-                        "token": self.brightdata_api_key,
-                    },
-                    json={
-                        "method": "scrape_as_markdown",
-                        "params": {
-                            "url": url,
-                        }
-                    },
-                    headers={
-                        "Content-Type": "application/json",
-                        "Accept": "application/json",
+            client = self._client(ScrapingMethod.BRIGHTDATA)
+            # BrightData MCP uses POST with URL and token
+            response = await client.post(
+                self.brightdata_mcp_url,
+                params={
+                    "token": self.brightdata_api_key,
+                },
+                json={
+                    "method": "scrape_as_markdown",
+                    "params": {
+                        "url": url,
                     }
-                )
-                
-                if response.status_code == 200:
-                    # MCP returns JSON with result
-                    data = response.json()
-                    # Extract HTML/markdown from MCP response
-                    if isinstance(data, dict):
-                        html = data.get("content") or data.get("html") or data.get("result")
-                        if html:
-                            return html
-                    # If direct text response
-                    return response.text
-                else:
-                    logger.warning(f"BrightData MCP returned status {response.status_code} for {url}")
-                    if response.status_code != 401:
-                        logger.debug(f"BrightData response: {response.text[:200]}")
-                    return None
-                    
+                },
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept": "application/json",
+                }
+            )
+            
+            if response.status_code == 200:
+                # MCP returns JSON with result
+                data = response.json()
+                # Extract HTML/markdown from MCP response
+                if isinstance(data, dict):
+                    html = data.get("content") or data.get("html") or data.get("result")
+                    if html:
+                        return html
+                # If direct text response
+                return response.text
+            else:
+                logger.warning(f"BrightData MCP returned status {response.status_code} for {url}")
+                if response.status_code != 401:
+                    logger.debug(f"BrightData response: {response.text[:200]}")
+                return None
+        
         except Exception as e:
             logger.warning(f"BrightData MCP error for {url}: {type(e).__name__}: {e}")
             return None
@@ -263,15 +484,27 @@ class ScrapingService:
         May be blocked by anti-bot measures.
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    url, 
-                    headers=self.headers, 
-                    follow_redirects=True
-                )
-                response.raise_for_status()
-                return response.text
-                
+            client = self._client(ScrapingMethod.HTTPX)
+            response = await client.get(
+                url, 
+                headers=self.headers, 
+                follow_redirects=True
+            )
+            response.raise_for_status()
+            return response.text
+        
         except Exception as e:
             logger.warning(f"httpx error for {url}: {e}")
             return None
+
+
+# Singleton instance, shared by the scrapers
+_scraping_service: Optional[ScrapingService] = None
+
+
+def get_scraping_service() -> ScrapingService:
+    """Get or create the scraping service instance."""
+    global _scraping_service
+    if _scraping_service is None:
+        _scraping_service = ScrapingService()
+    return _scraping_service
@@ -0,0 +1,153 @@
+"""
+Index of job postings already ingested, for incremental crawls.
+
+Maps each posting's canonical URL, and (platform, external id) when the
+source has one, to its job id and a fingerprint of its listing metadata
+(what result pages show: title, company, location, remote type, salary).
+Searches use it to tell new postings from known ones without a query per
+posting, to stop paginating once result pages hold only known postings,
+and to refresh only the postings whose listing changed.
+
+The index lives in process memory and is synced from the jobs table
+incrementally (rows above the last id seen), so postings saved through
+other paths are picked up on the next sync. It is rebuilt every
+RELOAD_SECONDS to drop deleted jobs.
+
+The first sync in a process loads every stored job, and the index holds
+about 0.5 KB per job (roughly 50 MB for 100k jobs), so only incremental
+searches use it; plain saves check the batch's URLs in one query.
+"""
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models import Company, Job
+from .page_cache import normalize_url
+
+# Listing fields compared to detect changed postings
+LISTING_FIELDS = ("title", "company_name", "location", "remote_type", "salary_min", "salary_max")
+
+RELOAD_SECONDS = 3600.0
+SYNC_BATCH_SIZE = 1000
+
+
+def listing_fingerprint(job: Dict[str, Any]) -> str:
+    """Fingerprint of a posting's listing metadata."""
+    values = []
+    for field in LISTING_FIELDS:
+        value = job.get(field)
+        # Salaries compare as numbers (scraped ints vs stored floats)
+        values.append(float(value) if isinstance(value, (int, float)) else value)
+    return hashlib.sha1(json.dumps(values).encode("utf-8")).hexdigest()
+
+
+class SeenPosting(NamedTuple):
+    """An ingested posting."""
+    job_id: int
+    fingerprint: str
+
+
+class SeenIndex:
+    """
+    Seen postings by canonical URL and external id.
+    
+    Example:
+        index = get_seen_index()
+        index.sync(db)
+        new_jobs = [job for job in scraped if index.lookup(job) is None]
+    """
+    
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._by_url: Dict[str, SeenPosting] = {}
+        self._by_external: Dict[Tuple[str, str], SeenPosting] = {}
+        self._last_id = 0
+        self._loaded_at: Optional[float] = None
+        self._clock = clock
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._by_url)
+    
+    def sync(self, db: Session) -> int:
+        """
+        Load jobs saved since the last sync (all jobs on first use, or once
+        the index is older than RELOAD_SECONDS).
+        
+        Returns:
+            Number of jobs loaded
+        """
+        with self._lock:
+            now = self._clock()
+            if self._loaded_at is None or now - self._loaded_at >= RELOAD_SECONDS:
+                self._by_url.clear()
+                self._by_external.clear()
+                self._last_id = 0
+                self._loaded_at = now
+            
+            query = db.query(
+                Job.id,
+                Job.source_url,
+                Job.source_platform,
+                Job.external_id,
+                Job.title,
+                Company.name.label("company_name"),
+                Job.location,
+                Job.remote_type,
+                Job.salary_min,
+                Job.salary_max,
+            ).outerjoin(Company, Job.company_id == Company.id).filter(
+                Job.id > self._last_id
+            ).order_by(Job.id)
+            
+            loaded = 0
+            for row in query.yield_per(SYNC_BATCH_SIZE):
+                self._add(row.id, row._asdict())
+                self._last_id = row.id
+                loaded += 1
+            return loaded
+    
+    def lookup(self, job: Dict[str, Any]) -> Optional[SeenPosting]:
+        """The ingested posting a scraped job dict refers to, if any."""
+        external_id = job.get("external_id")
+        if external_id and job.get("source_platform"):
+            seen = self._by_external.get((job["source_platform"], str(external_id)))
+            if seen is not None:
+                return seen
+        
+        source_url = job.get("source_url")
+        if not source_url:
+            return None
+        return self._by_url.get(normalize_url(source_url))
+    
+    def is_unchanged(self, job: Dict[str, Any]) -> bool:
+        """Whether a scraped job was ingested and its listing did not change."""
+        seen = self.lookup(job)
+        return seen is not None and seen.fingerprint == listing_fingerprint(job)
+    
+    def add(self, job_id: int, job: Dict[str, Any]) -> None:
+        """Record a posting just saved or refreshed."""
+        with self._lock:
+            self._add(job_id, job)
+    
+    def _add(self, job_id: int, job: Dict[str, Any]) -> None:
+        seen = SeenPosting(job_id, listing_fingerprint(job))
+        if job.get("source_url"):
+            self._by_url[normalize_url(job["source_url"])] = seen
+        if job.get("external_id") and job.get("source_platform"):
+            self._by_external[(job["source_platform"], str(job["external_id"]))] = seen
+
+
+# Singleton instance, shared by the searches of the process
+_seen_index: Optional[SeenIndex] = None
+
+
+def get_seen_index() -> SeenIndex:
+    """Get or create the seen-posting index."""
+    global _seen_index
+    if _seen_index is None:
+        _seen_index = SeenIndex()
+    return _seen_index
@@ -0,0 +1,50 @@
+"""
+In-process request coalescing (single-flight).
+
+Concurrent callers asking for the same key share one in-flight call
+instead of each issuing their own, e.g. several users launching the same
+saved search, or scrapers hitting the same URL at the same time.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time; concurrent callers await it.
+    
+    The key is forgotten as soon as the call finishes, so this coalesces
+    bursts without caching anything. All callers get the same result
+    object (or exception) and must not mutate it.
+    
+    Example:
+        flight = SingleFlight()
+        html = await flight.do(url, lambda: fetch(url))
+    """
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Task"] = {}
+    
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a call for key is running."""
+        return key in self._calls
+    
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Return fn()'s result, joining the running call for key if any.
+        
+        The shared call is shielded: a caller being cancelled does not
+        cancel it for the others.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+    
+    def _forget(self, key: Hashable, task: "asyncio.Task") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
@@ -0,0 +1,182 @@
+"""
+Precompiled text matchers shared by the scoring services.
+"""
+import re
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+class PriorityPatternMatcher:
+    r"""
+    Match groups of regex patterns in one scan and return the best group.
+    
+    Groups are given in priority order (highest first). All patterns are
+    compiled into a single alternation with one named group per level,
+    wrapped in a lookahead so overlapping matches are still seen. The result
+    is the same as trying each group's patterns with re.search, in order,
+    and returning the first group that matches.
+    
+    Example:
+        matcher = PriorityPatternMatcher([
+            ("senior", [r"\bsenior\b", r"\blead\b"]),
+            ("junior", [r"\bjunior\b"]),
+        ], word_start=True)
+        matcher.match("junior lead developer")  # -> "senior"
+    """
+    
+    def __init__(
+        self,
+        groups: Sequence[Tuple[str, Sequence[str]]],
+        word_start: bool = False
+    ):
+        r"""
+        Args:
+            groups: (level, patterns) pairs in priority order. Level names
+                    must be valid Python identifiers.
+            word_start: Set when every pattern starts with \b, so the scan
+                        only tries the alternation at word boundaries.
+        """
+        self.levels: List[str] = [level for level, _ in groups]
+        self._priority = {level: i for i, level in enumerate(self.levels)}
+        
+        alternation = "|".join(
+            f"(?P<{level}>{'|'.join(f'(?:{p})' for p in patterns)})"
+            for level, patterns in groups
+        )
+        prefix = r"\b" if word_start else ""
+        self._regex = re.compile(f"{prefix}(?=(?:{alternation}))")
+    
+    def match(self, text: str) -> Optional[str]:
+        """Return the highest-priority level matching text, or None."""
+        best = None
+        best_priority = len(self.levels)
+        
+        for m in self._regex.finditer(text):
+            priority = self._priority[m.lastgroup]
+            if priority < best_priority:
+                best, best_priority = m.lastgroup, priority
+                if priority == 0:
+                    break
+        
+        return best
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same notion of a word character as the \\w regex class."""
+    return ch.isalnum() or ch == "_"
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Normalized form under which keywords are stored and reported."""
+    return keyword.lower().strip()
+
+
+WORD_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> Set[str]:
+    """
+    Unique lowercase word tokens of a text.
+    
+    A keyword made only of word characters occurs in a text, on word
+    boundaries, exactly when it is one of the text's tokens.
+    """
+    return set(WORD_TOKEN.findall(text.lower())) if text else set()
+
+
+class KeywordMatcher:
+    r"""
+    Find which keywords of a fixed set occur in a text, on word boundaries.
+    
+    A keyword edge made of a word character must not touch another word
+    character (like \b), so "ai" matches "ai-first" but not "maintain";
+    edges such as the "+" in "c++" are unconstrained. Matching is
+    case-insensitive and keywords are reported in normalized form.
+    
+    Each keyword is first located with a plain substring test and only the
+    hits are confirmed with the keyword's precompiled boundary pattern. On
+    CPython this beats walking an Aho-Corasick automaton or a single
+    trie-shaped regex, which both step through the text once per character.
+    
+    Build through get_keyword_matcher() so each keyword set is prepared once.
+    
+    Example:
+        matcher = get_keyword_matcher(["ai", "machine learning", "ml"])
+        matcher.find_all("We maintain ML models")  # -> {"ml"}
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: FrozenSet[str] = frozenset(
+            normalize_keyword(kw) for kw in keywords if kw and kw.strip()
+        )
+        # (keyword, boundary-checked pattern) pairs. The literal comes first
+        # and the start boundary is a lookbehind over it, so the regex engine
+        # can use its fast literal-prefix search.
+        self._patterns: List[Tuple[str, "re.Pattern[str]"]] = [
+            (kw, re.compile(
+                re.escape(kw)
+                + (rf"(?<!\w{re.escape(kw)})" if _is_word_char(kw[0]) else "")
+                + (r"(?!\w)" if _is_word_char(kw[-1]) else "")
+            ))
+            for kw in sorted(self.keywords)
+        ]
+        
+        # With a token set, single-word keywords are plain lookups and other
+        # keywords are only searched once all their words are known present
+        self._token_keywords: FrozenSet[str] = frozenset(
+            kw for kw in self.keywords if WORD_TOKEN.fullmatch(kw)
+        )
+        self._phrase_patterns: List[Tuple[str, "re.Pattern[str]", FrozenSet[str]]] = [
+            (kw, pattern, frozenset(WORD_TOKEN.findall(kw)))
+            for kw, pattern in self._patterns
+            if kw not in self._token_keywords
+        ]
+    
+    def find_all(self, text: str, tokens: Optional[Set[str]] = None) -> Set[str]:
+        """
+        Return the normalized keywords occurring in text.
+        
+        Args:
+            text: Text to search
+            tokens: tokenize(text), if already known (e.g. precomputed job
+                    features). Single-word keywords are then set lookups and
+                    the text is only searched for phrases whose words all
+                    appear in tokens.
+        """
+        if tokens is not None:
+            found = set(self._token_keywords & tokens)
+            patterns = [
+                (kw, pattern) for kw, pattern, words in self._phrase_patterns
+                if words <= tokens
+            ]
+        else:
+            found = set()
+            patterns = self._patterns
+        
+        if not text or not patterns:
+            return found
+        
+        text = text.lower()
+        found.update(
+            keyword
+            for keyword, pattern in patterns
+            if keyword in text and pattern.search(text)
+        )
+        return found
+
+
+@lru_cache(maxsize=256)
+def _build_matcher(keywords: FrozenSet[str]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def get_keyword_matcher(keywords: Iterable[str]) -> KeywordMatcher:
+    """
+    Get the matcher for a keyword set, building it on first use.
+    
+    Matchers are cached per normalized keyword set, so callers can pass the
+    same user preferences on every request without rebuilding.
+    """
+    return _build_matcher(frozenset(
+        normalize_keyword(kw) for kw in keywords if kw and kw.strip()
+    ))
@@ -7,8 +7,10 @@ job search, profile retrieval, and people search.
 import os
 import httpx
 from typing import Dict, List, Optional, Any
-import asyncio
-import random
+import json
+
+from .rate_limiter import get_rate_limiter, provider_key
+from .single_flight import SingleFlight
 
 
 class UnipileService:
@@ -24,6 +26,9 @@ class UnipileService:
             "accept": "application/json",
             "content-type": "application/json"
         }
+        
+        # Identical concurrent reads share one API call
+        self._single_flight = SingleFlight()
     
     def is_configured(self) -> bool:
         """Check if Unipile is properly configured."""
@@ -37,10 +42,42 @@ class UnipileService:
         json_data: Optional[Dict] = None,
         timeout: float = 30.0
     ) -> Optional[Dict]:
-        """Make an HTTP request to the Unipile API."""
+        """
+        Make an HTTP request to the Unipile API.
+        
+        Reads (GET, and POST searches) are coalesced: concurrent calls with
+        the same endpoint, params and payload share one request and its
+        result.
+        """
+        if method.upper() == "GET" or endpoint.endswith("/search"):
+            key = (
+                method.upper(),
+                endpoint,
+                json.dumps(params, sort_keys=True, default=str),
+                json.dumps(json_data, sort_keys=True, default=str),
+            )
+            return await self._single_flight.do(
+                key, lambda: self._send_request(method, endpoint, params, json_data, timeout)
+            )
+        return await self._send_request(method, endpoint, params, json_data, timeout)
+    
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict],
+        json_data: Optional[Dict],
+        timeout: float
+    ) -> Optional[Dict]:
+        """
+        Send one HTTP request to the Unipile API.
+        
+        Calls are paced by the shared rate limiter (provider:unipile quota).
+        """
         url = f"{self.dsn}{endpoint}"
         
-        async with httpx.AsyncClient(timeout=timeout) as client:
+        async with get_rate_limiter().slot(provider_key("unipile")), \
+                httpx.AsyncClient(timeout=timeout) as client:
             try:
                 if method.upper() == "GET":
                     response = await client.get(url, headers=self.headers, params=params)
@@ -110,9 +147,6 @@ class UnipileService:
         if experience_level and experience_level.lower() in exp_mapping:
             search_params["experience_level"] = [exp_mapping[experience_level.lower()]]
         
-        # Add small random delay to emulate human behavior
-        await asyncio.sleep(random.uniform(0.5, 1.5))
-        
         result = await self._make_request(
             "POST",
             "/api/v1/linkedin/search",
@@ -179,9 +213,6 @@ class UnipileService:
         if not self.is_configured():
             return None
         
-        # Add delay for rate limiting
-        await asyncio.sleep(random.uniform(1.0, 2.0))
-        
         # Unipile doesn't have a direct job details endpoint
         # Job details are typically included in search results
         # This is a placeholder for future enhancement
@@ -216,8 +247,6 @@ class UnipileService:
         if location:
             search_params["keywords"] = f"{keywords} {location}"
         
-        await asyncio.sleep(random.uniform(0.5, 1.5))
-        
         result = await self._make_request(
             "POST",
             "/api/v1/linkedin/search",
@@ -258,8 +287,6 @@ class UnipileService:
         if not self.is_configured():
             return None
         
-        await asyncio.sleep(random.uniform(0.5, 1.5))
-        
         result = await self._make_request(
             "GET",
             f"/api/v1/users/{identifier}",
@@ -93,3 +93,16 @@ def sample_application_data():
         "notes": "Looks promising",
         "next_action": "Apply online",
     }
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Register a user and return Authorization headers for it."""
+    response = client.post("/api/auth/register", json={
+        "email": "jane@example.com",
+        "password": "secret-password",
+        "first_name": "Jane",
+        "last_name": "Doe",
+    })
+    token = response.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
@@ -1,5 +1,9 @@
 import pytest
 
+from src.services import company_resolver
+from src.services.company_resolver import get_company_resolver
+from tests.conftest import TestingSessionLocal
+
 
 class TestCompaniesAPI:
     """Tests for the companies API endpoints."""
@@ -44,6 +48,30 @@ class TestCompaniesAPI:
         assert response.status_code == 200
         assert response.json()["rating"] == 4.8
     
+    def test_renamed_company_no_longer_resolves_old_name(self, client, sample_company_data, monkeypatch):
+        """Ingesting under a company's old name does not attach to the renamed one."""
+        monkeypatch.setattr(company_resolver, "_company_resolver", None)
+        company_id = client.post("/api/companies/", json=sample_company_data).json()["id"]
+        db = TestingSessionLocal()
+        assert get_company_resolver().resolve_one(db, sample_company_data["name"]) == company_id
+        
+        response = client.put(f"/api/companies/{company_id}", json={"name": "Globex"})
+        assert response.status_code == 200
+        
+        old_name_id = get_company_resolver().resolve_one(db, sample_company_data["name"])
+        db.commit()
+        db.close()
+        assert old_name_id not in (None, company_id)
+    
+    def test_create_duplicate_company(self, client, sample_company_data):
+        """Test creating a company whose normalized name already exists."""
+        client.post("/api/companies/", json=sample_company_data)
+        
+        duplicate = {**sample_company_data, "name": sample_company_data["name"].upper() + " SAS"}
+        response = client.post("/api/companies/", json=duplicate)
+        assert response.status_code == 400
+        assert "already exists" in response.json()["detail"]
+    
     def test_delete_company(self, client, sample_company_data):
         """Test deleting a company."""
         # Create company first
@@ -0,0 +1,357 @@
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+
+from src.models import Company, Job, ensure_company_schema, merge_duplicate_companies, normalize_company_name
+from src.scrapers.parsing import shutdown_parse_executor
+from src.services.company_resolver import CompanyResolver
+from src.services.job_ingestion import JobIngestionService
+from src.services.job_search import JobSearchService
+from src.services.seen_index import RELOAD_SECONDS, SeenIndex, listing_fingerprint
+
+
+def scraped_job(job_id, **overrides):
+    """Job dict as the scrapers produce it."""
+    job = {
+        "title": f"Python Developer {job_id}",
+        "company_name": "Acme",
+        "location": "Paris",
+        "remote_type": "onsite",
+        "source_url": f"https://www.indeed.com/viewjob?jk={job_id}",
+        "source_platform": "indeed",
+        "salary_min": 50000,
+        "salary_max": 60000,
+        "salary_currency": "EUR",
+        "skills": [],
+        "benefits": [],
+    }
+    job.update(overrides)
+    return job
+
+
+def indeed_page(jobs) -> str:
+    """Indeed results page listing the given job dicts."""
+    cards = "".join(
+        f'<div class="job_seen_beacon"><h2 class="jobTitle">{job["title"]}</h2>'
+        f'<span data-testid="company-name">{job["company_name"]}</span>'
+        f'<div data-testid="text-location">{job["location"]}</div>'
+        f'<a href="/viewjob?jk={job["jk"]}">view</a></div>'
+        for job in jobs
+    )
+    return f"<html><body>{cards}</body></html>"
+
+
+@pytest.fixture
+def search_service(db_session, monkeypatch):
+    """Job search service with a fresh seen index, parsing in threads."""
+    monkeypatch.setenv("SCRAPING_PARSE_EXECUTOR", "thread")
+    shutdown_parse_executor()
+    service = JobSearchService(db_session)
+    service.seen_index = SeenIndex()
+    service.ingestion.company_resolver = CompanyResolver()
+    yield service
+    shutdown_parse_executor()
+
+
+class TestSeenIndex:
+    """Tests for the seen-posting index."""
+    
+    def test_fingerprint(self):
+        """Listing changes change the fingerprint; other fields do not."""
+        job = scraped_job(1)
+        
+        assert listing_fingerprint(job) == listing_fingerprint({**job, "description": "new"})
+        assert listing_fingerprint(job) == listing_fingerprint({**job, "salary_min": 50000.0})
+        assert listing_fingerprint(job) != listing_fingerprint({**job, "title": "Senior"})
+        assert listing_fingerprint(job) != listing_fingerprint({**job, "salary_max": 65000})
+    
+    def test_lookup_by_canonical_url_and_external_id(self):
+        """Tracking parameters are ignored; external ids match across URLs."""
+        index = SeenIndex()
+        index.add(1, scraped_job(1))
+        index.add(2, scraped_job(2, source_url=None, external_id="abc", source_platform="linkedin"))
+        
+        assert index.lookup(scraped_job(1, source_url="https://indeed.com/viewjob?jk=1&utm_source=x")).job_id == 1
+        assert index.lookup(scraped_job(9, external_id="abc", source_platform="linkedin")).job_id == 2
+        assert index.lookup(scraped_job(3)) is None
+        assert index.is_unchanged(scraped_job(1))
+        assert not index.is_unchanged(scraped_job(1, location="Lyon"))
+    
+    def test_sync_is_incremental(self, db_session):
+        """Sync loads jobs saved since the previous sync, all after RELOAD_SECONDS."""
+        now = [0.0]
+        index = SeenIndex(clock=lambda: now[0])
+        db_session.add(Job(title="A", source_url="https://example.com/a"))
+        db_session.commit()
+        
+        assert index.sync(db_session) == 1
+        assert index.sync(db_session) == 0
+        
+        db_session.add(Job(title="B", source_url="https://example.com/b"))
+        db_session.commit()
+        assert index.sync(db_session) == 1
+        
+        now[0] = RELOAD_SECONDS
+        assert index.sync(db_session) == 2
+        assert len(index) == 2
+
+
+class TestIncrementalSearch:
+    """Tests for incremental searches and saving."""
+    
+    def test_save_skips_known_jobs(self, search_service, db_session):
+        """Known postings are skipped without a query per job, batch duplicates too."""
+        first = search_service._save_jobs([scraped_job(1), scraped_job(2), scraped_job(2)])
+        second = search_service._save_jobs([scraped_job(1), scraped_job(3)])
+        
+        assert [job.source_url for job in first] == [scraped_job(1)["source_url"], scraped_job(2)["source_url"]]
+        assert [job.source_url for job in second] == [scraped_job(3)["source_url"]]
+        assert db_session.query(Job).count() == 3
+    
+    def test_save_refreshes_changed_listings(self, search_service, db_session):
+        """With refresh_changed, only postings whose listing changed are updated."""
+        search_service._save_jobs([scraped_job(1), scraped_job(2)])
+        
+        saved = search_service._save_jobs(
+            [scraped_job(1), scraped_job(2, title="Lead Python Developer", company_name="Globex")],
+            refresh_changed=True,
+        )
+        
+        assert [job.title for job in saved] == ["Lead Python Developer"]
+        job = db_session.query(Job).filter(Job.source_url == scraped_job(2)["source_url"]).one()
+        assert job.title == "Lead Python Developer"
+        assert job.company.name == "Globex"
+        assert search_service.seen_index.is_unchanged(
+            scraped_job(2, title="Lead Python Developer", company_name="Globex")
+        )
+    
+    def test_refresh_keeps_fields_missing_from_listing(self, search_service, db_session):
+        """A changed listing does not erase the fields or company it leaves out."""
+        search_service._save_jobs([scraped_job(1)])
+        
+        search_service._save_jobs(
+            [scraped_job(1, title="Lead Python Developer", company_name=None, location=None, salary_min=None)],
+            refresh_changed=True,
+        )
+        
+        job = db_session.query(Job).one()
+        assert job.title == "Lead Python Developer"
+        assert (job.location, job.salary_min, job.salary_max) == ("Paris", 50000, 60000)
+        assert job.company.name == "Acme"
+    
+    def test_plain_save_does_not_load_the_index(self, search_service, db_session):
+        """Only incremental saves sync the seen index."""
+        search_service._save_jobs([scraped_job(1)])
+        second = search_service._save_jobs([scraped_job(1), scraped_job(2)])
+        
+        assert [job.source_url for job in second] == [scraped_job(2)["source_url"]]
+        assert len(search_service.seen_index) == 0
+    
+    async def test_incremental_search(self, search_service, monkeypatch):
+        """A repeated search returns and fetches only what is new."""
+        pages = {
+            0: [{"title": "Job A", "company_name": "Acme", "location": "Paris", "jk": "a"}],
+            10: [{"title": "Job B", "company_name": "Acme", "location": "Paris", "jk": "b"}],
+        }
+        scraper = search_service.scrapers["indeed"]
+        
+        async def fetch_page(url):
+            start = int(url.split("&start=")[1]) if "&start=" in url else 0
+            return indeed_page(pages.get(start, []))
+        
+        monkeypatch.setattr(scraper, "fetch_page", fetch_page)
+        first = await search_service.search("python", platforms=["indeed"], incremental=True)
+        assert sorted(job.title for job in first["jobs"]) == ["Job A", "Job B"]
+        
+        # Nothing new: known postings are neither returned nor saved again
+        second = await search_service.search("python", platforms=["indeed"], incremental=True)
+        assert second["jobs"] == []
+        
+        # One listing changed and one posting appeared on the first page
+        pages[0] = [
+            {"title": "Job A (remote)", "company_name": "Acme", "location": "Remote", "jk": "a"},
+            {"title": "Job C", "company_name": "Acme", "location": "Paris", "jk": "c"},
+        ]
+        third = await search_service.search("python", platforms=["indeed"], incremental=True)
+        assert sorted(job.title for job in third["jobs"]) == ["Job A (remote)", "Job C"]
+
+
+class TestBulkIngestion:
+    """Tests for bulk job ingestion."""
+    
+    def test_save_takes_constant_round_trips(self, search_service, db_session):
+        """Saving 200 jobs issues a handful of statements, not one per job."""
+        jobs = [scraped_job(i, company_name=f"Company {i % 20}") for i in range(200)]
+        statements = []
+        
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            saved = search_service._save_jobs(jobs)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        
+        assert [job.title for job in saved] == [job["title"] for job in jobs]
+        assert sum(statement.startswith("INSERT INTO jobs") for statement in statements) == 1
+        assert sum(statement.startswith("INSERT INTO companies") for statement in statements) == 1
+        assert db_session.query(Company).count() == 20
+        assert all(job.company.name == f"Company {i % 20}" for i, job in enumerate(saved))
+        assert all(job.is_active and job.salary_currency == "EUR" for job in saved)
+    
+    def test_existing_companies_are_reused(self, db_session):
+        """Companies are matched by name and only missing ones are created."""
+        db_session.add(Company(name="Acme"))
+        db_session.commit()
+        
+        ingestion = JobIngestionService(db_session)
+        ingestion.company_resolver = CompanyResolver()
+        company_ids = ingestion.resolve_companies(
+            [scraped_job(1), scraped_job(2, company_name="Globex"), scraped_job(3, company_name=None)]
+        )
+        db_session.commit()
+        
+        assert set(company_ids) == {"Acme", "Globex"}
+        assert db_session.query(Company).count() == 2
+    
+    def test_insert_skips_stored_urls(self, db_session):
+        """URLs stored since the caller checked are skipped, not an error."""
+        db_session.add(Job(title="Existing", source_url=scraped_job(1)["source_url"]))
+        db_session.commit()
+        
+        inserted = JobIngestionService(db_session).insert_jobs([scraped_job(1), scraped_job(2)])
+        db_session.commit()
+        
+        assert list(inserted) == [("url", scraped_job(2)["source_url"])]
+        assert db_session.query(Job).count() == 2
+
+
+class TestCompanyResolver:
+    """Tests for company name normalization and resolution."""
+    
+    def test_normalize_company_name(self):
+        """Case, accents, punctuation and legal forms are dropped."""
+        assert normalize_company_name("Doctolib") == "doctolib"
+        assert normalize_company_name("  DOCTOLIB SAS ") == "doctolib"
+        assert normalize_company_name("Doctolib S.A.S.") == "doctolib"
+        assert normalize_company_name("Société Générale") == "societe generale"
+        assert normalize_company_name("AT&T Inc.") == "at and t"
+        assert normalize_company_name("SA") == "sa"
+        # Ambiguous short suffixes are kept
+        assert normalize_company_name("Acme Co") == "acme co"
+        assert normalize_company_name("Groupe SA") == "groupe sa"
+        assert normalize_company_name("!!!") == ""
+    
+    def test_variants_resolve_to_one_company(self, db_session):
+        """Spelling variants share a company, created from the first one."""
+        resolver = CompanyResolver()
+        company_ids = resolver.resolve(
+            db_session,
+            {"Doctolib": {"website": "https://doctolib.fr"}, "doctolib": {}, "Doctolib SAS": {}, "!!!": {}},
+        )
+        db_session.commit()
+        
+        assert set(company_ids) == {"Doctolib", "doctolib", "Doctolib SAS"}
+        assert len(set(company_ids.values())) == 1
+        company = db_session.query(Company).one()
+        assert (company.name, company.website) == ("Doctolib", "https://doctolib.fr")
+    
+    def test_cached_ids_skip_the_database(self, db_session):
+        """Committed ids are served from the cache; rolled back ones are not."""
+        resolver = CompanyResolver()
+        acme_id = resolver.resolve_one(db_session, "Acme")
+        db_session.commit()
+        resolver.resolve_one(db_session, "Globex")
+        db_session.rollback()
+        
+        statements = []
+        
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            assert resolver.resolve_one(db_session, "ACME") == acme_id
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        
+        assert statements == []
+        assert len(resolver) == 1
+        assert resolver.resolve_one(db_session, "Globex") is not None
+    
+    def test_company_created_elsewhere_is_found(self, db_session):
+        """Companies created through the ORM share the normalized key."""
+        db_session.add(Company(name="Globex Corporation"))
+        db_session.commit()
+        
+        company_id = CompanyResolver().resolve_one(db_session, "globex")
+        
+        assert company_id == db_session.query(Company.id).scalar()
+    
+    def test_ensure_company_schema_does_not_merge(self, tmp_path):
+        """Startup adds the column and its index and fills unshared keys, idempotently."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE companies (id INTEGER PRIMARY KEY, name VARCHAR(255))"))
+            conn.execute(text("INSERT INTO companies VALUES (1, 'Doctolib'), (2, 'doctolib SAS'), (3, 'Alan')"))
+        
+        ensure_company_schema(engine)
+        ensure_company_schema(engine)
+        
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT id, normalized_name FROM companies ORDER BY id")).all() == [
+                (1, None), (2, None), (3, "alan")
+            ]
+        assert "ix_companies_normalized_name" in {index["name"] for index in inspect(engine).get_indexes("companies")}
+    
+    def test_merge_duplicate_companies(self, tmp_path):
+        """Existing companies are backfilled, with duplicates merged."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE companies (id INTEGER PRIMARY KEY, name VARCHAR(255))"))
+            conn.execute(text("CREATE TABLE jobs (id INTEGER PRIMARY KEY, company_id INTEGER REFERENCES companies (id))"))
+            conn.execute(text("CREATE TABLE blacklist (id INTEGER PRIMARY KEY, company_id INTEGER REFERENCES companies (id))"))
+            conn.execute(text("CREATE TABLE reviews (id INTEGER PRIMARY KEY, employer_id INTEGER REFERENCES companies (id))"))
+            conn.execute(text("INSERT INTO companies VALUES (1, 'Doctolib'), (2, 'Alan'), (3, 'doctolib SAS')"))
+            conn.execute(text("INSERT INTO jobs VALUES (1, 1), (2, 3)"))
+            conn.execute(text("INSERT INTO blacklist VALUES (1, 3)"))
+            conn.execute(text("INSERT INTO reviews VALUES (1, 3)"))
+        ensure_company_schema(engine)
+        
+        assert merge_duplicate_companies(engine, dry_run=True) == 1
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM companies")).scalar() == 3
+        
+        assert merge_duplicate_companies(engine) == 1
+        assert merge_duplicate_companies(engine) == 0
+        
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT id, normalized_name FROM companies ORDER BY id")).all() == [
+                (1, "doctolib"), (2, "alan")
+            ]
+            assert conn.execute(text("SELECT company_id FROM jobs")).scalars().all() == [1, 1]
+            assert conn.execute(text("SELECT company_id FROM blacklist")).scalar() == 1
+            # Found by reflection, not from a fixed list
+            assert conn.execute(text("SELECT employer_id FROM reviews")).scalar() == 1
+    
+    def test_merge_keeps_companies_cached_by_running_servers(self, db_session):
+        """Legacy duplicates merge into the company a resolver created meanwhile."""
+        engine = db_session.get_bind()
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO companies (id, name) VALUES (1, 'Doctolib'), (2, 'doctolib SAS')"
+            ))
+            conn.execute(text("INSERT INTO jobs (id, title, company_id) VALUES (1, 'PM', 2)"))
+        
+        # The legacy rows have no key: a running server creates its own row
+        resolver = CompanyResolver()
+        cached_id = resolver.resolve_one(db_session, "Doctolib")
+        db_session.commit()
+        
+        assert merge_duplicate_companies(engine) == 2
+        db_session.expire_all()
+        assert [company.id for company in db_session.query(Company)] == [cached_id]
+        assert db_session.query(Job).one().company_id == cached_id
+        assert resolver.resolve_one(db_session, "DOCTOLIB") == cached_id
@@ -1,4 +1,10 @@
 import pytest
+from sqlalchemy import create_mock_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from src.models import Job
+from src.services.job_text_search import apply_text_search
 
 
 class TestJobsAPI:
@@ -88,3 +94,32 @@ class TestJobsAPI:
         response = client.get("/api/jobs/", params={"title": "Manager"})
         assert response.status_code == 200
         assert response.json()["total"] == 0
+    
+    def test_list_jobs_text_search(self, client, sample_job_data, sample_company_data):
+        """Test the q= search over title, company and description."""
+        company_id = client.post("/api/companies/", json=sample_company_data).json()["id"]
+        client.post("/api/jobs/", json={**sample_job_data, "company_id": company_id})
+        
+        # Every word must match somewhere: title, company name or description
+        response = client.get("/api/jobs/", params={"q": "engineer tech amazing"})
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+        
+        response = client.get("/api/jobs/", params={"q": "engineer marketing"})
+        assert response.json()["total"] == 0
+
+
+class TestJobTextSearch:
+    """Tests for the Postgres full-text search query."""
+    
+    def test_postgres_uses_search_vector(self):
+        """On Postgres, q is matched and ranked against the indexed tsvector."""
+        engine = create_mock_engine("postgresql://", lambda *args, **kwargs: None)
+        session = Session(bind=engine)
+        
+        query, rank = apply_text_search(session, session.query(Job.id), "data engineer")
+        sql = str(query.order_by(rank.desc()).statement.compile(dialect=postgresql.dialect()))
+        
+        assert "jobs.search_vector @@ websearch_to_tsquery" in sql
+        assert "ts_rank(jobs.search_vector, websearch_to_tsquery" in sql
+        assert "ILIKE" not in sql
@@ -0,0 +1,297 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from src.models import Company, FindAllRun, Job
+from src.services import company_resolver, findall_poller, parallel_findall
+from src.services.findall_poller import FindAllPoller
+from src.services.findall_runs import FindAllRunRegistry, search_key
+from src.services.parallel_findall import ParallelFindAllService
+
+
+class FakeFindAll:
+    """Async FindAll API whose calls take `latency` seconds."""
+    
+    def __init__(self, statuses, latency=0.05):
+        self.statuses = list(statuses)
+        self.latency = latency
+        self.retrieved = 0
+        self.created = 0
+    
+    async def create(self, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.created += 1
+        return SimpleNamespace(findall_id=f"findall_{self.created}")
+    
+    async def retrieve(self, findall_id, betas):
+        await asyncio.sleep(self.latency)
+        status = self.statuses[min(self.retrieved, len(self.statuses) - 1)]
+        self.retrieved += 1
+        metrics = SimpleNamespace(generated_candidates_count=10 * self.retrieved, matched_candidates_count=self.retrieved)
+        return SimpleNamespace(status=SimpleNamespace(status=status, metrics=metrics))
+    
+    async def result(self, findall_id, betas):
+        await asyncio.sleep(self.latency)
+        candidate = SimpleNamespace(
+            candidate_id="c1",
+            name="Product Manager – Acme",
+            url="https://example.com/jobs/1",
+            description="",
+            match_status="matched",
+            output={"location_check": {"value": "Paris"}},
+        )
+        return SimpleNamespace(candidates=[candidate])
+
+
+@pytest.fixture
+def findall_service(db_session, monkeypatch):
+    """FindAll service on a fake async client."""
+    monkeypatch.setenv("PARALLEL_API_KEY", "test-key")
+    monkeypatch.setattr(parallel_findall, "_client", None)
+    service = ParallelFindAllService(db_session)
+    service.client = SimpleNamespace(beta=SimpleNamespace(findall=FakeFindAll(["running", "running", "completed"])))
+    return service
+
+
+class TestParallelFindAll:
+    """Tests for the FindAll service."""
+    
+    async def test_run_lifecycle(self, findall_service):
+        """A run is created, polled to completion and its matches read."""
+        findall_id = await findall_service.create_run("Product Manager", "Paris")
+        progress = [update async for update in findall_service.poll_status(findall_id, poll_interval=0)]
+        results = await findall_service.get_results(findall_id)
+        
+        assert findall_id == "findall_1"
+        assert [update["status"] for update in progress] == ["running", "running", "completed"]
+        assert progress[-1]["is_complete"] and progress[-1]["matched_count"] == 3
+        assert [result["location"] for result in results] == ["Paris"]
+    
+    async def test_polling_does_not_block_the_event_loop(self, findall_service):
+        """Other coroutines keep running while API calls are in flight."""
+        ticks = []
+        
+        async def ticker():
+            while True:
+                ticks.append(asyncio.get_running_loop().time())
+                await asyncio.sleep(0.01)
+        
+        task = asyncio.create_task(ticker())
+        try:
+            async for update in findall_service.poll_status("findall_1", poll_interval=0):
+                pass
+        finally:
+            task.cancel()
+        
+        # Three 50ms round trips: the ticker ran throughout
+        assert len(ticks) >= 10
+    
+    def test_save_jobs_query_count_is_constant(self, findall_service, db_session, monkeypatch):
+        """Saving a run's matches takes the same queries for 2 or 20 of them."""
+        monkeypatch.setattr(company_resolver, "_company_resolver", None)
+        
+        def candidates(start, count):
+            return [
+                {
+                    "candidate_id": f"c{i}",
+                    "name": f"Product Manager – Company {i % 3}",
+                    "url": f"https://example.com/jobs/{i}",
+                    "description": "",
+                    "location": "Paris",
+                }
+                for i in range(start, start + count)
+            ]
+        
+        counts = []
+        for start, count in ((0, 2), (2, 20)):
+            batch = candidates(start, count) + candidates(0, 1)
+            statements = []
+            
+            def record(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+            
+            event.listen(db_session.get_bind(), "before_cursor_execute", record)
+            try:
+                saved = findall_service.save_jobs(findall_service.convert_to_job_format(batch))
+            finally:
+                event.remove(db_session.get_bind(), "before_cursor_execute", record)
+            assert len(saved) == count
+            # Inserts may be batched or not depending on the driver
+            counts.append(len([s for s in statements if s.lstrip().upper().startswith("SELECT")]))
+        
+        assert counts[0] == counts[1]
+        assert db_session.query(Job).count() == 22
+        assert db_session.query(Company).count() == 3
+    
+    async def test_shared_client(self, monkeypatch):
+        """Services share one client, which is recreated after closing."""
+        monkeypatch.setenv("PARALLEL_API_KEY", "test-key")
+        monkeypatch.setattr(parallel_findall, "_client", None)
+        
+        client = parallel_findall.get_findall_client()
+        assert parallel_findall.get_findall_client() is client
+        
+        await parallel_findall.close_findall_client()
+        assert parallel_findall.get_findall_client() is not client
+        await parallel_findall.close_findall_client()
+
+
+class TestFindAllRunRegistry:
+    """Tests for the persisted FindAll run registry."""
+    
+    def test_search_key(self):
+        """Case and spacing do not make a different search."""
+        assert search_key(" Product  Manager", "PARIS") == search_key("product manager", "Paris")
+        assert search_key("Product Manager", "Paris") != search_key("Product Manager", "Lyon")
+    
+    def test_in_progress_run_is_reused(self, db_session):
+        """A queued or running run of the same search is reused."""
+        registry = FindAllRunRegistry(db_session)
+        registry.register("findall_1", "Product Manager", "Paris", 50, None)
+        
+        assert registry.find_reusable("product manager", "paris", 50).findall_id == "findall_1"
+        assert registry.find_reusable("Product Manager", "Lyon", 50) is None
+        # A run asked for fewer matches does not serve a bigger search
+        assert registry.find_reusable("Product Manager", "Paris", 100) is None
+        
+        registry.update("findall_1", {"status": "running", "generated_count": 40, "matched_count": 3})
+        run = registry.find_reusable("Product Manager", "Paris", 50)
+        assert (run.status, run.generated_count, run.matched_count) == ("running", 40, 3)
+        assert run.completed_at is None
+    
+    def test_completed_run_is_reused_within_window(self, db_session):
+        """Completed runs are reused for reuse_hours; failed ones never."""
+        registry = FindAllRunRegistry(db_session)
+        registry.register("findall_1", "Product Manager", "Paris", 50)
+        registry.update("findall_1", {"status": "completed", "matched_count": 12, "is_complete": True})
+        assert registry.find_reusable("Product Manager", "Paris", 50).findall_id == "findall_1"
+        
+        run = registry.get("findall_1")
+        run.created_at = run.completed_at = datetime.utcnow() - timedelta(hours=registry.reuse_hours + 1)
+        db_session.commit()
+        assert registry.find_reusable("Product Manager", "Paris", 50) is None
+        
+        registry.register("findall_2", "Product Manager", "Paris", 50)
+        registry.update("findall_2", {"status": "failed", "is_complete": True})
+        assert registry.find_reusable("Product Manager", "Paris", 50) is None
+    
+    def test_stale_run_is_not_reused(self, db_session):
+        """Runs left unfinished past the polling limit are abandoned."""
+        registry = FindAllRunRegistry(db_session)
+        run = registry.register("findall_1", "Product Manager", "Paris", 50)
+        run.created_at = datetime.utcnow() - timedelta(hours=1)
+        db_session.commit()
+        
+        assert registry.find_reusable("Product Manager", "Paris", 50) is None
+    
+    def test_identical_searches_share_a_run(self, client, db_session, monkeypatch):
+        """A second identical deep search reuses the first run and its jobs."""
+        findall = FakeFindAll(["completed"], latency=0)
+        
+        async def close():
+            pass
+        
+        monkeypatch.setattr(parallel_findall, "_client", SimpleNamespace(beta=SimpleNamespace(findall=findall), close=close))
+        monkeypatch.setattr(company_resolver, "_company_resolver", None)
+        poller = FindAllPoller(sessionmaker(bind=db_session.get_bind()), poll_interval=0)
+        monkeypatch.setattr(findall_poller, "_findall_poller", poller)
+        
+        completions = []
+        for keywords in ("Product Manager", "product manager"):
+            response = client.get("/api/search/stream", params={"keywords": keywords, "location": "Paris"})
+            events = [json.loads(line[6:]) for line in response.text.splitlines() if line.startswith("data: ")]
+            completions.append(events[-1])
+        
+        assert findall.created == 1
+        assert [event["event"] for event in completions] == ["findall_complete", "findall_complete"]
+        assert [event["total_matched"] for event in completions] == [1, 1]
+        assert db_session.query(FindAllRun).one().status == "completed"
+
+
+@pytest.fixture
+def poller(db_session, monkeypatch):
+    """Poller on a fake FindAll API (three polls to completion)."""
+    findall = FakeFindAll(["running", "running", "completed"], latency=0.01)
+    monkeypatch.setenv("PARALLEL_API_KEY", "test-key")
+    monkeypatch.setattr(parallel_findall, "_client", SimpleNamespace(beta=SimpleNamespace(findall=findall)))
+    monkeypatch.setattr(company_resolver, "_company_resolver", None)
+    FindAllRunRegistry(db_session).register("findall_1", "Product Manager", "Paris", 50)
+    poller = FindAllPoller(sessionmaker(bind=db_session.get_bind()), poll_interval=0)
+    poller.findall = findall
+    return poller
+
+
+class TestFindAllPoller:
+    """Tests for the background FindAll poller."""
+    
+    async def test_one_poll_per_run_for_all_subscribers(self, poller):
+        """Subscribers share the run's polls and all get its results."""
+        async def watch():
+            return [event async for event in poller.subscribe("findall_1")]
+        
+        first, second = await asyncio.gather(watch(), watch())
+        
+        assert poller.findall.retrieved == 3
+        assert first == second
+        assert [event["event"] for event in first] == ["findall_progress"] * 3 + ["findall_complete"]
+        assert len(first[-1]["job_ids"]) == 1
+    
+    async def test_results_saved_without_subscribers(self, poller, db_session):
+        """A run started with nobody watching is still recorded and saved."""
+        poller.ensure_polling("findall_1")
+        await poller._tasks["findall_1"]
+        
+        db_session.expire_all()
+        run = FindAllRunRegistry(db_session).get("findall_1")
+        assert (run.status, run.matched_count) == ("completed", 3)
+        assert run.completed_at is not None
+        assert db_session.query(Job).count() == 1
+        assert not poller.is_polling("findall_1")
+    
+    async def test_saving_does_not_block_the_event_loop(self, poller, monkeypatch):
+        """Saving and scoring the matches runs off the event loop."""
+        def slow_refresh_jobs(self, jobs):
+            time.sleep(0.2)
+            return 0
+        
+        monkeypatch.setattr(parallel_findall.ScoreMaterializationService, "refresh_jobs", slow_refresh_jobs)
+        ticks = []
+        
+        async def ticker():
+            while True:
+                ticks.append(asyncio.get_running_loop().time())
+                await asyncio.sleep(0.01)
+        
+        task = asyncio.create_task(ticker())
+        try:
+            events = [event async for event in poller.subscribe("findall_1")]
+        finally:
+            task.cancel()
+        
+        assert events[-1]["event"] == "findall_complete"
+        # The ticker kept running during the 200ms save
+        assert len(ticks) >= 15
+    
+    async def test_late_subscriber_gets_final_event(self, poller):
+        """A finished run's final event is replayed without polling again."""
+        events = [event async for event in poller.subscribe("findall_1")]
+        late = [event async for event in poller.subscribe("findall_1")]
+        
+        assert late == [events[-1]]
+        assert poller.findall.retrieved == 3
+    
+    async def test_failed_run(self, poller, db_session):
+        """A run that does not complete ends its subscriptions with an error."""
+        poller.findall.statuses = ["failed"]
+        
+        events = [event async for event in poller.subscribe("findall_1")]
+        
+        assert [event["event"] for event in events] == ["findall_progress", "error"]
+        db_session.expire_all()
+        assert FindAllRunRegistry(db_session).get("findall_1").status == "failed"
@@ -0,0 +1,476 @@
+from contextlib import contextmanager
+import json
+
+import pytest
+from sqlalchemy import event
+
+from src.services.scoring_v2 import ScoringServiceV2
+from src.services.text_matching import get_keyword_matcher
+from tests.conftest import TestingSessionLocal, engine
+from src.models.scoring_preferences import DEFAULT_SCORING_PREFERENCES
+from src.models.job_features import JobFeatures
+from src.services.job_features import compute_job_features, parse_city
+from src.models import JobScore
+from src.services.score_materialization import ScoreMaterializationService
+from src.services.scoring_v2 import scoring_service_v2
+
+
+@pytest.fixture
+def scoring_jobs():
+    """A small corpus covering every branch of each V2 category."""
+    return [
+        {
+            "title": "Senior Product Manager",
+            "description": "Join our AI startup to build machine learning products. " * 3,
+            "location": "Toulouse (hybride)",
+            "remote_type": "hybrid",
+            "salary_min": 60000,
+            "salary_max": 75000,
+            "skills": ["Python", "SQL"],
+            "source": "linkedin",
+            "posted_at": "2025-11-01T00:00:00",
+            "company": "Doctolib",
+        },
+        {
+            "title": "Head of Product",
+            "description": "Series A fintech",
+            "location": "Full remote",
+            "remote_type": None,
+            "salary_min": 90000.0,
+            "salary_max": None,
+            "skills": [],
+            "source": "indeed",
+            "posted_at": None,
+            "company": {"description": "Climate tech", "industry": "Energy"},
+        },
+        {
+            "title": "Product Analyst",
+            "description": None,
+            "location": None,
+            "remote_type": "onsite",
+            "salary_min": 42000,
+            "salary_max": 42000,
+            "skills": None,
+            "source": "untrusted-board",
+            "posted_at": None,
+            "company": None,
+        },
+        {
+            "title": "Product Owner",
+            "description": "Roadmap, agile, jira. " * 10,
+            "location": "Lyon",
+            "remote_type": "",
+            "salary_min": None,
+            "salary_max": 55000,
+            "skills": ["Agile"],
+            "source": None,
+            "posted_at": "2025-10-01T00:00:00",
+        },
+    ]
+
+
+class TestScoringServiceV2Batch:
+    """Tests for ScoringServiceV2.score_batch."""
+    
+    @pytest.mark.parametrize("preferences", [
+        {},
+        {**DEFAULT_SCORING_PREFERENCES, "cv_skills": ["python", "Agile", "roadmap"]},
+        {
+            **DEFAULT_SCORING_PREFERENCES,
+            "preferred_city": "Toulouse",
+            "min_salary": 70000,
+            "priority_skills": ["SQL", "Jira"],
+            "trusted_sources": {"untrusted-board": False},
+        },
+    ])
+    def test_batch_matches_per_job_scoring(self, scoring_jobs, preferences):
+        """Batch results are identical to scoring each job individually."""
+        service = ScoringServiceV2()
+        
+        batch = service.score_batch(scoring_jobs, preferences)
+        single = [service.calculate_total_score(job, preferences) for job in scoring_jobs]
+        
+        assert batch == single
+    
+    @pytest.mark.parametrize("change", [
+        {"target_seniority": "head"},
+        {"preferred_city": "Toulouse"},
+        {"min_salary": 90000},
+        {"priority_skills": ["SQL", "Roadmap"]},
+        {"trusted_sources": {"untrusted-board": False}},
+        {"attractiveness_keywords": {"high": ["fintech"], "medium": []}},
+    ])
+    def test_partial_rescore_matches_full_rescore(self, scoring_jobs, change):
+        """Recomputing only the changed categories gives the full-rescore result."""
+        service = ScoringServiceV2()
+        old_prefs = {**DEFAULT_SCORING_PREFERENCES, "cv_skills": ["python"]}
+        new_prefs = {**old_prefs, **change}
+        
+        categories = service.changed_categories(
+            service.preferences_fingerprint(old_prefs),
+            service.preferences_fingerprint(new_prefs)
+        )
+        assert len(categories) == 1
+        
+        previous = service.score_batch(scoring_jobs, old_prefs)
+        partial = service.rescore_batch(
+            scoring_jobs,
+            new_prefs,
+            [result["breakdown"] for result in previous],
+            categories
+        )
+        
+        assert partial == service.score_batch(scoring_jobs, new_prefs)
+    
+    def test_batch_empty(self):
+        """Scoring an empty batch returns an empty list."""
+        assert ScoringServiceV2().score_batch([], {}) == []
+
+
+class TestScoredJobsAPI:
+    """Tests for the V2 scored jobs endpoint."""
+    
+    def test_list_scored_jobs_sorted(self, client, auth_headers, sample_job_data):
+        """Scored jobs are returned highest score first."""
+        client.post("/api/jobs/", json=sample_job_data)
+        client.post("/api/jobs/", json={
+            **sample_job_data,
+            "title": "Head of Product",
+            "source_url": "https://example.com/job/456",
+        })
+        
+        response = client.get("/api/jobs/scored/v2", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        scores = [job["score"] for job in data["jobs"]]
+        assert scores == sorted(scores, reverse=True)
+        assert data["jobs"][0]["job"]["title"] == "Head of Product"
+    
+    def test_scored_jobs_follow_preference_changes(self, client, auth_headers, sample_job_data):
+        """Materialized scores are refreshed when preferences change."""
+        client.post("/api/jobs/", json={**sample_job_data, "location": "Toulouse"})
+        
+        before = client.get("/api/jobs/scored/v2", headers=auth_headers).json()
+        assert before["jobs"][0]["breakdown"]["geography"]["type"] == "hybrid_distant"
+        
+        client.put(
+            "/api/criteria/preferences/v2",
+            json={"preferred_city": "Toulouse"},
+            headers=auth_headers
+        )
+        
+        after = client.get("/api/jobs/scored/v2", headers=auth_headers).json()
+        assert after["jobs"][0]["breakdown"]["geography"]["type"] == "hybrid_local"
+        assert after["jobs"][0]["score"] == before["jobs"][0]["score"] + 7
+    
+    def test_concurrent_refresh_does_not_conflict(self, client, auth_headers, sample_job_data, monkeypatch):
+        """A score row written by a concurrent refresh is updated, not duplicated."""
+        client.post("/api/jobs/", json=sample_job_data)
+        client.get("/api/jobs/scored/v2", headers=auth_headers)
+        db = TestingSessionLocal()
+        user_id, job_id = db.query(JobScore.user_id, JobScore.job_id).one()
+        db.query(JobScore).delete()
+        db.commit()
+        
+        # Another request materializes the same row while this one scores
+        score_batch = scoring_service_v2.score_batch
+        
+        def racing_score_batch(jobs, prefs):
+            other = TestingSessionLocal()
+            other.add(JobScore(user_id=user_id, job_id=job_id, score=1.0, preferences_fingerprint="old"))
+            other.commit()
+            other.close()
+            return score_batch(jobs, prefs)
+        
+        monkeypatch.setattr(scoring_service_v2, "score_batch", racing_score_batch)
+        service = ScoreMaterializationService(db)
+        assert service.refresh_user(user_id) == 1
+        
+        row = db.query(JobScore).one()
+        assert row.score > 1.0 and row.preferences_fingerprint != "old"
+        db.close()
+    
+    def test_scored_jobs_min_score_and_pagination(self, client, auth_headers, sample_job_data):
+        """min_score and skip/limit are applied to materialized scores."""
+        for i in range(3):
+            client.post("/api/jobs/", json={
+                **sample_job_data,
+                "source_url": f"https://example.com/job/{i}",
+            })
+        
+        response = client.get(
+            "/api/jobs/scored/v2",
+            params={"skip": 1, "limit": 1},
+            headers=auth_headers
+        )
+        data = response.json()
+        assert data["total"] == 3
+        assert len(data["jobs"]) == 1
+        
+        response = client.get(
+            "/api/jobs/scored/v2",
+            params={"min_score": 100},
+            headers=auth_headers
+        )
+        assert response.json()["total"] == 0
+    
+    def test_scored_jobs_cursor_pagination(self, client, auth_headers, sample_job_data):
+        """Following next_cursor walks the same order as offset pagination."""
+        titles = ["Head of Product", "Senior Product Manager", "Product Manager", "Analyst", "Engineer"]
+        for i, title in enumerate(titles):
+            client.post("/api/jobs/", json={
+                **sample_job_data,
+                "title": title,
+                "source_url": f"https://example.com/job/{i}",
+            })
+        
+        by_offset = client.get(
+            "/api/jobs/scored/v2",
+            params={"limit": 100},
+            headers=auth_headers
+        ).json()["jobs"]
+        
+        by_cursor = []
+        params = {"limit": 2}
+        while True:
+            data = client.get("/api/jobs/scored/v2", params=params, headers=auth_headers).json()
+            by_cursor += data["jobs"]
+            if not data["next_cursor"]:
+                break
+            params["cursor"] = data["next_cursor"]
+        
+        assert [j["job"]["id"] for j in by_cursor] == [j["job"]["id"] for j in by_offset]
+        
+        response = client.get(
+            "/api/jobs/scored/v2",
+            params={"cursor": "not-a-cursor"},
+            headers=auth_headers
+        )
+        assert response.status_code == 400
+    
+    def test_stream_scored_jobs(self, client, auth_headers, sample_job_data):
+        """The stream emits the same jobs, in the same order, as the listing."""
+        for i, title in enumerate(["Product Manager", "Head of Product", "Analyst"]):
+            client.post("/api/jobs/", json={
+                **sample_job_data,
+                "title": title,
+                "source_url": f"https://example.com/job/{i}",
+            })
+        listed = client.get("/api/jobs/scored/v2", headers=auth_headers).json()["jobs"]
+        
+        response = client.get("/api/jobs/scored/v2/stream", headers=auth_headers)
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        streamed = [json.loads(line) for line in response.text.splitlines()]
+        assert streamed == listed
+        
+        response = client.get(
+            "/api/jobs/scored/v2/stream",
+            params={"format": "sse", "limit": 2},
+            headers=auth_headers
+        )
+        events = [
+            json.loads(line[len("data: "):])
+            for line in response.text.split("\n\n") if line.startswith("data: ")
+        ]
+        assert events[:2] == listed[:2]
+        assert events[2] == {"event": "complete", "count": 2}
+
+
+class TestSeniorityMatcher:
+    """Tests for the combined seniority matcher."""
+    
+    @pytest.mark.parametrize("title,level", [
+        ("head of product", "head"),
+        ("senior product manager / head of product", "head"),
+        ("sr. product manager", "senior"),
+        ("product manager", "mid"),
+        # "product manager" (PM) takes precedence over the junior pattern
+        ("junior product manager", "mid"),
+        ("product analyst", "junior"),
+        ("software engineer", None),
+    ])
+    def test_precedence(self, title, level):
+        """The highest-priority level wins, as with the per-pattern loop."""
+        assert ScoringServiceV2.SENIORITY_MATCHER.match(title) == level
+
+
+class TestKeywordMatcher:
+    """Tests for word-boundary keyword matching."""
+    
+    @pytest.mark.parametrize("text,expected", [
+        ("We maintain legacy systems", set()),
+        ("An AI-first company", {"ai"}),
+        ("Machine Learning platform", {"machine learning"}),
+        ("Strong C++ and C# skills", {"c++", "c#"}),
+        ("Node.js backend, Google Cloud", {"node.js"}),
+    ])
+    def test_find_all(self, text, expected):
+        """Keywords only match on word boundaries, case-insensitively."""
+        matcher = get_keyword_matcher(["ai", "machine learning", "c++", "c#", "node.js", "go"])
+        assert matcher.find_all(text) == expected
+    
+    def test_matcher_is_cached(self):
+        """The same keyword set reuses one matcher."""
+        assert get_keyword_matcher(["AI", "ml"]) is get_keyword_matcher(["ml ", "ai"])
+    
+    def test_attractiveness_ignores_substrings(self):
+        """"ai" inside "maintain" no longer counts as a mission keyword."""
+        scorer = ScoringServiceV2()
+        result = scorer.score_attractiveness(
+            "You will maintain our retail platform",
+            {},
+            ScoringServiceV2.DEFAULT_ATTRACTIVENESS_KEYWORDS
+        )
+        assert result["level"] == "low"
+        
+        result = scorer.score_attractiveness(
+            "You will maintain our AI platform",
+            {},
+            ScoringServiceV2.DEFAULT_ATTRACTIVENESS_KEYWORDS
+        )
+        assert result["level"] == "high"
+        assert result["matched_keywords"] == ["ai"]
+    
+    def test_custom_keywords_are_high_value(self):
+        """Custom attractiveness keywords score like high-value ones."""
+        scorer = ScoringServiceV2()
+        keywords = dict(ScoringServiceV2.DEFAULT_ATTRACTIVENESS_KEYWORDS, custom=["B Corp"])
+        result = scorer.score_attractiveness("We are a certified b corp", {}, keywords)
+        assert result["level"] == "high"
+        assert result["matched_keywords"] == ["B Corp"]
+    
+    def test_skills_match_whole_words(self):
+        """A skill only matches the description as a whole word."""
+        scorer = ScoringServiceV2()
+        result = scorer.score_skills_match([], "Experience with Google Analytics and Go", ["go", "sql"])
+        assert result["matched_skills"] == ["go"]
+        
+        result = scorer.score_skills_match([], "Experience with Google Analytics", ["go", "sql"])
+        assert result["matched"] == 0
+
+
+class TestJobFeatures:
+    """Tests for precomputed per-job features."""
+    
+    @pytest.mark.parametrize("preferences", [
+        {},
+        {
+            **DEFAULT_SCORING_PREFERENCES,
+            "preferred_city": "Toulouse",
+            "cv_skills": ["python", "machine learning", "C++"],
+        },
+    ])
+    def test_stored_features_give_same_scores(self, scoring_jobs, preferences):
+        """Scoring from stored features matches scoring the raw fields."""
+        service = ScoringServiceV2()
+        stored = [
+            {**job, "features": JobFeatures(**compute_job_features(job)).to_dict()}
+            for job in scoring_jobs
+        ]
+        
+        single = [service.calculate_total_score(job, preferences) for job in scoring_jobs]
+        assert service.score_batch(stored, preferences) == single
+    
+    @pytest.mark.parametrize("location,city", [
+        ("Toulouse (hybride)", "toulouse"),
+        ("Paris, Île-de-France, France", "paris"),
+        ("Lyon 69002", "lyon"),
+        ("Full remote", None),
+        (None, None),
+    ])
+    def test_parse_city(self, location, city):
+        assert parse_city(location) == city
+    
+    def test_features_follow_job_edits(self, client, db_session, auth_headers, sample_job_data):
+        """Features are stored when a job is scored and rebuilt when it is edited."""
+        job_id = client.post("/api/jobs/", json=sample_job_data).json()["id"]
+        client.get("/api/jobs/scored/v2", headers=auth_headers)
+        
+        features = db_session.query(JobFeatures).filter(JobFeatures.job_id == job_id).one()
+        assert features.title == "software engineer"
+        assert features.city == "paris"
+        
+        client.put(f"/api/jobs/{job_id}", json={"title": "Senior Product Manager"})
+        db_session.expire_all()
+        features = db_session.query(JobFeatures).filter(JobFeatures.job_id == job_id).one()
+        assert features.seniority_level == "senior"
+
+
+@contextmanager
+def count_queries():
+    """Count SQL statements executed on the test engine."""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+class TestQueryCounts:
+    """Round trips per request must not grow with the number of jobs."""
+    
+    def _create_jobs(self, client, sample_job_data, company_id, count, offset=0):
+        for i in range(offset, offset + count):
+            client.post("/api/jobs/", json={
+                **sample_job_data,
+                "company_id": company_id,
+                "source_url": f"https://example.com/job/{i}",
+            })
+    
+    def _listing_queries(self, client, auth_headers):
+        # First call materializes scores; the second one is the steady state
+        client.get("/api/jobs/scored/v2", headers=auth_headers)
+        with count_queries() as statements:
+            response = client.get("/api/jobs/scored/v2", headers=auth_headers)
+        assert all(job["job"]["company"] == "Tech Corp" for job in response.json()["jobs"])
+        return len(statements)
+    
+    def test_scored_listing_query_count_is_constant(
+        self, client, auth_headers, sample_job_data, sample_company_data
+    ):
+        company_id = client.post("/api/companies/", json=sample_company_data).json()["id"]
+        
+        self._create_jobs(client, sample_job_data, company_id, 2)
+        small = self._listing_queries(client, auth_headers)
+        
+        self._create_jobs(client, sample_job_data, company_id, 8, offset=2)
+        large = self._listing_queries(client, auth_headers)
+        
+        assert large == small
+    
+    def test_materialization_query_count_is_constant(
+        self, client, auth_headers, sample_job_data, sample_company_data
+    ):
+        company_id = client.post("/api/companies/", json=sample_company_data).json()["id"]
+        
+        # Creates the default scoring preferences
+        client.get("/api/jobs/scored/v2", headers=auth_headers)
+        
+        counts = []
+        for offset, count in ((0, 2), (2, 8)):
+            self._create_jobs(client, sample_job_data, company_id, count, offset)
+            with count_queries() as statements:
+                client.get("/api/jobs/scored/v2", headers=auth_headers)
+            # Inserts may be batched or not depending on the driver
+            counts.append(len([s for s in statements if s.lstrip().upper().startswith("SELECT")]))
+        
+        assert counts[0] == counts[1]
+    
+    def test_job_score_query_count(self, client, auth_headers, sample_job_data, sample_company_data):
+        company_id = client.post("/api/companies/", json=sample_company_data).json()["id"]
+        self._create_jobs(client, sample_job_data, company_id, 1)
+        job_id = client.get("/api/jobs/").json()["jobs"][0]["id"]
+        
+        client.get(f"/api/jobs/{job_id}/score/v2", headers=auth_headers)
+        with count_queries() as statements:
+            response = client.get(f"/api/jobs/{job_id}/score/v2", headers=auth_headers)
+        assert response.status_code == 200
+        
+        # user lookup, scoring preferences, profile, job joined with company
+        assert len(statements) == 4
@@ -0,0 +1,285 @@
+import asyncio
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from src.scrapers import glassdoor, indeed, linkedin, parsing, wttj
+from src.scrapers.card_selectors import CardSelectors, Field, Select
+from src.scrapers.glassdoor import GlassdoorScraper
+from src.scrapers.indeed import IndeedScraper, parse_search_results
+from src.scrapers.parsing import get_parse_executor, run_parser, shutdown_parse_executor
+
+
+INDEED_HTML = """
+<html><body>
+  <div class="job_seen_beacon">
+    <h2 class="jobTitle"><a href="/viewjob?jk=1">Senior  Python Developer</a></h2>
+    <span data-testid="company-name">Acme</span>
+    <div data-testid="text-location">Remote</div>
+    <div data-testid="attribute_snippet_testid">50K - 60K $</div>
+  </div>
+  <div class="job_seen_beacon">
+    <h2 class="jobTitle"><a href="https://www.indeed.com/viewjob?jk=2">Data Engineer</a></h2>
+    <div data-testid="text-location">Paris</div>
+  </div>
+  <div class="job_seen_beacon"><span>No title here</span></div>
+</body></html>
+"""
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "scrapers"
+PLATFORMS = {
+    "indeed": indeed,
+    "glassdoor": glassdoor,
+    "wttj": wttj,
+    "linkedin": linkedin,
+}
+
+
+def load_fixture(name: str) -> str:
+    return (FIXTURES_DIR / f"{name}.html").read_text(encoding="utf-8")
+
+
+@pytest.fixture
+def thread_parse_pool(monkeypatch):
+    """Parse pool backed by threads (no worker processes to spawn)."""
+    monkeypatch.setenv("SCRAPING_PARSE_EXECUTOR", "thread")
+    shutdown_parse_executor()
+    yield
+    shutdown_parse_executor()
+
+
+class TestParseFunctions:
+    """Tests for the pure, module-level parse functions."""
+    
+    def test_indeed_results(self):
+        """Cards are parsed into job dicts; cards without a title are skipped."""
+        jobs = parse_search_results(INDEED_HTML, 20)
+        
+        assert [job["title"] for job in jobs] == ["Senior Python Developer", "Data Engineer"]
+        assert jobs[0]["source_url"] == "https://www.indeed.com/viewjob?jk=1"
+        assert jobs[0]["company_name"] == "Acme"
+        assert jobs[0]["remote_type"] == "remote"
+        assert (jobs[0]["salary_min"], jobs[0]["salary_max"]) == (50000, 60000)
+        assert jobs[0]["salary_currency"] == "USD"
+        assert jobs[1]["company_name"] is None
+        assert jobs[1]["remote_type"] == "onsite"
+        assert all(job["source_platform"] == "indeed" for job in jobs)
+    
+    def test_limit(self):
+        """At most `limit` cards are parsed."""
+        assert len(parse_search_results(INDEED_HTML, 1)) == 1
+    
+    @pytest.mark.parametrize("name", PLATFORMS)
+    def test_fixture_pages(self, name):
+        """Every platform parses its saved results page into complete jobs."""
+        module = PLATFORMS[name]
+        jobs = module.parse_search_results(load_fixture(name), 100)
+        
+        assert len(jobs) >= 20
+        for job in jobs:
+            assert job["title"] and job["title"] == job["title"].strip()
+            assert job["source_url"].startswith("https://")
+            assert job["source_platform"] == module.PLATFORM_NAME
+    
+    def test_glassdoor_fields(self):
+        """Glassdoor URLs come from the title link, ratings are parsed when numeric."""
+        jobs = glassdoor.parse_search_results(load_fixture("glassdoor"), 100)
+        
+        assert all("glassdoor.com" in job["source_url"] for job in jobs)
+        assert {job["company_rating"] for job in jobs} - {None} <= {4.1, 3.8, 4.5}
+    
+    def test_linkedin_requires_link(self):
+        """LinkedIn cards without a job link or a title are skipped."""
+        html = load_fixture("linkedin")
+        
+        assert len(linkedin.SELECTORS.extract(html, 100)) == 31
+        assert len(linkedin.parse_search_results(html, 100)) == 26
+
+
+class TestCardSelectors:
+    """Tests for the compiled card selectors."""
+    
+    SELECTORS = CardSelectors(
+        cards=[Select("div", {"class": "card"}), Select("li", {"data-card": True})],
+        fields={
+            "title": Field([Select("h2", {"class": "title"}), Select("h3")]),
+            "href": Field([Select("a", {"href": True})], attr="href"),
+            "tag": Field([Select("span", {"data-test": "tag"})], attr="data-value"),
+        },
+    )
+    
+    @pytest.mark.parametrize("name", PLATFORMS)
+    def test_same_as_beautifulsoup(self, name):
+        """XPath extraction matches BeautifulSoup, with or without strainer."""
+        selectors = PLATFORMS[name].SELECTORS
+        html = load_fixture(name)
+        cards = selectors.extract(html, 100)
+        
+        assert cards
+        assert cards == selectors.extract_soup(html, 100)
+        assert cards == selectors.extract_soup(html, 100, strain=False)
+    
+    def test_field_alternatives(self):
+        """Fields take the first alternative found; missing ones are None."""
+        html = """
+        <div class="card big"><h3>Fallback</h3><h2 class="x title">Main <b>title</b></h2>
+          <a href="/a">A</a><span data-test="tag">no value</span></div>
+        <div class="card"><h3>Only <script>ignored()</script>h3</h3><a>no href</a></div>
+        <div class="cards"><h2 class="title">Not a card</h2></div>
+        """
+        cards = self.SELECTORS.extract(html, 10)
+        
+        assert cards == [
+            {"title": "Main title", "href": "/a", "tag": ""},
+            {"title": "Only h3", "href": None, "tag": None},
+        ]
+        assert cards == self.SELECTORS.extract_soup(html, 10)
+    
+    def test_card_alternatives(self):
+        """The second card selector is used when the first matches nothing."""
+        html = '<ul><li data-card="1"><h3>One</h3></li><li data-card="2"><h3>Two</h3></li></ul>'
+        
+        assert [card["title"] for card in self.SELECTORS.extract(html, 1)] == ["One"]
+    
+    def test_unparsable_input(self):
+        """Empty pages give no cards; encoding declarations are accepted."""
+        assert self.SELECTORS.extract("", 10) == []
+        html = '<?xml version="1.0" encoding="utf-8"?><html><body><div class="card"><h3>T</h3></div></body></html>'
+        assert self.SELECTORS.extract(html, 10)[0]["title"] == "T"
+
+
+class TestParsePool:
+    """Tests for running parse functions off the event loop."""
+    
+    async def test_process_pool(self, monkeypatch):
+        """Parse functions are pickled to a worker process."""
+        monkeypatch.setenv("SCRAPING_PARSE_WORKERS", "1")
+        monkeypatch.delenv("SCRAPING_PARSE_EXECUTOR", raising=False)
+        shutdown_parse_executor()
+        try:
+            executor = get_parse_executor()
+            assert type(executor).__name__ == "ProcessPoolExecutor"
+            jobs = await run_parser(parse_search_results, INDEED_HTML, 20)
+            # Not through the thread fallback of a broken pool
+            assert parsing._executor is executor
+        finally:
+            shutdown_parse_executor()
+        
+        assert jobs == parse_search_results(INDEED_HTML, 20)
+    
+    async def test_thread_fallback(self, thread_parse_pool):
+        """SCRAPING_PARSE_EXECUTOR=thread parses in a thread pool."""
+        assert type(get_parse_executor()).__name__ == "ThreadPoolExecutor"
+        assert len(await run_parser(parse_search_results, INDEED_HTML, 20)) == 2
+    
+    async def test_shutdown_recreates(self, thread_parse_pool):
+        """The pool is recreated on use after a shutdown."""
+        executor = get_parse_executor()
+        shutdown_parse_executor()
+        
+        assert parsing._executor is None
+        assert get_parse_executor() is not executor
+    
+    async def test_scraper_search(self, thread_parse_pool, monkeypatch):
+        """Scrapers fetch on the loop and parse in the pool."""
+        scraper = IndeedScraper()
+        
+        async def fetch_page(url):
+            return INDEED_HTML
+        
+        monkeypatch.setattr(scraper, "fetch_page", fetch_page)
+        jobs = await scraper.search("python", location="Paris", limit=20)
+        
+        assert [job["title"] for job in jobs] == ["Senior Python Developer", "Data Engineer"]
+
+
+def indeed_page(job_ids) -> str:
+    """Indeed results page with one card per job id."""
+    cards = "".join(
+        f'<div class="job_seen_beacon"><h2 class="jobTitle">Job {job_id}</h2>'
+        f'<a href="/viewjob?jk={job_id}">view</a></div>'
+        for job_id in job_ids
+    )
+    return f"<html><body>{cards}</body></html>"
+
+
+class TestPagination:
+    """Tests for concurrent multi-page searches."""
+    
+    @pytest.fixture
+    def scraper(self, thread_parse_pool):
+        return IndeedScraper()
+    
+    @staticmethod
+    def serve(scraper, monkeypatch, pages, delays=None):
+        """Serve pages[start offset] for Indeed URLs; record requested offsets."""
+        requested = []
+        
+        async def fetch_page(url):
+            start = int(parse_qs(urlsplit(url).query).get("start", ["0"])[0])
+            requested.append(start)
+            await asyncio.sleep((delays or {}).get(start, 0))
+            return pages.get(start, indeed_page([]))
+        
+        monkeypatch.setattr(scraper, "fetch_page", fetch_page)
+        return requested
+    
+    async def test_fetches_enough_pages(self, scraper, monkeypatch):
+        """limit=25 with 10 jobs per page requests 3 pages, concurrently."""
+        pages = {start: indeed_page(range(start, start + 10)) for start in (0, 10, 20)}
+        requested = self.serve(scraper, monkeypatch, pages)
+        
+        jobs = await scraper.search("python", limit=25)
+        
+        assert sorted(requested) == [0, 10, 20]
+        assert len(jobs) == 25
+        assert len({job["source_url"] for job in jobs}) == 25
+    
+    async def test_duplicates_across_pages(self, scraper, monkeypatch):
+        """Jobs repeated on overlapping pages are yielded once."""
+        pages = {0: indeed_page(range(0, 10)), 10: indeed_page(range(5, 15))}
+        self.serve(scraper, monkeypatch, pages)
+        
+        jobs = await scraper.search("python", limit=20)
+        
+        assert sorted(job["title"] for job in jobs) == sorted(f"Job {i}" for i in range(15))
+    
+    async def test_streams_and_stops_early(self, scraper, monkeypatch):
+        """Fast pages stream out first; slow pages are cancelled once limit is reached."""
+        pages = {start: indeed_page(range(start, start + 10)) for start in (0, 10, 20)}
+        self.serve(scraper, monkeypatch, pages, delays={0: 0.05, 20: 60})
+        
+        titles = []
+        stream = scraper.search_stream("python", limit=20)
+        async for job in stream:
+            titles.append(job["title"])
+        
+        # Page 2 (start=10) parsed before page 1; page 3 never needed
+        assert titles[0] == "Job 10"
+        assert len(titles) == 20
+        assert all(task.done() for task in asyncio.all_tasks() if task is not asyncio.current_task())
+    
+    async def test_empty_page_drops_later_pages(self, scraper, monkeypatch):
+        """An empty page ends the results: pages after it are not waited for."""
+        pages = {0: indeed_page(range(10))}
+        self.serve(scraper, monkeypatch, pages, delays={20: 60})
+        
+        jobs = await asyncio.wait_for(scraper.search("python", limit=30), timeout=5)
+        
+        assert len(jobs) == 10
+    
+    async def test_page_urls(self, thread_parse_pool, monkeypatch):
+        """Page 1 keeps the plain search URL; later pages add the page index."""
+        scraper = GlassdoorScraper()
+        urls = []
+        
+        async def fetch_page(url):
+            urls.append(url)
+            return None
+        
+        monkeypatch.setattr(scraper, "fetch_page", fetch_page)
+        assert await scraper.search("python", limit=60) == []
+        
+        assert urls[0] == f"{scraper.base_url}?sc.keyword=python"
+        assert urls[1] == f"{scraper.base_url}?sc.keyword=python&p=2"
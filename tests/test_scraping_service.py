@@ -0,0 +1,450 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.services.page_cache import PageCache, normalize_url, ttl_for
+from src.services.provider_health import (
+    COOLDOWN_SECONDS,
+    FAILURE_THRESHOLD,
+    HedgeBudget,
+    ProviderHealth,
+    domain_key,
+)
+from src.services.rate_limiter import Limit, Priority, RateLimiter
+from src.services.scraping_service import ScrapingMethod, ScrapingService
+from src.services.single_flight import SingleFlight
+from src.services.unipile import UnipileService
+
+
+@pytest.fixture
+def scraping_service(monkeypatch):
+    """Scraping service with no provider API keys (httpx fallback only), no page cache and no throttling."""
+    for key in ("PARALLEL_API_KEY", "FIRECRAWL_API_KEY", "BRIGHTDATA_API_KEY"):
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.setenv("SCRAPING_CACHE", "false")
+    service = ScrapingService()
+    service.rate_limiter = RateLimiter(limit=Limit(1000.0, 1000, 100))
+    return service
+
+
+class TestScrapingServiceClients:
+    """Tests for the shared per-provider HTTP clients."""
+    
+    async def test_start_and_aclose(self, scraping_service):
+        """One long-lived client per provider, closed on shutdown."""
+        await scraping_service.start()
+        clients = dict(scraping_service._clients)
+        
+        assert set(clients) == set(ScrapingMethod)
+        assert scraping_service._client(ScrapingMethod.HTTPX) is clients[ScrapingMethod.HTTPX]
+        assert clients[ScrapingMethod.FIRECRAWL].timeout.read == 10.0
+        
+        await scraping_service.aclose()
+        assert scraping_service._clients == {}
+        assert all(client.is_closed for client in clients.values())
+    
+    async def test_fetch_reuses_client(self, scraping_service):
+        """Successive fetches go through the same pooled client."""
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, text="<html>ok</html>")
+        
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        scraping_service._clients[ScrapingMethod.HTTPX] = client
+        
+        assert await scraping_service.fetch_page("https://example.com/a") == "<html>ok</html>"
+        assert await scraping_service.fetch_page("https://example.com/b") == "<html>ok</html>"
+        assert len(requests) == 2
+        assert scraping_service._client(ScrapingMethod.HTTPX) is client
+        
+        await scraping_service.aclose()
+        assert client.is_closed
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestProviderHealth:
+    """Tests for provider ordering and circuit breakers."""
+    
+    URL = "https://fr.indeed.com/jobs?q=python"
+    
+    def test_domain_key(self):
+        assert domain_key("https://fr.indeed.com/jobs") == "indeed.com"
+        assert domain_key("https://www.welcometothejungle.com/fr/jobs") == "welcometothejungle.com"
+        assert domain_key("https://www.example.org/a") == "example.org"
+    
+    def test_order_follows_cost(self):
+        """Faster, more reliable providers move ahead, per domain."""
+        health = ProviderHealth(clock=FakeClock())
+        providers = ["parallel", "firecrawl", "httpx"]
+        assert health.order(providers, self.URL) == providers
+        
+        for _ in range(3):
+            health.record("parallel", self.URL, True, 8.0)
+            health.record("firecrawl", self.URL, True, 1.0)
+            health.record("httpx", self.URL, True, 0.3)
+            health.record("httpx", self.URL, False, 0.3)
+        
+        assert health.order(providers, self.URL) == ["httpx", "firecrawl", "parallel"]
+        # Other domains keep the default order
+        assert health.order(providers, "https://www.linkedin.com/jobs") == providers
+    
+    def test_circuit_breaker(self):
+        """Consecutive failures open the circuit until the cooldown passes."""
+        clock = FakeClock()
+        health = ProviderHealth(clock=clock)
+        providers = ["firecrawl", "httpx"]
+        
+        for _ in range(FAILURE_THRESHOLD):
+            health.record("firecrawl", self.URL, False, 10.0)
+        assert health.order(providers, self.URL) == ["httpx"]
+        assert health.snapshot()["indeed.com"]["firecrawl"]["state"] == "open"
+        
+        assert not health.begin("firecrawl", self.URL)
+        
+        # After the cooldown, one trial is let through
+        clock.now += COOLDOWN_SECONDS
+        assert "firecrawl" in health.order(providers, self.URL)
+        assert health.begin("firecrawl", self.URL)
+        assert not health.begin("firecrawl", self.URL)
+        assert health.order(providers, self.URL) == ["httpx"]
+        
+        # A failed trial re-opens, a successful one closes
+        health.record("firecrawl", self.URL, False, 10.0)
+        clock.now += COOLDOWN_SECONDS
+        assert health.begin("firecrawl", self.URL)
+        health.record("firecrawl", self.URL, True, 1.0)
+        assert health.snapshot()["indeed.com"]["firecrawl"]["state"] == "closed"
+    
+    def test_half_open_waits_for_its_trial(self):
+        """Ordering a half-open provider does not use up its trial."""
+        clock = FakeClock()
+        health = ProviderHealth(clock=clock)
+        for _ in range(FAILURE_THRESHOLD):
+            health.record("firecrawl", self.URL, False, 10.0)
+        
+        clock.now += COOLDOWN_SECONDS
+        for _ in range(3):
+            assert "firecrawl" in health.order(["firecrawl", "httpx"], self.URL)
+            clock.now += 1
+        assert health.snapshot()["indeed.com"]["firecrawl"]["state"] == "half_open"
+    
+    async def test_fetch_page_skips_open_circuit(self, scraping_service, monkeypatch):
+        """fetch_page stops calling a provider whose circuit is open."""
+        monkeypatch.setattr(scraping_service, "firecrawl_api_key", "key")
+        calls = []
+        
+        async def failing(url):
+            calls.append(url)
+            return None
+        
+        async def working(url):
+            return "<html>ok</html>"
+        
+        scraping_service._fetchers[ScrapingMethod.FIRECRAWL] = failing
+        scraping_service._fetchers[ScrapingMethod.HTTPX] = working
+        
+        for _ in range(FAILURE_THRESHOLD + 2):
+            assert await scraping_service.fetch_page(self.URL) == "<html>ok</html>"
+        assert len(calls) == FAILURE_THRESHOLD
+
+
+class TestHedgedFetch:
+    """Tests for hedged fetch_page."""
+    
+    URL = "https://www.welcometothejungle.com/fr/jobs"
+    
+    @pytest.fixture
+    def hedging_service(self, scraping_service, monkeypatch):
+        """Firecrawl (ranked first, 10ms p90) hangs, httpx answers."""
+        monkeypatch.setattr(scraping_service, "firecrawl_api_key", "key")
+        self.cancelled = []
+        
+        async def slow(url):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                self.cancelled.append(url)
+                raise
+            return "<html>slow</html>"
+        
+        async def fast(url):
+            return "<html>fast</html>"
+        
+        scraping_service._fetchers[ScrapingMethod.FIRECRAWL] = slow
+        scraping_service._fetchers[ScrapingMethod.HTTPX] = fast
+        for _ in range(3):
+            scraping_service.health.record("firecrawl", self.URL, True, 0.01)
+            scraping_service.health.record("httpx", self.URL, True, 0.5)
+        return scraping_service
+    
+    async def test_hedge_wins_and_cancels_loser(self, hedging_service):
+        html = await asyncio.wait_for(hedging_service.fetch_page(self.URL, hedged=True), timeout=2)
+        
+        assert html == "<html>fast</html>"
+        assert self.cancelled == [self.URL]
+        # The cancelled call is not counted against the provider
+        assert hedging_service.health.snapshot()["welcometothejungle.com"]["firecrawl"]["attempts"] == 3
+    
+    async def test_paid_hedges_are_budgeted(self, hedging_service):
+        """Without budget, a slow call is not doubled with a paid provider."""
+        async def paid(url):
+            return "<html>paid</html>"
+        
+        hedging_service.brightdata_api_key = "key"
+        hedging_service._fetchers[ScrapingMethod.BRIGHTDATA] = paid
+        for _ in range(3):
+            hedging_service.health.record("brightdata", self.URL, True, 0.1)
+        hedging_service.hedge_budget = HedgeBudget(ratio=0.0, max_tokens=0.0)
+        
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(hedging_service.fetch_page(self.URL, hedged=True), timeout=0.2)
+        # The provider call outlives the timed-out caller (single-flight)
+        for task in list(hedging_service._single_flight._calls.values()):
+            task.cancel()
+        
+        hedging_service.hedge_budget = HedgeBudget(ratio=0.0, max_tokens=1.0)
+        html = await asyncio.wait_for(
+            hedging_service.fetch_page(self.URL + "?page=2", hedged=True), timeout=2
+        )
+        assert html == "<html>paid</html>"
+        assert hedging_service.hedge_budget.tokens == 0
+
+
+class TestPageCache:
+    """Tests for the two-tier page cache."""
+    
+    URL = "https://fr.indeed.com/jobs?q=product+manager&l=Toulouse"
+    
+    def test_normalize_url(self):
+        assert normalize_url(
+            "HTTPS://www.Indeed.com/jobs/?l=Toulouse&q=pm&utm_source=x#top"
+        ) == "https://indeed.com/jobs?l=Toulouse&q=pm"
+    
+    def test_disk_tier_survives_restart(self, tmp_path):
+        path = str(tmp_path / "pages.sqlite3")
+        cache = PageCache(path=path)
+        cache.set(self.URL, "firecrawl", "<html>jobs</html>")
+        cache.close()
+        
+        entry = PageCache(path=path).get(self.URL, ["parallel", "firecrawl"])
+        assert entry.content == "<html>jobs</html>"
+        assert entry.provider == "firecrawl"
+    
+    async def test_disk_tier_async_and_wal(self, tmp_path):
+        path = str(tmp_path / "pages.sqlite3")
+        cache = PageCache(path=path, memory_entries=0)
+        await cache.aset(self.URL, "firecrawl", "<html>jobs</html>")
+        
+        assert (await cache.aget(self.URL, ["firecrawl"])).content == "<html>jobs</html>"
+        assert cache._connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        cache.close()
+    
+    async def test_disk_tier_error_does_not_fail_fetch(self, scraping_service, tmp_path):
+        # A directory where the SQLite file should be: every disk access fails
+        path = tmp_path / "pages.sqlite3"
+        path.mkdir()
+        scraping_service.page_cache = PageCache(path=str(path))
+        
+        async def fetch(url):
+            return "<html>jobs</html>"
+        
+        scraping_service._fetchers[ScrapingMethod.HTTPX] = fetch
+        
+        assert await scraping_service.fetch_page(self.URL) == "<html>jobs</html>"
+        # Still served from the memory tier
+        assert scraping_service.page_cache.get(self.URL, ["httpx"]).content == "<html>jobs</html>"
+    
+    def test_fresh_stale_expired(self):
+        clock = FakeClock()
+        cache = PageCache(clock=clock)
+        cache.set(self.URL, "httpx", "<html>old</html>")
+        fresh, stale = ttl_for(self.URL)
+        
+        assert cache.get(self.URL, ["httpx"]).is_fresh(clock())
+        clock.now += fresh
+        entry = cache.get(self.URL, ["httpx"])
+        assert entry.content == "<html>old</html>" and not entry.is_fresh(clock())
+        clock.now += stale
+        assert cache.get(self.URL, ["httpx"]) is None
+    
+    def test_lru_eviction(self):
+        cache = PageCache(memory_entries=2)
+        for i in range(3):
+            cache.set(f"https://example.com/{i}", "httpx", str(i))
+        assert cache.get("https://example.com/0", ["httpx"]) is None
+        assert cache.get("https://example.com/2", ["httpx"]).content == "2"
+    
+    async def test_fetch_page_stale_while_revalidate(self, scraping_service):
+        clock = FakeClock()
+        scraping_service.page_cache = PageCache(clock=clock)
+        calls = []
+        
+        async def fetch(url):
+            calls.append(url)
+            return f"<html>v{len(calls)}</html>"
+        
+        scraping_service._fetchers[ScrapingMethod.HTTPX] = fetch
+        
+        assert await scraping_service.fetch_page(self.URL) == "<html>v1</html>"
+        assert await scraping_service.fetch_page(self.URL) == "<html>v1</html>"
+        assert len(calls) == 1
+        assert not scraping_service._refresh_tasks
+        
+        # Stale: served at once, refreshed in the background
+        clock.now += ttl_for(self.URL)[0]
+        assert await scraping_service.fetch_page(self.URL) == "<html>v1</html>"
+        await asyncio.gather(*scraping_service._refresh_tasks)
+        assert len(calls) == 2
+        assert await scraping_service.fetch_page(self.URL) == "<html>v2</html>"
+
+
+class TestSingleFlight:
+    """Tests for request coalescing."""
+    
+    async def test_concurrent_calls_share_one(self):
+        flight = SingleFlight()
+        calls = []
+        
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "done"
+        
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+        assert results == ["done"] * 5
+        assert len(calls) == 1
+        assert not flight.in_flight("key")
+        
+        # Later calls run again (nothing is cached)
+        await flight.do("key", work)
+        assert len(calls) == 2
+    
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flight = SingleFlight()
+        
+        async def work():
+            await asyncio.sleep(0.01)
+            return "done"
+        
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        
+        assert await second == "done"
+    
+    async def test_fetch_page_coalesces_same_url(self, scraping_service):
+        calls = []
+        
+        async def fetch(url):
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            return "<html>ok</html>"
+        
+        scraping_service._fetchers[ScrapingMethod.HTTPX] = fetch
+        pages = await asyncio.gather(
+            scraping_service.fetch_page("https://www.indeed.com/jobs?q=pm&utm_source=a"),
+            scraping_service.fetch_page("https://indeed.com/jobs?q=pm"),
+            scraping_service.fetch_page("https://indeed.com/jobs?q=dev"),
+        )
+        
+        assert pages == ["<html>ok</html>"] * 3
+        assert len(calls) == 2
+    
+    async def test_unipile_coalesces_identical_searches(self, monkeypatch):
+        service = UnipileService()
+        calls = []
+        
+        async def send(method, endpoint, params, json_data, timeout):
+            calls.append((method, endpoint))
+            await asyncio.sleep(0.01)
+            return {"items": []}
+        
+        monkeypatch.setattr(service, "_send_request", send)
+        payload = {"api": "classic", "category": "jobs", "keywords": "pm"}
+        
+        await asyncio.gather(
+            service._make_request("POST", "/api/v1/linkedin/search", json_data=payload),
+            service._make_request("POST", "/api/v1/linkedin/search", json_data=dict(payload)),
+            service._make_request("POST", "/api/v1/linkedin/search", json_data={**payload, "keywords": "dev"}),
+            service._make_request("POST", "/api/v1/other", json_data=payload),
+            service._make_request("POST", "/api/v1/other", json_data=payload),
+        )
+        
+        # Two distinct searches, and non-search POSTs are never coalesced
+        assert calls.count(("POST", "/api/v1/linkedin/search")) == 2
+        assert calls.count(("POST", "/api/v1/other")) == 2
+
+
+class TestRateLimiter:
+    """Tests for the token-bucket scheduler."""
+    
+    async def test_rate(self):
+        """Calls beyond the burst are paced at the configured rate."""
+        limiter = RateLimiter(limit=Limit(50.0, 1, 10))
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        for _ in range(4):
+            async with limiter.slot("provider:test"):
+                pass
+        
+        # 1 from the burst, then 3 at 50/s
+        assert loop.time() - started >= 3 / 50 * 0.9
+    
+    async def test_concurrency_cap(self):
+        limiter = RateLimiter(limit=Limit(1000.0, 1000, 2))
+        active, peak = 0, 0
+        
+        async def call():
+            nonlocal active, peak
+            async with limiter.slot("domain:indeed.com"):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+        
+        await asyncio.gather(*(call() for _ in range(6)))
+        assert peak == 2
+    
+    async def test_interactive_preempts_background(self):
+        """Queued interactive calls are served before queued background ones."""
+        limiter = RateLimiter(limit=Limit(1000.0, 1000, 1))
+        order = []
+        
+        async def call(name, priority):
+            async with limiter.slot("provider:firecrawl", priority=priority):
+                order.append(name)
+                await asyncio.sleep(0.01)
+        
+        first = asyncio.ensure_future(call("running", Priority.BACKGROUND))
+        await asyncio.sleep(0)
+        await asyncio.gather(
+            first,
+            call("background", Priority.BACKGROUND),
+            call("interactive", Priority.INTERACTIVE),
+        )
+        assert order == ["running", "interactive", "background"]
+    
+    async def test_cancelled_waiter_frees_its_place(self):
+        limiter = RateLimiter(limit=Limit(1000.0, 1000, 1))
+        
+        async with limiter.slot("provider:unipile"):
+            waiter = asyncio.ensure_future(limiter.slot("provider:unipile").__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+        
+        async with limiter.slot("provider:unipile"):
+            assert limiter.snapshot()["provider:unipile"]["active"] == 1